@@ -0,0 +1,117 @@
+"""
+Prometheus metrics endpoint
+
+Serves /metrics (outside /api/v1, where scrapers expect it) and times
+every HTTP request together with the database statements it runs. Cache,
+pool and queue figures are read from their owners' stats at scrape time.
+"""
+
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.logging_config import logging_stats
+from app.core.metrics import COUNT_BUCKETS, Collector, Histogram, metrics_registry
+from app.db.async_database import async_pool_metrics
+from app.db.database import pool_metrics
+from app.db.query_metrics import tally_queries
+from app.services.catalog_cache import catalog_cache
+from app.services.packing_cache import packing_cache
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
+from app.services.quote_cache import quote_cache
+from app.services.settings_cache import settings_cache
+
+router = APIRouter()
+
+HTTP_REQUEST_DURATION = Histogram(
+    "calculator_http_request_duration_seconds",
+    "Duration of HTTP requests, by route template",
+    ("method", "route", "status")
+)
+REQUEST_DB_QUERIES = Histogram(
+    "calculator_http_request_db_queries",
+    "Database statements run per HTTP request",
+    ("route",),
+    buckets=COUNT_BUCKETS
+)
+REQUEST_DB_DURATION = Histogram(
+    "calculator_http_request_db_duration_seconds",
+    "Time spent in database statements per HTTP request",
+    ("route",)
+)
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording request latency and database work per route
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        with tally_queries() as tally:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # Route templates keep the label set small; unmatched paths share one label
+                route = getattr(scope.get("route"), "path", "unmatched")
+                HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, scope["method"], route, status)
+                REQUEST_DB_QUERIES.observe(tally.queries, route)
+                REQUEST_DB_DURATION.observe(tally.seconds, route)
+
+def _cache_stats() -> dict:
+    quotes = quote_cache.stats()
+    return {
+        "catalog": catalog_cache.stats(),
+        "packing": packing_cache.stats(),
+        "quotes": dict(quotes, hits=quotes["local_hits"] + quotes["db_hits"]),
+        "principals": principal_cache.stats(),
+        "settings": settings_cache.stats()
+    }
+
+def _cache_samples(key: str):
+    return [((cache,), stats[key]) for cache, stats in _cache_stats().items()]
+
+def _pool_samples(key: str):
+    samples = []
+    for metrics in (pool_metrics, async_pool_metrics):
+        if metrics.pool is None:
+            continue  # Engine disabled or not pooled
+        stats = metrics.stats()
+        if key in stats:
+            samples.append(((metrics.name,), stats[key]))
+    return samples
+
+Collector("calculator_cache_hits_total", "Cache lookups served from the cache", "counter", lambda: _cache_samples("hits"), ("cache",))
+Collector("calculator_cache_misses_total", "Cache lookups that had to load or compute", "counter", lambda: _cache_samples("misses"), ("cache",))
+Collector("calculator_cache_hit_ratio", "Share of cache lookups served from the cache", "gauge", lambda: _cache_samples("hit_ratio"), ("cache",))
+Collector("calculator_db_pool_checkouts_total", "Connections checked out of the pool", "counter", lambda: _pool_samples("checkouts"), ("pool",))
+Collector("calculator_db_pool_checkout_timeouts_total", "Checkouts that timed out waiting for a connection", "counter", lambda: _pool_samples("timeouts"), ("pool",))
+Collector("calculator_db_pool_checkout_wait_seconds_total", "Time spent waiting for pool connections", "counter", lambda: _pool_samples("wait_seconds_total"), ("pool",))
+Collector("calculator_db_pool_checked_out", "Connections currently checked out", "gauge", lambda: _pool_samples("checked_out"), ("pool",))
+Collector("calculator_db_pool_saturation", "Checked out connections over pool size plus overflow", "gauge", lambda: _pool_samples("saturation"), ("pool",))
+Collector("calculator_password_hashing_in_flight", "Password hashing jobs queued or running", "gauge", lambda: [((), password_hasher.stats()["in_flight"])])
+Collector("calculator_password_hashing_rejected_total", "Password hashing jobs refused because the pool was full", "counter", lambda: [((), password_hasher.stats()["rejected"])])
+Collector("calculator_log_records_dropped_total", "Log records dropped because the log queue was full", "counter", lambda: [((), logging_stats()["dropped"])])
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """
+    Metrics in the Prometheus text exposition format
+    """
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -3,13 +3,16 @@ API v1 package
 """
 
 from fastapi import APIRouter
+from app.core.config import settings
 from .auth import router as auth_router
 from .products import router as products_router
 from .customers import router as customers_router
 from .overpack_boxes import router as overpack_boxes_router
 from .calculations import router as calculations_router
+from .async_calculations import router as async_calculations_router
 from .zone_lookup import router as zone_lookup_router
 from .system_settings import router as system_settings_router
+from .tariffs import router as tariffs_router
 
 # Create main API router
 api_router = APIRouter()
@@ -19,6 +22,10 @@ api_router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 api_router.include_router(products_router, prefix="/products", tags=["products"])
 api_router.include_router(customers_router, prefix="/customers", tags=["customers"])
 api_router.include_router(overpack_boxes_router, prefix="/overpack-boxes", tags=["overpack-boxes"])
+if settings.ASYNC_DB_ENABLED:
+    # Included first so its routes take precedence over the sync ones
+    api_router.include_router(async_calculations_router, prefix="/calculations", tags=["calculations"])
 api_router.include_router(calculations_router, prefix="/calculations", tags=["calculations"])
 api_router.include_router(zone_lookup_router, prefix="/zone-lookup", tags=["zone-lookup"])
-api_router.include_router(system_settings_router, prefix="/system-settings", tags=["system-settings"])
\ No newline at end of file
+api_router.include_router(system_settings_router, prefix="/system-settings", tags=["system-settings"])
+api_router.include_router(tariffs_router, prefix="/tariffs", tags=["tariffs"])
\ No newline at end of file
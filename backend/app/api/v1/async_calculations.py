@@ -0,0 +1,41 @@
+"""
+Async Shipping Calculation API endpoints
+
+Served instead of the matching sync endpoints when ASYNC_DB_ENABLED is set.
+"""
+
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.packing import ShippingCalculationRequest, ShippingCalculationResponse
+from app.services.async_calculation_service import AsyncCalculationService
+from app.auth.dependencies import get_async_db, get_current_user_async
+from app.services.principal_cache import Principal
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.post("/calculate", response_model=ShippingCalculationResponse)
+async def calculate_shipping(
+    request: ShippingCalculationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """
+    Calculate optimal shipping solution using 3D Bin Packing Problem algorithm
+    """
+    try:
+        calculation_service = AsyncCalculationService(db)
+        return await calculation_service.calculate_enhanced_shipping(request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.exception("Calculation failed for customer %s", request.customer_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Calculation failed: {str(e)}"
+        )
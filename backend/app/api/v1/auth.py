@@ -7,20 +7,33 @@ from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.schemas.auth import Token, UserLogin, UserResponse, UserCreate
 from app.services.auth_service import AuthService
-from app.auth.dependencies import get_current_user
-from app.models.user import User
+from app.services.password_hasher import password_hasher, PasswordHasherBusy
+from app.auth.dependencies import get_current_user, get_current_admin_user
+from app.services.principal_cache import Principal
 
 router = APIRouter()
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """
     Authenticate user and return access token
+
+    The password check runs on the password hashing pool, not on a request thread.
     """
     auth_service = AuthService(db)
     
     # Authenticate user
-    user = auth_service.authenticate_user(user_credentials.email, user_credentials.password)
+    try:
+        user = await auth_service.authenticate_user_async(user_credentials.email, user_credentials.password)
+    except PasswordHasherBusy:
+        raise _hashing_busy()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,15 +50,17 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     }
 
 @router.post("/register", response_model=UserResponse)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user
     """
     auth_service = AuthService(db)
     
     try:
-        user = auth_service.create_user(user_data)
+        user = await auth_service.create_user_async(user_data)
         return user
+    except PasswordHasherBusy:
+        raise _hashing_busy()
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -53,14 +68,14 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: Principal = Depends(get_current_user)):
     """
     Get current user information
     """
     return current_user
 
 @router.post("/refresh", response_model=Token)
-def refresh_token(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def refresh_token(current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
     """
     Refresh access token
     """
@@ -71,3 +86,10 @@ def refresh_token(current_user: User = Depends(get_current_user), db: Session =
         "access_token": access_token,
         "token_type": "bearer"
     }
+
+@router.get("/password-hashing/stats")
+def get_password_hashing_stats(current_user: Principal = Depends(get_current_admin_user)):
+    """
+    Queue depth and throughput of the password hashing pool
+    """
+    return password_hasher.stats()
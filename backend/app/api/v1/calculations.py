@@ -2,12 +2,33 @@
 Enhanced Shipping Calculation API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+import tempfile
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.schemas.packing import ShippingCalculationRequest, ShippingCalculationResponse
+from app.schemas.packing import (
+    ShippingCalculationRequest,
+    ShippingCalculationResponse,
+    BatchCalculationRequest,
+    BatchCalculationResponse,
+    QuoteMatrixRequest,
+    QuoteMatrixResponse
+)
 from app.services.calculation_service import CalculationService
-from app.auth.dependencies import get_db, get_current_user
-from app.models.user import User
+from app.auth.dependencies import get_db, get_current_user, get_current_admin_user
+from app.services.principal_cache import Principal
+from app.services.packing_cache import packing_cache
+from app.services.quote_cache import quote_cache
+from app.services.catalog_cache import catalog_cache
+from app.services.principal_cache import principal_cache
+from app.services.settings_cache import settings_cache
+from app.services.quote_stream import QuotePipeline, stream_format
+from app.core.config import settings as app_settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -15,50 +36,135 @@ router = APIRouter()
 def calculate_shipping(
     request: ShippingCalculationRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Calculate optimal shipping solution using 3D Bin Packing Problem algorithm
     """
-    print("=== BACKEND CALCULATION DEBUG START ===")
-    print(f"Request received: {request}")
-    print(f"Current user: {current_user}")
-    print(f"User customer ID: {current_user.customerId}")
-
     try:
         # Check if debug mode is enabled in system settings
-        from app.models.system_settings import SystemSettings
-        settings = db.query(SystemSettings).first()
-        debug_mode = settings.debugMode if settings else False
-        print(f"Debug mode enabled: {debug_mode}")
+        debug_mode = settings_cache.debug_mode(db)
+
+        calculation_service = CalculationService(db)
+        return calculation_service.calculate_enhanced_shipping(request, debug_mode=debug_mode)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.exception("Calculation failed for customer %s", request.customer_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Calculation failed: {str(e)}"
+        )
 
+@router.post("/batch", response_model=BatchCalculationResponse)
+def calculate_shipping_batch(
+    request: BatchCalculationRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Calculate shipping for many orders in one call
+
+    Every order gets its own result; an invalid or failing order is
+    reported with an error instead of failing the batch.
+    """
+    if len(request.orders) > app_settings.CALCULATION_BATCH_MAX_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch exceeds {app_settings.CALCULATION_BATCH_MAX_ORDERS} orders"
+        )
+
+    try:
         calculation_service = CalculationService(db)
-        print("Calculation service created successfully")
+        return calculation_service.calculate_batch(request.orders)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch calculation failed: {str(e)}"
+        )
 
-        result = calculation_service.calculate_enhanced_shipping(request, debug_mode=debug_mode)
-        print("Calculation completed successfully")
-        print(f"Result: {result}")
+@router.post("/matrix", response_model=QuoteMatrixResponse)
+def calculate_quote_matrix(
+    request: QuoteMatrixRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Price one shipment for several destination ZIPs and service levels
 
-        print("=== BACKEND CALCULATION DEBUG END - SUCCESS ===")
-        return result
+    The items are packed once; the response has a quote per (ZIP, service
+    level) pair plus a grid of total costs for comparison.
+    """
+    cells = len(request.destination_zips) * len(request.service_levels)
+    if cells > app_settings.QUOTE_MATRIX_MAX_CELLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Quote matrix exceeds {app_settings.QUOTE_MATRIX_MAX_CELLS} cells"
+        )
+
+    try:
+        calculation_service = CalculationService(db)
+        return calculation_service.calculate_quote_matrix(request)
     except ValueError as e:
-        print(f"=== BACKEND CALCULATION DEBUG END - VALIDATION ERROR ===")
-        print(f"Validation error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        print(f"=== BACKEND CALCULATION DEBUG END - GENERAL ERROR ===")
-        print(f"General error: {str(e)}")
-        print(f"Error type: {type(e)}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Calculation failed: {str(e)}"
+            detail=f"Quote matrix failed: {str(e)}"
         )
 
+@router.post("/stream")
+async def calculate_shipping_stream(
+    request: Request,
+    format: Optional[str] = Query(None, description="ndjson or csv (defaults to the Content-Type)"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Stream quotes for an NDJSON or CSV upload of orders
+
+    The request body is the raw file. Results are streamed back in the same
+    format, one row per order and in input order, while the file is still
+    being priced.
+    """
+    input_format = stream_format(format, request.headers.get("content-type"))
+    if input_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload NDJSON (application/x-ndjson) or CSV (text/csv)"
+        )
+
+    # Spool the upload to disk: the pipeline reads it after this handler returns
+    source = tempfile.TemporaryFile()
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(source.write, chunk)
+        source.seek(0)
+    except Exception:
+        source.close()
+        raise
+
+    pipeline = QuotePipeline(source, input_format)
+    return StreamingResponse(pipeline.stream(), media_type=pipeline.media_type)
+
+@router.get("/cache/stats")
+def get_cache_stats(current_user: Principal = Depends(get_current_admin_user)):
+    """
+    Hit/miss counters for the calculation, principal and settings caches
+    """
+    return {
+        "catalog": catalog_cache.stats(),
+        "packing": packing_cache.stats(),
+        "quotes": quote_cache.stats(),
+        "principals": principal_cache.stats(),
+        "settings": settings_cache.stats()
+    }
+
 @router.get("/health")
 def calculation_health_check():
     """
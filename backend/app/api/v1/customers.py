@@ -8,7 +8,7 @@ from app.db.database import get_db
 from app.schemas.customer import CustomerResponse, CustomerCreate, CustomerUpdate
 from app.services.customer_service import CustomerService
 from app.auth.dependencies import get_current_user
-from app.models.user import User
+from app.services.principal_cache import Principal
 
 router = APIRouter()
 
@@ -16,7 +16,7 @@ router = APIRouter()
 def get_customers(
     active_only: bool = True,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get all customers
@@ -29,7 +29,7 @@ def get_customers(
 def get_customer(
     customer_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get customer by ID
@@ -49,7 +49,7 @@ def get_customer(
 def create_customer(
     customer_data: CustomerCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new customer
@@ -70,7 +70,7 @@ def update_customer(
     customer_id: str,
     customer_data: CustomerUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Update customer
@@ -90,7 +90,7 @@ def update_customer(
 def delete_customer(
     customer_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Delete customer (soft delete)
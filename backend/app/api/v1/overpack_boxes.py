@@ -9,7 +9,7 @@ from app.db.database import get_db
 from app.schemas.overpack_box import OverpackBoxResponse, OverpackBoxCreate, OverpackBoxUpdate, OverpackBoxListResponse
 from app.services.overpack_box_service import OverpackBoxService
 from app.auth.dependencies import get_current_user
-from app.models.user import User
+from app.services.principal_cache import Principal
 
 router = APIRouter()
 
@@ -20,7 +20,7 @@ def get_boxes(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(100, ge=1, le=1000, description="Page size"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get overpack boxes with optional filtering
@@ -55,7 +55,7 @@ def get_boxes(
 def get_box(
     box_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get overpack box by ID
@@ -75,7 +75,7 @@ def get_box(
 def create_box(
     box_data: OverpackBoxCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new overpack box
@@ -89,7 +89,7 @@ def update_box(
     box_id: int,
     box_data: OverpackBoxUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Update overpack box
@@ -109,7 +109,7 @@ def update_box(
 def delete_box(
     box_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Delete overpack box (soft delete)
@@ -9,7 +9,7 @@ from app.db.database import get_db
 from app.schemas.product import ProductResponse, ProductCreate, ProductUpdate, ProductListResponse
 from app.services.product_service import ProductService
 from app.auth.dependencies import get_current_user
-from app.models.user import User
+from app.services.principal_cache import Principal
 
 router = APIRouter()
 
@@ -20,7 +20,7 @@ def get_products(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(100, ge=1, le=1000, description="Page size"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get products with optional filtering
@@ -55,7 +55,7 @@ def get_products(
 def get_product(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get product by ID
@@ -76,7 +76,7 @@ def get_product_by_sku(
     sku: str,
     customer_id: Optional[str] = Query(None, description="Customer ID filter"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get product by SKU
@@ -96,7 +96,7 @@ def get_product_by_sku(
 def create_product(
     product_data: ProductCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new product
@@ -117,7 +117,7 @@ def update_product(
     product_id: int,
     product_data: ProductUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Update product
@@ -137,7 +137,7 @@ def update_product(
 def delete_product(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Delete product (soft delete)
@@ -7,19 +7,22 @@ from sqlalchemy.orm import Session
 from app.models.system_settings import SystemSettings
 from app.schemas.system_settings import SystemSettingsResponse, SystemSettingsUpdate
 from app.auth.dependencies import get_db, get_current_admin_user
-from app.models.user import User
+from app.services.principal_cache import Principal
+from app.db.database import pool_metrics
+from app.db.async_database import async_engine, async_pool_metrics
+from app.services.settings_cache import settings_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=SystemSettingsResponse)
 def get_system_settings(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
-    Get system settings
+    Get system settings (served from the settings cache)
     """
-    settings = db.query(SystemSettings).first()
+    settings = settings_cache.get(db)
     if not settings:
         # Create default settings if none exist
         settings = SystemSettings(
@@ -30,6 +33,7 @@ def get_system_settings(
         db.add(settings)
         db.commit()
         db.refresh(settings)
+        settings_cache.invalidate()
     
     return settings
 
@@ -37,7 +41,7 @@ def get_system_settings(
 def update_system_settings(
     settings_update: SystemSettingsUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Update system settings
@@ -55,4 +59,15 @@ def update_system_settings(
     
     db.commit()
     db.refresh(settings)
+    settings_cache.invalidate()
     return settings
+
+@router.get("/database-pool")
+def get_database_pool_stats(current_user: Principal = Depends(get_current_admin_user)):
+    """
+    Checkout wait times and saturation of the database connection pools
+    """
+    return {
+        "sync": pool_metrics.stats(),
+        "async": async_pool_metrics.stats() if async_engine is not None else None
+    }
@@ -0,0 +1,35 @@
+"""
+Tariff cache API endpoints
+"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.auth.dependencies import get_db, get_current_admin_user
+from app.services.principal_cache import Principal
+from app.services.tariff_engine import tariff_engine
+from app.services.quote_cache import quote_cache
+
+router = APIRouter()
+
+@router.get("/status")
+def get_tariff_status(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Get the version and size of the in-memory tariff tables
+    """
+    return tariff_engine.snapshot(db).status()
+
+@router.post("/reload")
+def reload_tariffs(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Reload tariff tables after they have been edited
+    """
+    snapshot = tariff_engine.reload(db)
+    # Quotes priced from the old tables are no longer valid
+    quote_cache.clear(db)
+    return snapshot.status()
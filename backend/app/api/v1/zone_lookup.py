@@ -5,11 +5,20 @@ Zone lookup API endpoints
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.auth.dependencies import get_db, get_current_user
-from app.models.user import User
-from app.models.tyson_tariff import TysonZipToZoneMatrix
+from app.services.principal_cache import Principal
+from app.schemas.zone_lookup import ZoneBatchRequest, ZoneBatchResponse, ZoneLookupResult
+from app.services.tariff_engine import tariff_engine
 
 router = APIRouter()
 
+def _is_valid_zip(zip_code: str) -> bool:
+    return len(zip_code) == 5 and zip_code.isdigit()
+
+def _estimate_zone(zip_code: str) -> int:
+    """Estimate a zone from the last 3 digits for ZIP codes missing from the matrix"""
+    last_three = int(zip_code[-3:])
+    return min(10, max(1, (last_three // 100) + 1))
+
 @router.get("/lookup/{zip_code}")
 def lookup_zone(
     zip_code: str,
@@ -24,23 +33,49 @@ def lookup_zone(
             detail="ZIP code must be 5 digits"
         )
 
-    # Look up zone from database
-    result = db.query(TysonZipToZoneMatrix).filter(
-        TysonZipToZoneMatrix.destination_zip == zip_code
-    ).first()
+    # Look up zone from the in-memory ZIP-to-zone index
+    zone = tariff_engine.snapshot(db).zones.lookup(zip_code)
 
-    if result:
+    if zone is not None:
         return {
             "zip_code": zip_code,
-            "zone": result.zone
+            "zone": zone
         }
     else:
-        # If not found in database, estimate based on last 3 digits
-        last_three = int(zip_code[-3:])
-        estimated_zone = min(10, max(1, (last_three // 100) + 1))
-        
+        # If not found in the matrix, estimate based on last 3 digits
         return {
             "zip_code": zip_code,
-            "zone": estimated_zone,
+            "zone": _estimate_zone(zip_code),
             "estimated": True
         }
+
+@router.post("/batch", response_model=ZoneBatchResponse)
+def lookup_zones_batch(
+    request: ZoneBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Look up shipping zones for many ZIP codes in one call
+    """
+    zones = tariff_engine.snapshot(db).zones.lookup_many(request.zip_codes)
+
+    results = []
+    estimated = 0
+    invalid = 0
+    for zip_code, zone in zip(request.zip_codes, zones):
+        if zone is not None:
+            results.append(ZoneLookupResult(zip_code=zip_code, zone=zone))
+        elif not _is_valid_zip(zip_code):
+            invalid += 1
+            results.append(ZoneLookupResult(zip_code=zip_code, error="ZIP code must be 5 digits"))
+        else:
+            estimated += 1
+            results.append(ZoneLookupResult(zip_code=zip_code, zone=_estimate_zone(zip_code), estimated=True))
+
+    return ZoneBatchResponse(
+        results=results,
+        total=len(results),
+        estimated=estimated,
+        invalid=invalid
+    )
@@ -4,11 +4,15 @@ Authentication dependencies
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.db.async_database import get_async_db
 from app.models.user import User
 from app.core.security import verify_token
 from app.schemas.auth import TokenData
+from app.services.principal_cache import Principal, principal_cache
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
@@ -16,9 +20,12 @@ security = HTTPBearer()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Get the current authenticated user
+
+    Served from the principal cache when possible; the database is only
+    queried on a miss.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -31,21 +38,28 @@ def get_current_user(
     if token_data is None:
         raise credentials_exception
     
+    subject = token_data.get("sub")
+    principal = principal_cache.get(subject) if subject else None
+    if principal is not None:
+        return principal
+
     # Get user from database
-    user = db.query(User).filter(User.email == token_data.get("sub")).first()
+    user = db.query(User).filter(User.email == subject).first()
     if user is None:
         raise credentials_exception
-    
-    return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+    principal = Principal.from_user(user)
+    principal_cache.put(subject, principal)
+    return principal
+
+def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """
     Get the current active user
     """
     # Add any additional checks for active users here
     return current_user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_admin_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """
     Get the current admin user
     """
@@ -55,3 +69,47 @@ def get_current_admin_user(current_user: User = Depends(get_current_user)) -> Us
             detail="Not enough permissions"
         )
     return current_user
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Get the current authenticated user (async handlers)
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    # Verify the token
+    token_data = verify_token(credentials.credentials)
+    if token_data is None:
+        raise credentials_exception
+
+    subject = token_data.get("sub")
+    principal = principal_cache.get(subject) if subject else None
+    if principal is not None:
+        return principal
+
+    # Get user from database
+    result = await db.execute(select(User).where(User.email == subject))
+    user = result.scalars().first()
+    if user is None:
+        raise credentials_exception
+
+    principal = Principal.from_user(user)
+    principal_cache.put(subject, principal)
+    return principal
+
+async def get_current_admin_user_async(current_user: Principal = Depends(get_current_user_async)) -> Principal:
+    """
+    Get the current admin user (async handlers)
+    """
+    if current_user.role != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
@@ -3,17 +3,32 @@ Core configuration settings
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    ASYNC_DB_ENABLED: bool = False  # serve calculations from async handlers on an async engine
+    ASYNC_DATABASE_URL: Optional[str] = None  # defaults to DATABASE_URL with the async psycopg driver
+    DB_POOL_SIZE: int = 5  # connections kept open per engine
+    DB_MAX_OVERFLOW: int = 10  # extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT_SECONDS: float = 30  # wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # reopen connections older than this; -1 never
+    DB_POOL_PRE_PING: bool = True  # test connections on checkout, replacing dropped ones
+    DB_QUERY_CACHE_SIZE: int = 500  # compiled SQL statements cached per engine
+    DB_PREPARED_STATEMENTS: bool = True  # server-side prepared statements (disable behind PgBouncer transaction pooling)
+    DB_PREPARE_THRESHOLD: int = 2  # executions on a connection before psycopg prepares a statement
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60  # how long another worker's role or customer change can go unseen; 0 disables
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    BCRYPT_ROUNDS: int = 12  # stored hashes at another cost are rehashed on login
+    PASSWORD_HASH_WORKERS: int = 2  # processes for bcrypt hashing; 0 hashes on the request thread
+    PASSWORD_HASH_MAX_PENDING: int = 64  # hashing jobs queued or running before logins get 503
     
     # CORS
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173", "http://localhost:5174"]
@@ -23,6 +38,40 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
     
+    # Logging and tracing
+    LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10000  # records buffered for the writer thread; more are dropped
+    TRACE_SAMPLE_RATE: float = 0.01  # share of calculations logged with their step timings
+    TRACE_SLOW_MS: int = 1000  # slower calculations are always logged; 0 disables
+    METRICS_ENABLED: bool = True  # serve Prometheus metrics at /metrics
+    
+    # Caching
+    TARIFF_CACHE_MAX_AGE_SECONDS: int = 300  # 0 keeps tariffs until an explicit reload
+    CATALOG_CACHE_CHECK_INTERVAL_SECONDS: int = 30  # 0 only drops catalogs on local edits
+    SETTINGS_CACHE_CHECK_INTERVAL_SECONDS: int = 10  # 0 only drops system settings on local edits
+    PACKING_CACHE_MAX_ENTRIES: int = 10000
+    PACKING_CACHE_TTL_SECONDS: int = 3600
+    QUOTE_CACHE_ENABLED: bool = True
+    QUOTE_CACHE_TTL_SECONDS: int = 900
+    QUOTE_CACHE_LOCAL_TTL_SECONDS: int = 60
+    QUOTE_CACHE_LOCAL_MAX_ENTRIES: int = 10000
+    QUOTE_CACHE_WRITE_QUEUE_SIZE: int = 10000
+    QUOTE_CACHE_WRITE_BATCH_SIZE: int = 100
+    QUOTE_CACHE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    QUOTE_CACHE_SWEEP_INTERVAL_SECONDS: int = 600
+    
+    # Packing
+    PACKING_OBJECTIVE: str = "landed_cost"  # box_count, box_cost, utilization or landed_cost
+    PACKING_TIME_BUDGET_MS: int = 2000
+    PACKING_WORKERS: int = 2  # 0 runs every strategy on the request thread
+    PACKING_PARALLEL_MIN_UNITS: int = 200  # smaller orders are not worth the process hop
+    PACKING_EXACT_MAX_UNITS: int = 30  # orders up to this size are solved exactly; 0 disables
+    PACKING_EXACT_NODE_BUDGET: int = 20000  # search nodes before falling back to the heuristics
+    PACKING_COST_SEARCH: bool = True  # move packings into cheaper boxes under the objective
+    CALCULATION_BATCH_MAX_ORDERS: int = 10000
+    CALCULATION_STREAM_QUEUE_SIZE: int = 64  # orders buffered between streaming stages
+    QUOTE_MATRIX_MAX_CELLS: int = 1000  # destination ZIPs x service levels per matrix request
+    
     class Config:
         env_file = ".env"
         extra = "ignore"  # Ignore extra fields from .env
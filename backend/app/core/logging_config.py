@@ -0,0 +1,87 @@
+"""
+Application logging
+
+Records from the `app` loggers go through a bounded in-memory queue to a
+background thread that writes them to stdout as JSON lines, so logging
+never blocks a request on I/O. When the queue is full, records are dropped
+and counted.
+"""
+
+import json
+import logging
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import settings
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; `extra={"fields": {...}}` adds fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        return json.dumps(entry, default=str)
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+def configure_logging():
+    """
+    Route the `app` loggers through the queue and start the writer thread
+    """
+    global _handler, _listener
+    with _lock:
+        if _listener is not None:
+            return
+        log_queue: queue.Queue = queue.Queue(settings.LOG_QUEUE_SIZE)
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(JsonFormatter())
+        _handler = DroppingQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+
+        app_logger = logging.getLogger("app")
+        app_logger.setLevel(settings.LOG_LEVEL.upper())
+        app_logger.addHandler(_handler)
+        app_logger.propagate = False
+        _listener.start()
+
+def shutdown_logging():
+    """
+    Write out queued records and stop the writer thread
+    """
+    global _handler, _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logging.getLogger("app").removeHandler(_handler)
+        _handler, _listener = None, None
+
+def logging_stats() -> dict:
+    return {
+        "queued": _handler.queue.qsize() if _handler is not None else 0,
+        "dropped": _handler.dropped if _handler is not None else 0
+    }
@@ -0,0 +1,264 @@
+"""
+Prometheus metrics
+
+Counters and histograms for the calculation hot paths, rendered in the
+Prometheus text format at /metrics. Each thread records into its own
+shard, so recording takes no lock and never contends with other requests;
+a scrape adds the shards up. A finished thread's shard is folded into a
+retired total, so threads started per request do not pile up shards.
+Values owned by other components (cache and pool counters) are read
+through collectors at scrape time.
+"""
+
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from app.schemas.packing import PackingResult
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[LabelValues, float]
+
+# Seconds, from sub-millisecond cache hits to packings that hit their time budget
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _add(total: Dict[LabelValues, list], shard: Dict[LabelValues, list]):
+    for labels, values in list(shard.items()):
+        current = total.get(labels)
+        if current is None:
+            total[labels] = list(values)
+        else:
+            for index, value in enumerate(values):
+                current[index] += value
+
+class _ShardOwner:
+    """Lives in a thread's locals only, so it is collected when the thread ends"""
+    __slots__ = ("__weakref__",)
+
+class Metric(ABC):
+    """
+    A named metric with optional labels, recorded into per-thread shards
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: "MetricsRegistry" = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._retired: Dict[LabelValues, list] = {}  # Shards of finished threads
+        self._lock = threading.Lock()  # Only taken when a thread first records or ends
+        (registry if registry is not None else metrics_registry).register(self)
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "values", None)
+        if shard is None:
+            shard = {}
+            self._local.values = shard
+            self._local.owner = owner = _ShardOwner()
+            weakref.finalize(owner, self._retire, shard)
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _retire(self, shard: dict):
+        """Fold the shard of a finished thread into the retired total"""
+        with self._lock:
+            self._shards = [live for live in self._shards if live is not shard]
+            _add(self._retired, shard)
+
+    def _merged(self) -> Dict[LabelValues, list]:
+        """Values per label set, added up over the retired total and the live shards"""
+        merged: Dict[LabelValues, list] = {}
+        # A shard is either live or retired under the lock, so it is never counted twice
+        with self._lock:
+            _add(merged, self._retired)
+            shards = list(self._shards)
+        for shard in shards:
+            # Only the owning thread writes to a shard; copying it is atomic under the GIL
+            _add(merged, shard)
+        return merged
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Sample lines in the Prometheus text format"""
+
+class Counter(Metric):
+    """
+    Monotonically increasing count
+    """
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        shard = self._shard()
+        values = shard.get(labels)
+        if values is None:
+            shard[labels] = [amount]
+        else:
+            values[0] += amount
+
+    def value(self, *labels: str) -> float:
+        values = self._merged().get(labels)
+        return values[0] if values else 0
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(values[0])}"
+            for labels, values in sorted(self._merged().items())
+        ]
+
+class Histogram(Metric):
+    """
+    Distribution of observed values over fixed upper bounds
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS, registry: "MetricsRegistry" = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, *labels: str):
+        shard = self._shard()
+        values = shard.get(labels)
+        if values is None:
+            # Per-bucket counts (the last one is +Inf), then the sum and the count
+            values = shard[labels] = [0] * (len(self.buckets) + 3)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def snapshot(self, *labels: str) -> dict:
+        """Count and sum for one label set"""
+        values = self._merged().get(labels)
+        return {"count": values[-1], "sum": values[-2]} if values else {"count": 0, "sum": 0.0}
+
+    def render(self) -> List[str]:
+        lines = []
+        names = self.labelnames + ("le",)
+        for labels, values in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(float(values[-2]))}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {values[-1]}")
+        return lines
+
+class Collector(Metric):
+    """
+    Metric read from another component when scraped
+
+    `collect` returns (label values, value) pairs; a failing collector is
+    left out of the scrape rather than failing it.
+    """
+
+    def __init__(self, name: str, documentation: str, kind: str, collect: Callable[[], Iterable[Sample]], labelnames: Sequence[str] = (), registry: "MetricsRegistry" = None):
+        self.kind = kind
+        self.collect = collect
+        super().__init__(name, documentation, labelnames, registry)
+
+    def render(self) -> List[str]:
+        try:
+            samples = list(self.collect())
+        except Exception:
+            return []
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in samples
+        ]
+
+class MetricsRegistry:
+    """
+    The metrics exposed at /metrics
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Shared registry instance
+metrics_registry = MetricsRegistry()
+
+# Calculation hot paths
+TRACE_DURATION = Histogram(
+    "calculator_trace_duration_seconds",
+    "End-to-end duration of traced operations such as calculate",
+    ("trace", "status")
+)
+TRACE_SPAN_DURATION = Histogram(
+    "calculator_trace_span_duration_seconds",
+    "Duration of the steps of traced operations",
+    ("trace", "span")
+)
+PACKING_STRATEGY_DURATION = Histogram(
+    "calculator_packing_strategy_duration_seconds",
+    "Time spent in each packing strategy, the exact solver and the cost search",
+    ("strategy",)
+)
+PACKINGS = Counter(
+    "calculator_packings_total",
+    "Packings computed (not served from the packing cache), by the solver that won",
+    ("solver",)
+)
+PACKING_BOXES = Histogram(
+    "calculator_packing_boxes",
+    "Boxes per computed packing",
+    buckets=COUNT_BUCKETS
+)
+PACKING_OVERFLOWS = Counter(
+    "calculator_packing_overflows_total",
+    "Computed packings that left items unpacked"
+)
+PACKING_OVERFLOW_UNITS = Counter(
+    "calculator_packing_overflow_units_total",
+    "Item units left unpacked by computed packings"
+)
+
+def record_packing(result: PackingResult):
+    """
+    Record a freshly computed PackingResult
+
+    Called in the web process, also for packings that ran on the process
+    pool, whose strategy timings travel back on the result.
+    """
+    for strategy, seconds in (result.strategy_seconds or {}).items():
+        PACKING_STRATEGY_DURATION.observe(seconds, strategy)
+    PACKINGS.inc(result.solver or "unknown")
+    PACKING_BOXES.observe(result.total_boxes)
+    if result.overflow_items:
+        PACKING_OVERFLOWS.inc()
+        PACKING_OVERFLOW_UNITS.inc(amount=sum(quantity for _, quantity in result.overflow_items))
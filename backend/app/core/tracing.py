@@ -0,0 +1,99 @@
+"""
+Request tracing
+
+A trace times the steps (spans) of one calculation. Step timings are
+always kept, for `debug_info["timing"]` and the /metrics histograms; the
+trace is logged as one structured record when it is sampled
+(TRACE_SAMPLE_RATE), slow (TRACE_SLOW_MS) or failed.
+"""
+
+import logging
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import TRACE_DURATION, TRACE_SPAN_DURATION
+
+logger = logging.getLogger("app.trace")
+
+class Trace:
+    """
+    Spans of one traced operation, as (name, offset, duration) in seconds
+    """
+    __slots__ = ("name", "trace_id", "sampled", "started", "spans", "attributes")
+
+    def __init__(self, name: str, sampled: Optional[bool] = None, **attributes):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.sampled = random.random() < settings.TRACE_SAMPLE_RATE if sampled is None else sampled
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []
+        self.attributes = attributes
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time a step; a step timed more than once adds up"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, started - self.started, time.perf_counter() - started))
+
+    def set(self, **attributes):
+        """Attach attributes to the logged record"""
+        self.attributes.update(attributes)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def timings(self) -> Dict[str, float]:
+        """Milliseconds per step, as `<step>_ms`, plus `total_ms`"""
+        timings: Dict[str, float] = {}
+        for name, _, duration in self.spans:
+            timings[f"{name}_ms"] = timings.get(f"{name}_ms", 0.0) + duration * 1000
+        timings = {key: round(value, 3) for key, value in timings.items()}
+        timings["total_ms"] = round(self.elapsed_ms(), 3)
+        return timings
+
+    def finish(self, status: str = "ok", error: Optional[str] = None):
+        """Record the trace's metrics; log it if it is sampled, slow or failed"""
+        total_ms = self.elapsed_ms()
+        TRACE_DURATION.observe(total_ms / 1000, self.name, status)
+        for name, _, duration in self.spans:
+            TRACE_SPAN_DURATION.observe(duration, self.name, name)
+        slow = settings.TRACE_SLOW_MS > 0 and total_ms >= settings.TRACE_SLOW_MS
+        if not (self.sampled or slow or status == "error") or not logger.isEnabledFor(logging.INFO):
+            return
+        fields = {
+            "trace": self.name,
+            "trace_id": self.trace_id,
+            "status": status,
+            "total_ms": round(total_ms, 3),
+            "spans": [
+                {"name": name, "start_ms": round(offset * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+                for name, offset, duration in self.spans
+            ]
+        }
+        if error is not None:
+            fields["error"] = error
+        fields.update(self.attributes)
+        logger.info("%s %s in %.1f ms", self.name, status, total_ms, extra={"fields": fields})
+
+@contextmanager
+def start_trace(name: str, sampled: Optional[bool] = None, **attributes) -> Iterator[Trace]:
+    """
+    Trace a block: failures are always logged, ValueError (bad input) as "invalid"
+    """
+    trace = Trace(name, sampled, **attributes)
+    try:
+        yield trace
+    except ValueError as e:
+        trace.finish("invalid", str(e))
+        raise
+    except Exception as e:
+        trace.finish("error", f"{type(e).__name__}: {e}")
+        raise
+    trace.finish()
@@ -0,0 +1,71 @@
+"""
+Async database configuration and session management
+
+Optional counterpart of app.db.database for async request handlers,
+created only when ASYNC_DB_ENABLED is set. PostgreSQL URLs use psycopg's
+async driver.
+"""
+
+from typing import AsyncIterator, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.db.database import engine_options, psycopg_database_url
+from app.db.pool_metrics import PoolMetrics
+from app.db.query_metrics import instrument_engine
+
+T = TypeVar("T")
+
+def async_database_url(database_url: str) -> str:
+    """A database URL with the async psycopg driver for PostgreSQL"""
+    # create_async_engine picks psycopg's async dialect for the same URL
+    return psycopg_database_url(database_url)
+
+# Checkout wait and saturation of the async engine's pool
+async_pool_metrics = PoolMetrics("async")
+
+# Create async SQLAlchemy engine (None unless the async stack is enabled)
+_async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    _async_url,
+    echo=False,  # Set to True for SQL query logging
+    **engine_options(_async_url, AsyncAdaptedQueuePool, async_pool_metrics)
+) if settings.ASYNC_DB_ENABLED else None
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine, "async")
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+) if async_engine is not None else None
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency to get an async database session
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("The async database engine is disabled (ASYNC_DB_ENABLED)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def run_in_session(fn: Callable[[Session], T]) -> T:
+    """
+    Run sync database code on its own async session
+
+    Each call gets a separate session, so calls can run concurrently
+    (one AsyncSession must not be used by two tasks at once).
+    """
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(fn)
+
+async def dispose_async_engine():
+    """
+    Close the async engine's connections on application shutdown
+    """
+    if async_engine is not None:
+        await async_engine.dispose()
@@ -3,22 +3,67 @@ Database configuration and session management
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool
 import os
+from typing import Type
 from dotenv import load_dotenv
 
+from app.core.config import settings
+from app.db.pool_metrics import PoolMetrics, instrumented_pool_class
+from app.db.query_metrics import instrument_engine
+
 load_dotenv()
 
 # Database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+def psycopg_database_url(database_url: str) -> str:
+    """A database URL with the psycopg (3) driver for PostgreSQL"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+psycopg")
+    return url.render_as_string(hide_password=False)
+
+def engine_options(database_url: str, pool_class: Type[QueuePool], metrics: PoolMetrics) -> dict:
+    """
+    Pool, statement cache and prepared statement options from the settings
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    url = make_url(database_url)
+    options = {"query_cache_size": settings.DB_QUERY_CACHE_SIZE}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=instrumented_pool_class(pool_class, metrics),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+    if url.get_backend_name() == "postgresql":
+        # psycopg prepares a statement on the server once a connection has run
+        # it this many times; the hot tariff, catalog and settings queries
+        # compile to the same SQL each time, so they are prepared early
+        options["connect_args"] = {
+            "prepare_threshold": settings.DB_PREPARE_THRESHOLD if settings.DB_PREPARED_STATEMENTS else None
+        }
+    return options
+
+# Checkout wait and saturation of the engine's pool
+pool_metrics = PoolMetrics("sync")
+
 # Create SQLAlchemy engine
 engine = create_engine(
-    DATABASE_URL,
-    echo=False  # Set to True for SQL query logging
+    psycopg_database_url(DATABASE_URL),
+    echo=False,  # Set to True for SQL query logging
+    **engine_options(DATABASE_URL, QueuePool, pool_metrics)
 )
+instrument_engine(engine, "sync")
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,96 @@
+"""
+Connection pool metrics
+
+Times every checkout from an engine's connection pool (the wait for a free
+connection, or to open an overflow one) and reports pool saturation.
+"""
+
+import threading
+import time
+from typing import Optional, Type
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+class PoolMetrics:
+    """
+    Checkout wait counters for one engine's pool
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[Pool] = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        # Cumulative, one count per bucket plus +Inf
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def record(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            for index, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[index] += 1
+            self.wait_buckets[-1] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            stats = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "mean_wait_ms": self.wait_seconds_total / waits * 1000 if waits else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                "wait_buckets": dict(zip([str(bound) for bound in WAIT_BUCKETS] + ["+Inf"], self.wait_buckets))
+            }
+        pool = self.pool
+        if isinstance(pool, QueuePool):
+            # Overflow counts down from -pool_size until the pool has opened its connections
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            stats.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "saturation": pool.checkedout() / capacity if capacity else 0.0
+            })
+        return stats
+
+def instrumented_pool_class(base: Type[QueuePool], metrics: PoolMetrics) -> Type[QueuePool]:
+    """
+    A subclass of `base` that records checkout waits in `metrics`
+
+    Recreated pools (after `engine.dispose()`) are of the same class, so
+    they keep reporting to the same metrics.
+    """
+
+    class InstrumentedPool(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            metrics.pool = self
+
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.record(time.perf_counter() - started, timed_out=True)
+                raise
+            metrics.record(time.perf_counter() - started)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
@@ -0,0 +1,70 @@
+"""
+Database query metrics
+
+Times every statement an engine runs. Statements run while a request is
+being served are also added to that request's tally, so /metrics can show
+the number of queries and the query time per request.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import Histogram
+
+QUERY_DURATION = Histogram(
+    "calculator_db_query_duration_seconds",
+    "Duration of database statements",
+    ("engine",)
+)
+
+class QueryTally:
+    """
+    Statements run on behalf of one request
+    """
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+# The tally is a mutable object, so statements run on worker threads (which
+# get a copy of the request's context) still add to it
+_current_tally: ContextVar[Optional[QueryTally]] = ContextVar("query_tally", default=None)
+
+@contextmanager
+def tally_queries() -> Iterator[QueryTally]:
+    """
+    Count the statements run in this context (and in threads started from it)
+    """
+    tally = QueryTally()
+    token = _current_tally.set(tally)
+    try:
+        yield tally
+    finally:
+        _current_tally.reset(token)
+
+def instrument_engine(engine: Engine, name: str):
+    """
+    Record the duration of every statement `engine` runs
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finished(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("query_started", None)
+        if started is None:
+            return
+        seconds = time.perf_counter() - started
+        QUERY_DURATION.observe(seconds, name)
+        tally = _current_tally.get()
+        if tally is not None:
+            tally.queries += 1
+            tally.seconds += seconds
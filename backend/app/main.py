@@ -5,7 +5,13 @@ Main FastAPI application
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.logging_config import configure_logging, shutdown_logging
 from app.api.v1 import api_router
+from app.api.metrics import RequestMetricsMiddleware, router as metrics_router
+from app.services.worker_pool import shutdown_process_pool
+from app.services.quote_cache import quote_cache
+from app.services.password_hasher import password_hasher
+from app.db.async_database import dispose_async_engine
 
 # Create FastAPI application
 app = FastAPI(
@@ -24,8 +30,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time requests and their database work for /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, tags=["metrics"])
+
+@app.on_event("startup")
+def start_logging():
+    """
+    Start the background log writer
+    """
+    configure_logging()
+
+@app.on_event("startup")
+def start_workers():
+    """
+    Start the quote cache writer
+    """
+    if settings.QUOTE_CACHE_ENABLED:
+        quote_cache.start()
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    """
+    Flush the quote cache and stop the packing and password hashing pools
+    """
+    quote_cache.stop()
+    shutdown_process_pool()
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    """
+    Close the async database engine, if enabled
+    """
+    await dispose_async_engine()
+
+@app.on_event("shutdown")
+def stop_logging():
+    """
+    Write out queued log records
+    """
+    shutdown_logging()
 
 @app.get("/")
 def read_root():
@@ -19,8 +19,8 @@ class RateQuoteCache(Base):
     zone = Column(String, nullable=True)
     rate = Column(Float, nullable=False)
     source = Column(String, nullable=False, default="TARIFF")
-    requestHash = Column(String, nullable=False)
+    requestHash = Column(String, nullable=False, index=True)
     carrierResponse = Column(JSON, nullable=True)
-    expiresAt = Column(DateTime(timezone=True), nullable=False)
+    expiresAt = Column(DateTime(timezone=True), nullable=False, index=True)
     createdAt = Column(DateTime(timezone=True), server_default=func.now())
     updatedAt = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -2,12 +2,13 @@
 3D Bin Packing Problem data structures and schemas
 """
 
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from pydantic import BaseModel, Field
 
 # Core Data Structures
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Item:
     id: str
     name: str
@@ -16,8 +17,14 @@ class Item:
     height: float      # inches
     weight: float      # pounds
     quantity: int      # number of items
+    volume: float = field(init=False, repr=False, compare=False)                           # cubic inches per unit
+    sorted_dims: Tuple[float, float, float] = field(init=False, repr=False, compare=False)  # smallest first
 
-@dataclass
+    def __post_init__(self):
+        object.__setattr__(self, "volume", self.length * self.width * self.height)
+        object.__setattr__(self, "sorted_dims", tuple(sorted((self.length, self.width, self.height))))
+
+@dataclass(frozen=True, slots=True)
 class Box:
     id: str
     name: str
@@ -26,17 +33,149 @@ class Box:
     height: float      # inches
     max_weight: float  # pounds
     cost: float        # dollars
+    volume: float = field(init=False, repr=False, compare=False)                           # cubic inches
+    sorted_dims: Tuple[float, float, float] = field(init=False, repr=False, compare=False)  # smallest first
+
+    def __post_init__(self):
+        object.__setattr__(self, "volume", self.length * self.width * self.height)
+        object.__setattr__(self, "sorted_dims", tuple(sorted((self.length, self.width, self.height))))
+
+@dataclass(frozen=True, slots=True)
+class Placement:
+    item_id: str
+    x: float           # inches from the box origin
+    y: float           # inches from the box origin
+    z: float           # inches from the box floor
+    length: float      # placed (rotated) unit length in inches
+    width: float       # placed (rotated) unit width in inches
+    height: float      # placed (rotated) unit height in inches
+    count_x: int = 1   # units in the block along x
+    count_y: int = 1   # units in the block along y
+    count_z: int = 1   # units in the block along z
+
+    @property
+    def quantity(self) -> int:
+        return self.count_x * self.count_y * self.count_z
+
+    def unit_positions(self):
+        """(x, y, z) origin of every unit in the block"""
+        for k in range(self.count_z):
+            for j in range(self.count_y):
+                for i in range(self.count_x):
+                    yield (self.x + i * self.length, self.y + j * self.width, self.z + k * self.height)
+
+class PlacementColumns:
+    """
+    Struct-of-arrays list of placements
+
+    One row per block, kept in typed column arrays instead of one object
+    per block; indexing and iteration produce `Placement` views.
+    """
+    __slots__ = ("item_ids", "x", "y", "z", "length", "width", "height", "count_x", "count_y", "count_z")
+
+    def __init__(self, placements: Iterable[Placement] = ()):
+        self.item_ids: List[str] = []
+        self.x = array("d")
+        self.y = array("d")
+        self.z = array("d")
+        self.length = array("d")
+        self.width = array("d")
+        self.height = array("d")
+        self.count_x = array("l")
+        self.count_y = array("l")
+        self.count_z = array("l")
+        for placement in placements:
+            self.append(placement)
+
+    def append(self, placement: Placement):
+        self.append_block(
+            placement.item_id, placement.x, placement.y, placement.z,
+            placement.length, placement.width, placement.height,
+            placement.count_x, placement.count_y, placement.count_z
+        )
+
+    def append_block(self, item_id: str, x: float, y: float, z: float, length: float, width: float, height: float,
+                     count_x: int = 1, count_y: int = 1, count_z: int = 1):
+        """Add a block without building a Placement"""
+        self.item_ids.append(item_id)
+        self.x.append(x)
+        self.y.append(y)
+        self.z.append(z)
+        self.length.append(length)
+        self.width.append(width)
+        self.height.append(height)
+        self.count_x.append(count_x)
+        self.count_y.append(count_y)
+        self.count_z.append(count_z)
+
+    def with_item_ids(self, item_ids: Dict[str, str]) -> "PlacementColumns":
+        """Copy with item ids renamed through a mapping"""
+        copy = PlacementColumns()
+        copy.item_ids = [item_ids[item_id] for item_id in self.item_ids]
+        for column in PlacementColumns.__slots__[1:]:
+            setattr(copy, column, array(getattr(self, column).typecode, getattr(self, column)))
+        return copy
 
-@dataclass
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def __getitem__(self, index: int) -> Placement:
+        return Placement(
+            self.item_ids[index], self.x[index], self.y[index], self.z[index],
+            self.length[index], self.width[index], self.height[index],
+            self.count_x[index], self.count_y[index], self.count_z[index]
+        )
+
+    def __iter__(self) -> Iterator[Placement]:
+        for index in range(len(self.item_ids)):
+            yield self[index]
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other) if isinstance(other, (PlacementColumns, list)) else NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PlacementColumns({len(self)} blocks)"
+
+@dataclass(slots=True)
 class PackedBox:
     box: Box
-    items: List[Tuple[Item, int]]  # (item, quantity_in_this_box)
-    total_weight: float
-    total_volume: float
-    utilization: float        # volume utilization percentage
-    packing_efficiency: float # weight efficiency percentage
+    items: List[Tuple[Item, int]] = field(default_factory=list)  # (item, quantity_in_this_box)
+    total_weight: float = 0.0
+    total_volume: float = 0.0
+    utilization: float = 0.0        # volume utilization percentage
+    packing_efficiency: float = 0.0 # weight efficiency percentage
+    placements: PlacementColumns = field(default_factory=PlacementColumns)  # blocks of identical units
+    _item_rows: Dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.placements, PlacementColumns):
+            self.placements = PlacementColumns(self.placements)
+        self._item_rows = {id(item): row for row, (item, _) in enumerate(self.items)}
+
+    def __getstate__(self):
+        return (self.box, self.items, self.total_weight, self.total_volume,
+                self.utilization, self.packing_efficiency, self.placements)
 
-@dataclass
+    def __setstate__(self, state):
+        # Item rows are keyed by id(), so they are rebuilt rather than pickled
+        (self.box, self.items, self.total_weight, self.total_volume,
+         self.utilization, self.packing_efficiency, self.placements) = state
+        self._item_rows = {id(item): row for row, (item, _) in enumerate(self.items)}
+
+    def add(self, item: Item, quantity: int):
+        """Account for `quantity` more units of an item, updating the totals incrementally"""
+        row = self._item_rows.get(id(item))
+        if row is None:
+            self._item_rows[id(item)] = len(self.items)
+            self.items.append((item, quantity))
+        else:
+            self.items[row] = (item, self.items[row][1] + quantity)
+        self.total_weight += item.weight * quantity
+        self.total_volume += item.volume * quantity
+        self.utilization = (self.total_volume / self.box.volume) * 100 if self.box.volume else 0.0
+        self.packing_efficiency = (self.total_weight / self.box.max_weight) * 100 if self.box.max_weight else 0.0
+
+@dataclass(frozen=True, slots=True)
 class PackingRecommendation:
     box_id: str
     box_name: str
@@ -44,7 +183,7 @@ class PackingRecommendation:
     message: str
     suggested_products: Optional[List[dict]] = None
 
-@dataclass
+@dataclass(slots=True)
 class PackingResult:
     packed_boxes: List[PackedBox]
     total_boxes: int
@@ -54,6 +193,9 @@ class PackingResult:
     overflow_items: List[Tuple[Item, int]]
     recommendations: List[PackingRecommendation]
     debug_info: Optional[dict] = None
+    solver: Optional[str] = None            # "exact" or the heuristic strategy that produced the packing
+    optimality_gap: Optional[float] = None  # proven bound on the relative gap to the optimum, None if unknown
+    strategy_seconds: Optional[Dict[str, float]] = None  # time spent per strategy, solver and search when computed
 
 # Pydantic Schemas for API
 class ItemRequest(BaseModel):
@@ -81,6 +223,18 @@ class PackedItemResponse(BaseModel):
     dimensions: str
     weight: float
 
+class PlacementResponse(BaseModel):
+    item_id: str
+    x: float
+    y: float
+    z: float
+    length: float
+    width: float
+    height: float
+    count_x: int = 1
+    count_y: int = 1
+    count_z: int = 1
+
 class PackedBoxResponse(BaseModel):
     box: BoxResponse
     items: List[PackedItemResponse]
@@ -88,6 +242,7 @@ class PackedBoxResponse(BaseModel):
     total_volume: float
     utilization: float
     packing_efficiency: float
+    placements: List[PlacementResponse] = []
 
 class PackingRecommendationResponse(BaseModel):
     box_id: str
@@ -132,3 +287,49 @@ class ShippingCalculationResponse(BaseModel):
     calculation_id: str
     created_at: str
     debug_info: Optional[dict] = None
+
+class BatchCalculationRequest(BaseModel):
+    orders: List[ShippingCalculationRequest] = Field(..., min_length=1, description="Orders to price")
+
+class BatchOrderResult(BaseModel):
+    index: int
+    success: bool
+    result: Optional[ShippingCalculationResponse] = None
+    error: Optional[str] = None
+
+class BatchCalculationResponse(BaseModel):
+    results: List[BatchOrderResult]
+    total: int
+    succeeded: int
+    failed: int
+
+class QuoteMatrixRequest(BaseModel):
+    items: List[ItemRequest]
+    destination_zips: List[str] = Field(..., min_length=1, description="5-digit ZIP codes to price")
+    service_levels: List[str] = Field(
+        default_factory=lambda: ["overnight", "second_day", "standard"],
+        min_length=1,
+        description="Service levels to price: overnight, second_day and/or standard"
+    )
+    origin_zip: Optional[str] = Field(None, description="Origin ZIP code")
+    customer_id: str = Field(..., description="Customer ID")
+
+class QuoteMatrixCell(BaseModel):
+    destination_zip: str
+    zone: int
+    service_level: str
+    cost_breakdown: CostBreakdown
+
+class QuoteMatrixResponse(BaseModel):
+    total_weight: float
+    total_boxes: int
+    overall_efficiency: float
+    packed_boxes: List[PackedBoxResponse]
+    recommendations: List[PackingRecommendationResponse]
+    destination_zips: List[str]
+    service_levels: List[str]
+    quotes: List[QuoteMatrixCell]      # every service level for the first ZIP, then the next ZIP
+    total_costs: List[List[float]]     # [zip][service level] grid of total costs
+    cheapest: QuoteMatrixCell
+    calculation_id: str
+    created_at: str
@@ -4,6 +4,7 @@ System Settings schemas
 
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 
 class SystemSettingsResponse(BaseModel):
     id: str
@@ -12,8 +13,8 @@ class SystemSettingsResponse(BaseModel):
     primaryColor: Optional[str] = None
     secondaryColor: Optional[str] = None
     debugMode: bool
-    createdAt: str
-    updatedAt: str
+    createdAt: datetime
+    updatedAt: datetime
 
     model_config = {
         "from_attributes": True
@@ -0,0 +1,21 @@
+"""
+Zone lookup schemas
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class ZoneLookupResult(BaseModel):
+    zip_code: str
+    zone: Optional[int] = None
+    estimated: bool = False
+    error: Optional[str] = None
+
+class ZoneBatchRequest(BaseModel):
+    zip_codes: List[str] = Field(..., min_length=1, max_length=100000, description="5-digit ZIP codes")
+
+class ZoneBatchResponse(BaseModel):
+    results: List[ZoneLookupResult]
+    total: int
+    estimated: int
+    invalid: int
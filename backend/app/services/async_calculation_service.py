@@ -0,0 +1,142 @@
+"""
+Async calculation workflow
+
+Async counterpart of CalculationService.calculate_enhanced_shipping for the
+optional async stack. Independent lookups run concurrently on their own
+sessions, packing runs on an executor so the event loop stays free, and
+rating reads the in-memory tariff snapshot.
+"""
+
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.tracing import Trace, start_trace
+from app.services.debug_collector import debug_collector
+from app.db.async_database import run_in_session
+from app.schemas.packing import ShippingCalculationRequest, ShippingCalculationResponse, PackingResult
+from app.services.calculation_service import CalculationService
+from app.services.catalog_cache import catalog_cache, CatalogSnapshot
+from app.services.settings_cache import settings_cache
+from app.services.packing_algorithm import PackingAlgorithm, LandedCostObjective, pack_order
+from app.services.quote_cache import quote_cache, quote_request_hash
+from app.services.tariff_engine import TariffSnapshot
+from app.services.tyson_tariff_service import AsyncTysonTariffService
+from app.services.worker_pool import get_process_pool, reset_process_pool
+
+class AsyncCalculationService(CalculationService):
+    """
+    Calculation service for async handlers
+
+    Shares every workflow step that does no I/O (debug steps, caching,
+    rating and response building) with CalculationService, so only the
+    lookups differ. Only `calculate_enhanced_shipping` is async; batch,
+    matrix and streaming calculations stay on the sync service.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.tariff_service = AsyncTysonTariffService(db)
+
+    async def calculate_enhanced_shipping(self, request: ShippingCalculationRequest, debug_mode: Optional[bool] = None) -> ShippingCalculationResponse:
+        """
+        Complete calculation workflow, traced step by step
+
+        With `debug_mode` None the system settings decide, looked up
+        alongside the catalog and tariffs.
+        """
+        with start_trace("calculate", customer_id=request.customer_id, items=len(request.items)) as trace:
+            return await self._calculate_enhanced_shipping(request, debug_mode, trace)
+
+    async def _calculate_enhanced_shipping(self, request: ShippingCalculationRequest, debug_mode: Optional[bool], trace: Trace) -> ShippingCalculationResponse:
+        with trace.span("validation"):
+            self._validate_inputs(request)
+
+        # Settings, boxes and products, and tariffs (for the zone) are independent
+        with trace.span("catalog"):
+            debug_mode, catalog, snapshot = await asyncio.gather(
+                self._debug_mode() if debug_mode is None else _value(debug_mode),
+                self._catalog(request.customer_id),
+                self.tariff_service.snapshot()
+            )
+        debug = debug_collector(debug_mode)
+        self._record_inputs(request, catalog, debug)
+
+        request_hash = None
+        if settings.QUOTE_CACHE_ENABLED:
+            with trace.span("quote_cache"):
+                request_hash = quote_request_hash(request, catalog.box_set_signature, catalog.product_set_signature, snapshot.signature)
+                cached = await self.db.run_sync(lambda db: quote_cache.get(db, request_hash))
+            if cached is not None:
+                return self._serve_cached_quote(cached, request_hash, debug, trace)
+
+        items = self._prepare_items(request, catalog, debug, trace)
+        with trace.span("packing"):
+            packing_variant = self._packing_variant(request, snapshot)
+            packing_result = self._cached_packing(request, catalog, packing_variant, items, debug, trace)
+            if packing_result is None:
+                packing_result = await self._pack(request, catalog, snapshot, items, debug.enabled)
+                if debug.enabled:
+                    debug.algorithm = packing_result.debug_info
+                # Packed off the event loop without the product index, so recommend here
+                packing_result.recommendations = PackingAlgorithm(catalog.box_kernel).recommend(packing_result.packed_boxes, catalog.product_index)
+                self._store_packing(request, catalog, packing_variant, items, packing_result)
+        self._record_packing(items, packing_result, debug, trace)
+
+        with trace.span("zone"):
+            zone = await self.tariff_service.get_zone_from_zip(request.destination_zip)
+        with trace.span("rates"):
+            base_rate = await self.tariff_service.get_shipping_rate(request.destination_zip, request.service_level, packing_result.total_weight)
+            material_rate = await self.tariff_service.calculate_material_rate(packing_result.packed_boxes)
+            accessories_rate = await self.tariff_service.calculate_accessories_rate(packing_result.packed_boxes)
+        return self._rated_response(request, catalog, request_hash, zone, packing_result, base_rate, material_rate, accessories_rate, debug, trace)
+
+    async def _debug_mode(self) -> bool:
+        """Debug mode from the system settings, loading them on their own session when not cached"""
+        fresh, snapshot = settings_cache.peek()
+        if fresh:
+            return snapshot.debugMode if snapshot is not None else False
+        return await run_in_session(settings_cache.debug_mode)
+
+    async def _catalog(self, customer_id: str) -> CatalogSnapshot:
+        """A customer's catalog, loading it on its own session when not cached"""
+        return catalog_cache.peek(customer_id) or await run_in_session(lambda db: catalog_cache.get(db, customer_id))
+
+    async def _pack(self, request: ShippingCalculationRequest, catalog: CatalogSnapshot, snapshot: TariffSnapshot, items, debug_mode: bool = False) -> PackingResult:
+        """
+        Pack on the process pool for large orders, else on the default thread pool
+        """
+        total_units = sum(item.quantity for item in items)
+        pack = partial(
+            pack_order,
+            catalog.box_kernel,
+            items,
+            self._objective(request, snapshot),
+            settings.PACKING_TIME_BUDGET_MS / 1000,
+            settings.PACKING_EXACT_MAX_UNITS,
+            settings.PACKING_EXACT_NODE_BUDGET,
+            settings.PACKING_COST_SEARCH,
+            debug_mode
+        )
+        loop = asyncio.get_running_loop()
+        executor = get_process_pool() if total_units >= settings.PACKING_PARALLEL_MIN_UNITS else None
+        if executor is not None:
+            try:
+                return await loop.run_in_executor(executor, pack)
+            except BrokenProcessPool:
+                reset_process_pool()
+        return await loop.run_in_executor(None, pack)
+
+    def _objective(self, request: ShippingCalculationRequest, snapshot: TariffSnapshot):
+        """Objective used to pick between packing strategies"""
+        if settings.PACKING_OBJECTIVE != "landed_cost":
+            return settings.PACKING_OBJECTIVE
+        zone = snapshot.zones.lookup(request.destination_zip)
+        return LandedCostObjective(snapshot.cost_model(zone if zone is not None else 1, request.service_level))
+
+async def _value(value):
+    return value
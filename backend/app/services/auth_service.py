@@ -3,11 +3,14 @@ Authentication service
 """
 
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.models.user import User
 from app.schemas.auth import UserLogin, UserCreate, UserUpdate
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import create_access_token
 from datetime import timedelta
 from app.core.config import settings
+from app.services.principal_cache import principal_cache
+from app.services.password_hasher import password_hasher
 
 class AuthService:
     def __init__(self, db: Session):
@@ -17,36 +20,44 @@ class AuthService:
         """
         Authenticate a user with email and password
         """
-        user = self.db.query(User).filter(User.email == email).first()
+        user = self.get_user_by_email(email)
         if not user:
             return None
-        if not verify_password(password, user.password):
+        valid, new_hash = password_hasher.verify_and_update(password, user.password)
+        if not valid:
             return None
+        if new_hash is not None:
+            self._rehash(user, new_hash)
+        return user
+
+    async def authenticate_user_async(self, email: str, password: str) -> User | None:
+        """
+        Authenticate a user, awaiting the password check off the event loop
+        """
+        user = await run_in_threadpool(self.get_user_by_email, email)
+        if not user:
+            return None
+        valid, new_hash = await password_hasher.verify_and_update_async(password, user.password)
+        if not valid:
+            return None
+        if new_hash is not None:
+            await run_in_threadpool(self._rehash, user, new_hash)
         return user
     
     def create_user(self, user_data: UserCreate) -> User:
         """
         Create a new user
         """
-        # Check if user already exists
-        existing_user = self.db.query(User).filter(User.email == user_data.email).first()
-        if existing_user:
-            raise ValueError("User with this email already exists")
-        
-        # Create new user
-        hashed_password = get_password_hash(user_data.password)
-        db_user = User(
-            email=user_data.email,
-            password=hashed_password,
-            name=user_data.name,
-            role=user_data.role,
-            customerId=user_data.customerId
-        )
-        
-        self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
-        return db_user
+        self._check_new_email(user_data.email)
+        return self._add_user(user_data, password_hasher.hash(user_data.password))
+
+    async def create_user_async(self, user_data: UserCreate) -> User:
+        """
+        Create a new user, awaiting the password hash off the event loop
+        """
+        await run_in_threadpool(self._check_new_email, user_data.email)
+        hashed_password = await password_hasher.hash_async(user_data.password)
+        return await run_in_threadpool(self._add_user, user_data, hashed_password)
     
     def get_user_by_email(self, email: str) -> User | None:
         """
@@ -67,6 +78,7 @@ class AuthService:
         user = self.get_user_by_id(user_id)
         if not user:
             return None
+        previous_email = user.email
         
         # Update fields if provided
         if user_data.email is not None:
@@ -80,6 +92,8 @@ class AuthService:
         
         self.db.commit()
         self.db.refresh(user)
+        # Cached principals carry the old role and customer
+        principal_cache.invalidate(previous_email, user.email)
         return user
     
     def create_access_token_for_user(self, user: User) -> str:
@@ -92,3 +106,28 @@ class AuthService:
             expires_delta=access_token_expires
         )
         return access_token
+
+    def _check_new_email(self, email: str):
+        # Check if user already exists
+        if self.get_user_by_email(email):
+            raise ValueError("User with this email already exists")
+
+    def _add_user(self, user_data: UserCreate, hashed_password: str) -> User:
+        db_user = User(
+            email=user_data.email,
+            password=hashed_password,
+            name=user_data.name,
+            role=user_data.role,
+            customerId=user_data.customerId
+        )
+        
+        self.db.add(db_user)
+        self.db.commit()
+        self.db.refresh(db_user)
+        return db_user
+
+    def _rehash(self, user: User, new_hash: str):
+        """Store a password hash recomputed at the configured bcrypt cost"""
+        user.password = new_hash
+        self.db.commit()
+        self.db.refresh(user)
@@ -0,0 +1,72 @@
+"""
+Vectorized box feasibility kernel
+
+Holds a box catalog as NumPy column arrays (sorted dimensions, volume,
+max weight, cost), ordered by volume, and tests many units against every
+box at once. Rotation-aware fit compares sorted unit dimensions against
+sorted box dimensions, which is exact for axis-aligned rotations.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.schemas.packing import Box, Item
+from app.services.placement_engine import EPS
+
+class BoxKernel:
+    """
+    Box catalog as column arrays, smallest volume first
+    """
+    __slots__ = ("boxes", "dims", "volumes", "max_weights", "costs")
+
+    def __init__(self, boxes: Sequence[Box]):
+        sorted_dims = np.array([box.sorted_dims for box in boxes], dtype=float).reshape(-1, 3)
+        volumes = np.array([box.volume for box in boxes], dtype=float)
+        # Stable, so boxes of equal volume keep catalog order
+        order = np.argsort(volumes, kind="stable")
+        self.boxes: List[Box] = [boxes[index] for index in order]
+        self.dims = sorted_dims[order]
+        self.volumes = volumes[order]
+        self.max_weights = np.array([box.max_weight for box in self.boxes], dtype=float)
+        self.costs = np.array([box.cost for box in self.boxes], dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    @property
+    def largest(self) -> int:
+        """Index of the largest box (the first one if several tie)"""
+        return int(np.argmax(self.volumes))
+
+    def fit_matrix(self, items: Sequence[Item]) -> np.ndarray:
+        """
+        Boolean (items x boxes) matrix: one unit of item i fits empty box j
+        by dimensions (in some rotation) and weight
+        """
+        if not items:
+            return np.zeros((0, len(self.boxes)), dtype=bool)
+        unit_dims = np.array([item.sorted_dims for item in items], dtype=float)
+        unit_weights = np.array([item.weight for item in items], dtype=float)
+        fits = (unit_dims[:, None, :] <= self.dims[None, :, :] + EPS).all(axis=2)
+        return fits & (unit_weights[:, None] <= self.max_weights[None, :] + EPS)
+
+    def candidates(self, volume: float, weight: float, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Indices of boxes that hold `volume` and `weight` (and pass `mask`),
+        smallest first
+        """
+        feasible = (self.volumes >= volume) & (self.max_weights >= weight)
+        if mask is not None:
+            feasible &= mask
+        return np.flatnonzero(feasible)
+
+    def smallest(self, volume: float, weight: float, mask: Optional[np.ndarray] = None) -> Optional[int]:
+        """Index of the smallest box that holds `volume` and `weight` (and passes `mask`), or None"""
+        found = self.candidates(volume, weight, mask)
+        return int(found[0]) if len(found) else None
+
+    def largest_fitting(self, mask: np.ndarray) -> Optional[int]:
+        """Index of the largest box allowed by `mask`, or None"""
+        found = np.flatnonzero(mask)
+        return int(found[-1]) if len(found) else None
@@ -3,25 +3,51 @@ Enhanced Shipping Calculation Service
 """
 
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, NamedTuple, Optional, Union
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 import uuid
 
 from app.schemas.packing import (
     ShippingCalculationRequest,
     ShippingCalculationResponse,
+    BatchCalculationResponse,
+    BatchOrderResult,
     ItemRequest,
     BoxResponse,
     PackedItemResponse,
     PackedBoxResponse,
+    PlacementResponse,
     PackingRecommendationResponse,
-    CostBreakdown
+    CostBreakdown,
+    QuoteMatrixRequest,
+    QuoteMatrixCell,
+    QuoteMatrixResponse
 )
-from app.schemas.packing import Item, Box
-from app.services.packing_algorithm import PackingAlgorithm
+from app.schemas.packing import Item, PackingResult
+from app.services.packing_algorithm import PackingAlgorithm, LandedCostObjective, pack_order
 from app.services.tyson_tariff_service import TysonTariffService
-from app.models.overpack_box import OverpackBox
-from app.models.product import Product
+from app.services.tariff_engine import TariffSnapshot, tariff_engine
+from app.services.worker_pool import get_process_pool, reset_process_pool
+from app.services.packing_cache import packing_cache
+from app.services.quote_cache import quote_cache, quote_request_hash
+from app.services.catalog_cache import catalog_cache, CatalogSnapshot
+from app.services.box_kernel import BoxKernel
+from app.core.config import settings
+from app.core.metrics import record_packing
+from app.core.tracing import Trace, start_trace
+from app.services.debug_collector import DebugCollector, debug_collector
+
+class PendingOrder(NamedTuple):
+    """An order of a bulk run waiting for its packing"""
+    request: ShippingCalculationRequest
+    catalog: CatalogSnapshot
+    items: List[Item]
+    request_hash: Optional[str]
+    packing_variant: str
+    packing_result: Optional[PackingResult]
+    future: Optional[Future]
 
 class CalculationService:
     def __init__(self, db: Session):
@@ -30,146 +56,372 @@ class CalculationService:
 
     def calculate_enhanced_shipping(self, request: ShippingCalculationRequest, debug_mode: bool = False) -> ShippingCalculationResponse:
         """
-        Complete calculation workflow
+        Complete calculation workflow, traced step by step
         """
-        debug_info = {
-            "steps": [],
-            "algorithm_debug": {},
-            "box_selection": {},
-            "cost_calculation": {},
-            "timing": {}
-        }
-        
-        print("=== CALCULATION SERVICE DEBUG START ===")
-        print(f"Request: {request}")
-        print(f"Debug mode: {debug_mode}")
-        
+        with start_trace("calculate", customer_id=request.customer_id, items=len(request.items)) as trace:
+            return self._calculate_enhanced_shipping(request, debug_mode, trace)
+
+    def _calculate_enhanced_shipping(self, request: ShippingCalculationRequest, debug_mode: bool, trace: Trace) -> ShippingCalculationResponse:
+        debug = debug_collector(debug_mode)
+
         # 1. Validate inputs
-        print("Step 1: Validating inputs...")
-        self._validate_inputs(request)
-        print("✓ Input validation passed")
-        debug_info["steps"].append({
-            "step": 1,
-            "name": "Input Validation",
-            "status": "success",
-            "details": f"Validated {len(request.items)} items for ZIP {request.destination_zip}"
-        })
+        with trace.span("validation"):
+            self._validate_inputs(request)
 
         # 2. Get available boxes
-        print("Step 2: Getting available boxes...")
-        available_boxes = self._get_available_boxes(request.customer_id)
-        print(f"✓ Found {len(available_boxes)} available boxes")
-        debug_info["steps"].append({
-            "step": 2,
-            "name": "Box Retrieval",
-            "status": "success",
-            "details": f"Found {len(available_boxes)} available boxes for customer {request.customer_id}",
-            "boxes": [{"id": box.id, "name": box.name, "dimensions": f"{box.length}x{box.width}x{box.height}", "max_weight": box.max_weight} for box in available_boxes]
-        })
-
-        # 3. Get available products for recommendations
-        print("Step 3: Getting available products...")
-        available_products = self._get_available_products(request.customer_id)
-        print(f"✓ Found {len(available_products)} available products")
-        debug_info["steps"].append({
-            "step": 3,
-            "name": "Product Retrieval",
-            "status": "success",
-            "details": f"Found {len(available_products)} available products for recommendations"
-        })
-
-        # 4. Convert request items to algorithm items
-        print("Step 4: Converting items...")
-        algorithm_items = self._convert_to_algorithm_items(request.items)
-        print(f"✓ Converted {len(algorithm_items)} items")
-        debug_info["steps"].append({
-            "step": 4,
-            "name": "Item Conversion",
-            "status": "success",
-            "details": f"Converted {len(algorithm_items)} items for algorithm processing",
-            "items": [{"id": item.id, "name": item.name, "dimensions": f"{item.length}x{item.width}x{item.height}", "weight": item.weight, "quantity": item.quantity} for item in algorithm_items]
-        })
-
-        # 5. Run packing algorithm
-        print("Step 5: Running packing algorithm...")
-        packing_algorithm = PackingAlgorithm(available_boxes)
-        packing_result = packing_algorithm.pack_items(algorithm_items, available_products, debug_mode=debug_mode)
-        print(f"✓ Packing completed: {packing_result.total_boxes} boxes, {packing_result.total_weight} lbs")
-        
-        # Store algorithm debug info
-        if hasattr(packing_result, 'debug_info'):
-            debug_info["algorithm_debug"] = packing_result.debug_info
-        
-        debug_info["steps"].append({
-            "step": 5,
-            "name": "3D Packing Algorithm",
-            "status": "success",
-            "details": f"Packed {len(algorithm_items)} items into {packing_result.total_boxes} boxes",
-            "total_weight": packing_result.total_weight,
-            "overall_efficiency": packing_result.overall_efficiency,
-            "packed_boxes": len(packing_result.packed_boxes),
-            "overflow_items": len(packing_result.overflow_items)
-        })
-
-        # 6. Calculate shipping rates
-        print("Step 6: Calculating shipping rates...")
-        zone = self.tariff_service.get_zone_from_zip(request.destination_zip)
-        print(f"✓ Zone {zone} for ZIP {request.destination_zip}")
-        
-        base_rate = self.tariff_service.get_shipping_rate(
-            request.destination_zip, 
-            request.service_level, 
-            packing_result.total_weight
+        with trace.span("catalog"):
+            catalog = catalog_cache.get(self.db, request.customer_id)
+        self._record_inputs(request, catalog, debug)
+
+        # Serve a cached quote for an identical request before any packing or tariff work
+        request_hash = None
+        if settings.QUOTE_CACHE_ENABLED:
+            with trace.span("quote_cache"):
+                request_hash = quote_request_hash(request, catalog.box_set_signature, catalog.product_set_signature, tariff_engine.snapshot(self.db).signature)
+                cached = quote_cache.get(self.db, request_hash)
+            if cached is not None:
+                return self._serve_cached_quote(cached, request_hash, debug, trace)
+
+        # 3-4. Get available products and convert request items to algorithm items
+        algorithm_items = self._prepare_items(request, catalog, debug, trace)
+
+        # 5. Run packing algorithm (or reuse the packing of an identical order)
+        with trace.span("packing"):
+            packing_variant = self._packing_variant(request, tariff_engine.snapshot(self.db))
+            packing_result = self._cached_packing(request, catalog, packing_variant, algorithm_items, debug, trace)
+            if packing_result is None:
+                total_units = sum(item.quantity for item in algorithm_items)
+                packing_result = PackingAlgorithm(catalog.box_kernel).pack_items(
+                    algorithm_items,
+                    catalog.product_index,
+                    objective=self._packing_objective(request),
+                    time_budget=settings.PACKING_TIME_BUDGET_MS / 1000,
+                    executor=get_process_pool() if total_units >= settings.PACKING_PARALLEL_MIN_UNITS else None,
+                    exact_max_units=settings.PACKING_EXACT_MAX_UNITS,
+                    exact_node_budget=settings.PACKING_EXACT_NODE_BUDGET,
+                    cost_search=settings.PACKING_COST_SEARCH,
+                    debug=debug
+                )
+                self._store_packing(request, catalog, packing_variant, algorithm_items, packing_result)
+        self._record_packing(algorithm_items, packing_result, debug, trace)
+
+        # 6-8. Calculate shipping, material and accessory rates
+        with trace.span("zone"):
+            zone = self.tariff_service.get_zone_from_zip(request.destination_zip)
+        with trace.span("rates"):
+            base_rate = self.tariff_service.get_shipping_rate(request.destination_zip, request.service_level, packing_result.total_weight)
+            material_rate = self.tariff_service.calculate_material_rate(packing_result.packed_boxes)
+            accessories_rate = self.tariff_service.calculate_accessories_rate(packing_result.packed_boxes)
+
+        # 9-10. Total cost and response
+        return self._rated_response(request, catalog, request_hash, zone, packing_result, base_rate, material_rate, accessories_rate, debug, trace)
+
+    # Workflow steps shared with AsyncCalculationService, which does its own I/O between them
+
+    def _record_inputs(self, request: ShippingCalculationRequest, catalog: CatalogSnapshot, debug: DebugCollector):
+        """Debug steps for the validated request and the customer's boxes"""
+        debug.step("Input Validation", lambda: f"Validated {len(request.items)} items for ZIP {request.destination_zip}")
+        debug.boxes("Box Retrieval", catalog.boxes, lambda: f"Found {len(catalog.boxes)} available boxes for customer {request.customer_id} (catalog version {catalog.version})")
+
+    def _serve_cached_quote(self, cached: dict, request_hash: str, debug: DebugCollector, trace: Trace) -> ShippingCalculationResponse:
+        """Response for a quote cache hit"""
+        trace.set(quote_cache="hit")
+        with trace.span("response"):
+            response = self._cached_response(cached)
+        debug.step("Quote Cache", lambda: f"Served cached quote {request_hash[:12]}")
+        return self._finish(response, debug, trace)
+
+    def _prepare_items(self, request: ShippingCalculationRequest, catalog: CatalogSnapshot, debug: DebugCollector, trace: Trace) -> List[Item]:
+        """Algorithm items for the request, with their debug steps"""
+        debug.step("Product Retrieval", lambda: f"Found {len(catalog.product_index)} available products for recommendations")
+        with trace.span("items"):
+            items = self._convert_to_algorithm_items(request.items)
+        debug.step(
+            "Item Conversion",
+            lambda: f"Converted {len(items)} items for algorithm processing",
+            lambda: {"items": [{"id": item.id, "name": item.name, "dimensions": f"{item.length}x{item.width}x{item.height}", "weight": item.weight, "quantity": item.quantity} for item in items]}
+        )
+        return items
+
+    def _cached_packing(self, request: ShippingCalculationRequest, catalog: CatalogSnapshot, packing_variant: str, items: List[Item], debug: DebugCollector, trace: Trace) -> Optional[PackingResult]:
+        """The packing of an identical order, with recommendations, or None"""
+        packing_result = packing_cache.get(request.customer_id, catalog.box_set_signature, packing_variant, items)
+        if packing_result is not None:
+            trace.set(packing_cache="hit")
+            packing_result.recommendations = PackingAlgorithm(catalog.box_kernel).recommend(packing_result.packed_boxes, catalog.product_index)
+            debug.final(strategy="cache", solver=packing_result.solver, optimality_gap=packing_result.optimality_gap)
+            if debug.enabled:
+                debug.placements(packing_result.packed_boxes)
+        return packing_result
+
+    def _store_packing(self, request: ShippingCalculationRequest, catalog: CatalogSnapshot, packing_variant: str, items: List[Item], packing_result: PackingResult):
+        """Record a freshly computed packing and cache it"""
+        record_packing(packing_result)
+        # The cached packing is shared, so it does not keep this request's debug details
+        packing_result.debug_info = None
+        packing_cache.put(request.customer_id, catalog.box_set_signature, packing_variant, items, packing_result)
+
+    def _record_packing(self, items: List[Item], packing_result: PackingResult, debug: DebugCollector, trace: Trace):
+        """Trace attributes and debug steps for the packing used"""
+        trace.set(units=sum(item.quantity for item in items), boxes=packing_result.total_boxes, solver=packing_result.solver)
+        debug.step(
+            "3D Packing Algorithm",
+            lambda: f"Packed {len(items)} items into {packing_result.total_boxes} boxes",
+            lambda: {
+                "total_weight": packing_result.total_weight,
+                "overall_efficiency": packing_result.overall_efficiency,
+                "packed_boxes": len(packing_result.packed_boxes),
+                "overflow_items": len(packing_result.overflow_items)
+            }
+        )
+        debug.selection(packing_result.packed_boxes)
+
+    def _rated_response(
+        self,
+        request: ShippingCalculationRequest,
+        catalog: CatalogSnapshot,
+        request_hash: Optional[str],
+        zone: int,
+        packing_result: PackingResult,
+        base_rate: float,
+        material_rate: float,
+        accessories_rate: float,
+        debug: DebugCollector,
+        trace: Trace
+    ) -> ShippingCalculationResponse:
+        """Total the rates, build the response and cache the quote"""
+        debug.step("Shipping Rate Calculation", lambda: f"Zone {zone} for ZIP {request.destination_zip}, Base rate: ${base_rate:.2f}")
+        debug.step("Material Rate Calculation", lambda: f"Material rate: ${material_rate:.2f}")
+        debug.step("Accessory Rate Calculation", lambda: f"Accessories rate: ${accessories_rate:.2f}")
+
+        total_cost = base_rate + material_rate + accessories_rate
+        debug.cost(zone=zone, base_rate=base_rate, material_rate=material_rate, accessories_rate=accessories_rate, total_cost=total_cost)
+        debug.step("Total Cost Calculation", lambda: f"Total cost: ${total_cost:.2f} (Base: ${base_rate:.2f} + Material: ${material_rate:.2f} + Accessories: ${accessories_rate:.2f})")
+
+        with trace.span("response"):
+            response = self._build_response(
+                request,
+                zone,
+                packing_result,
+                CostBreakdown(
+                    base_rate=base_rate,
+                    material_rate=material_rate,
+                    accessories=accessories_rate,
+                    total_cost=total_cost
+                )
+            )
+            if request_hash is not None:
+                quote_cache.put(request, request_hash, catalog.box_set_signature, response)
+        return self._finish(response, debug, trace)
+
+    def _finish(self, response: ShippingCalculationResponse, debug: DebugCollector, trace: Trace) -> ShippingCalculationResponse:
+        """Attach debug info (with step timings) when debug mode is on"""
+        if debug.enabled:
+            debug.timings(trace.timings())
+        response.debug_info = debug.as_dict()
+        return response
+
+    def calculate_batch(self, requests: List[ShippingCalculationRequest]) -> BatchCalculationResponse:
+        """
+        Price many orders at once
+
+        Each customer's boxes and products are loaded once for the whole
+        batch and orders that miss the caches are packed concurrently on the
+        shared process pool. A failing order is reported in its own result
+        and does not affect the others. Batch results carry no debug info.
+        """
+        results: List[Optional[BatchOrderResult]] = [None] * len(requests)
+        tariff_engine.snapshot(self.db)
+
+        # First pass: validate, serve cached quotes and submit the rest for packing
+        pending = []
+        for index, request in enumerate(requests):
+            try:
+                submitted = self.submit_order(request)
+            except Exception as e:
+                results[index] = self._batch_error(index, e)
+                continue
+            if isinstance(submitted, ShippingCalculationResponse):
+                results[index] = BatchOrderResult(index=index, success=True, result=submitted)
+            else:
+                pending.append((index, submitted))
+
+        # Second pass: collect packings in order, then rate and cache each quote
+        for index, order in pending:
+            try:
+                results[index] = BatchOrderResult(index=index, success=True, result=self.complete_order(order))
+            except Exception as e:
+                results[index] = self._batch_error(index, e)
+
+        succeeded = sum(1 for result in results if result.success)
+        return BatchCalculationResponse(
+            results=results,
+            total=len(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded
+        )
+
+    def calculate_quote_matrix(self, request: QuoteMatrixRequest) -> QuoteMatrixResponse:
+        """
+        Pack an order once and price it for every destination ZIP and service level
+
+        The packing does not depend on the destination: the landed cost of
+        candidate packings differs only in the base rate, which is the same
+        for all of them. All base rates come from one vectorized lookup.
+        """
+        for destination_zip in request.destination_zips:
+            if len(destination_zip) != 5 or not destination_zip.isdigit():
+                raise ValueError(f"ZIP code must be 5 digits: {destination_zip}")
+        for service_level in request.service_levels:
+            if service_level not in ["overnight", "second_day", "standard"]:
+                raise ValueError(f"Invalid service level: {service_level}")
+        # Stands in for every cell when validating, packing and caching
+        order = ShippingCalculationRequest(
+            items=request.items,
+            destination_zip=request.destination_zips[0],
+            service_level=request.service_levels[0],
+            origin_zip=request.origin_zip,
+            customer_id=request.customer_id
+        )
+        self._validate_inputs(order)
+
+        catalog = catalog_cache.get(self.db, request.customer_id)
+        items = self._convert_to_algorithm_items(request.items)
+        packing_variant = self._packing_variant(order, tariff_engine.snapshot(self.db))
+        packing_result = packing_cache.get(request.customer_id, catalog.box_set_signature, packing_variant, items)
+        if packing_result is None:
+            packing_result = self._collect_packing(order, catalog.box_kernel, items, None)
+            record_packing(packing_result)
+            packing_cache.put(request.customer_id, catalog.box_set_signature, packing_variant, items, packing_result)
+        packing_result.recommendations = PackingAlgorithm(catalog.box_kernel).recommend(packing_result.packed_boxes, catalog.product_index)
+
+        zones, base_rates = self.tariff_service.get_shipping_rate_matrix(
+            request.destination_zips, request.service_levels, packing_result.total_weight
         )
-        print(f"✓ Base rate: ${base_rate}")
-        debug_info["cost_calculation"]["zone"] = zone
-        debug_info["cost_calculation"]["base_rate"] = base_rate
-        debug_info["steps"].append({
-            "step": 6,
-            "name": "Shipping Rate Calculation",
-            "status": "success",
-            "details": f"Zone {zone} for ZIP {request.destination_zip}, Base rate: ${base_rate:.2f}"
-        })
-
-        # 7. Calculate material rates
-        print("Step 7: Calculating material rates...")
         material_rate = self.tariff_service.calculate_material_rate(packing_result.packed_boxes)
-        print(f"✓ Material rate: ${material_rate}")
-        debug_info["cost_calculation"]["material_rate"] = material_rate
-        debug_info["steps"].append({
-            "step": 7,
-            "name": "Material Rate Calculation",
-            "status": "success",
-            "details": f"Material rate: ${material_rate:.2f}"
-        })
-
-        # 8. Calculate accessory rates
-        print("Step 8: Calculating accessory rates...")
         accessories_rate = self.tariff_service.calculate_accessories_rate(packing_result.packed_boxes)
-        print(f"✓ Accessories rate: ${accessories_rate}")
-        debug_info["cost_calculation"]["accessories_rate"] = accessories_rate
-        debug_info["steps"].append({
-            "step": 8,
-            "name": "Accessory Rate Calculation",
-            "status": "success",
-            "details": f"Accessories rate: ${accessories_rate:.2f}"
-        })
-
-        # 9. Calculate total cost
-        print("Step 9: Calculating total cost...")
-        total_cost = base_rate + material_rate + accessories_rate
-        print(f"✓ Total cost: ${total_cost}")
-        debug_info["cost_calculation"]["total_cost"] = total_cost
-        debug_info["steps"].append({
-            "step": 9,
-            "name": "Total Cost Calculation",
-            "status": "success",
-            "details": f"Total cost: ${total_cost:.2f} (Base: ${base_rate:.2f} + Material: ${material_rate:.2f} + Accessories: ${accessories_rate:.2f})"
-        })
-
-        # 10. Build response
-        print("Step 10: Building response...")
-        response = ShippingCalculationResponse(
+        total_costs = base_rates + (material_rate + accessories_rate)
+
+        quotes = [
+            QuoteMatrixCell(
+                destination_zip=destination_zip,
+                zone=zone,
+                service_level=service_level,
+                cost_breakdown=CostBreakdown(
+                    base_rate=float(base_rates[row, column]),
+                    material_rate=material_rate,
+                    accessories=accessories_rate,
+                    total_cost=float(total_costs[row, column])
+                )
+            )
+            for row, (destination_zip, zone) in enumerate(zip(request.destination_zips, zones))
+            for column, service_level in enumerate(request.service_levels)
+        ]
+        return QuoteMatrixResponse(
+            total_weight=packing_result.total_weight,
+            total_boxes=packing_result.total_boxes,
+            overall_efficiency=packing_result.overall_efficiency,
+            packed_boxes=self._convert_packed_boxes_to_response(packing_result.packed_boxes),
+            recommendations=self._convert_recommendations_to_response(packing_result.recommendations),
+            destination_zips=request.destination_zips,
+            service_levels=request.service_levels,
+            quotes=quotes,
+            total_costs=total_costs.tolist(),
+            cheapest=quotes[int(total_costs.argmin())],
+            calculation_id=str(uuid.uuid4()),
+            created_at=datetime.utcnow().isoformat()
+        )
+
+    def submit_order(self, request: ShippingCalculationRequest) -> Union[ShippingCalculationResponse, PendingOrder]:
+        """
+        Start pricing one order of a bulk run
+
+        Returns the quote straight away when it is cached, otherwise a
+        pending order whose packing (on a cache miss) is running on the
+        process pool.
+        """
+        self._validate_inputs(request)
+        catalog = catalog_cache.get(self.db, request.customer_id)
+
+        request_hash = None
+        if settings.QUOTE_CACHE_ENABLED:
+            request_hash = quote_request_hash(request, catalog.box_set_signature, catalog.product_set_signature, tariff_engine.snapshot(self.db).signature)
+            cached = quote_cache.get(self.db, request_hash)
+            if cached is not None:
+                return self._cached_response(cached)
+
+        items = self._convert_to_algorithm_items(request.items)
+        packing_variant = self._packing_variant(request, tariff_engine.snapshot(self.db))
+        packing_result = packing_cache.get(request.customer_id, catalog.box_set_signature, packing_variant, items)
+        future = None
+        executor = get_process_pool() if packing_result is None else None
+        if executor is not None:
+            try:
+                future = executor.submit(
+                    pack_order, catalog.box_kernel, items, self._packing_objective(request),
+                    settings.PACKING_TIME_BUDGET_MS / 1000,
+                    settings.PACKING_EXACT_MAX_UNITS,
+                    settings.PACKING_EXACT_NODE_BUDGET,
+                    settings.PACKING_COST_SEARCH
+                )
+            except BrokenProcessPool:
+                reset_process_pool()
+        return PendingOrder(request, catalog, items, request_hash, packing_variant, packing_result, future)
+
+    def complete_order(self, order: PendingOrder) -> ShippingCalculationResponse:
+        """
+        Finish a pending order: wait for its packing, then rate and cache the quote
+        """
+        request, catalog = order.request, order.catalog
+        packing_result = order.packing_result
+        if packing_result is None:
+            packing_result = self._collect_packing(request, catalog.box_kernel, order.items, order.future)
+            record_packing(packing_result)
+            packing_cache.put(request.customer_id, catalog.box_set_signature, order.packing_variant, order.items, packing_result)
+        packing_result.recommendations = PackingAlgorithm(catalog.box_kernel).recommend(packing_result.packed_boxes, catalog.product_index)
+
+        response = self._quote(request, packing_result)
+        if order.request_hash is not None:
+            quote_cache.put(request, order.request_hash, catalog.box_set_signature, response)
+        return response
+
+    def _collect_packing(self, request: ShippingCalculationRequest, boxes: BoxKernel, items: List[Item], future: Optional[Future]) -> PackingResult:
+        """Result of a pooled packing, repacking inline if the pool broke"""
+        if future is not None:
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                reset_process_pool()
+        return pack_order(
+            boxes, items, self._packing_objective(request), settings.PACKING_TIME_BUDGET_MS / 1000,
+            settings.PACKING_EXACT_MAX_UNITS, settings.PACKING_EXACT_NODE_BUDGET, settings.PACKING_COST_SEARCH
+        )
+
+    def _batch_error(self, index: int, error: Exception) -> BatchOrderResult:
+        message = str(error) if isinstance(error, ValueError) else f"Calculation failed: {error}"
+        return BatchOrderResult(index=index, success=False, error=message)
+
+    def _quote(self, request: ShippingCalculationRequest, packing_result: PackingResult) -> ShippingCalculationResponse:
+        """Rate a finished packing and build the response"""
+        zone = self.tariff_service.get_zone_from_zip(request.destination_zip)
+        base_rate = self.tariff_service.get_shipping_rate(request.destination_zip, request.service_level, packing_result.total_weight)
+        material_rate = self.tariff_service.calculate_material_rate(packing_result.packed_boxes)
+        accessories_rate = self.tariff_service.calculate_accessories_rate(packing_result.packed_boxes)
+        return self._build_response(
+            request,
+            zone,
+            packing_result,
+            CostBreakdown(
+                base_rate=base_rate,
+                material_rate=material_rate,
+                accessories=accessories_rate,
+                total_cost=base_rate + material_rate + accessories_rate
+            )
+        )
+
+    def _build_response(self, request: ShippingCalculationRequest, zone: int, packing_result: PackingResult, cost_breakdown: CostBreakdown) -> ShippingCalculationResponse:
+        """Assemble the response for a rated packing"""
+        return ShippingCalculationResponse(
             destination_zip=request.destination_zip,
             zone=zone,
             service_level=request.service_level,
@@ -177,25 +429,39 @@ class CalculationService:
             total_boxes=packing_result.total_boxes,
             overall_efficiency=packing_result.overall_efficiency,
             box_costs=0.0,  # Not used in current implementation
-            cost_breakdown=CostBreakdown(
-                base_rate=base_rate,
-                material_rate=material_rate,
-                accessories=accessories_rate,
-                total_cost=total_cost
-            ),
+            cost_breakdown=cost_breakdown,
             packed_boxes=self._convert_packed_boxes_to_response(packing_result.packed_boxes),
             recommendations=self._convert_recommendations_to_response(packing_result.recommendations),
             calculation_id=str(uuid.uuid4()),
             created_at=datetime.utcnow().isoformat()
         )
-        
-        # Add debug info to response if debug mode is enabled
-        if debug_mode:
-            response.debug_info = debug_info
-        
-        print("✓ Response built successfully")
-        print("=== CALCULATION SERVICE DEBUG END - SUCCESS ===")
-        return response
+
+    def _cached_response(self, cached: dict) -> ShippingCalculationResponse:
+        """Response for a cached quote payload with fresh per-request fields"""
+        return ShippingCalculationResponse(
+            **cached,
+            calculation_id=str(uuid.uuid4()),
+            created_at=datetime.utcnow().isoformat()
+        )
+
+    def _packing_objective(self, request: ShippingCalculationRequest):
+        """Objective used to pick between packing strategies"""
+        if settings.PACKING_OBJECTIVE != "landed_cost":
+            return settings.PACKING_OBJECTIVE
+        # Priced from the tariff snapshot so the objective can be sent to worker processes
+        zone = self.tariff_service.get_zone_from_zip(request.destination_zip)
+        return LandedCostObjective(tariff_engine.snapshot(self.db).cost_model(zone, request.service_level))
+
+    def _packing_variant(self, request: ShippingCalculationRequest, snapshot: TariffSnapshot) -> str:
+        """
+        Packing cache key part for what, besides the order and the boxes,
+        decides the packing: the objective and, for landed cost, the tariff,
+        zone and service level it is priced from
+        """
+        if settings.PACKING_OBJECTIVE != "landed_cost":
+            return settings.PACKING_OBJECTIVE
+        zone = snapshot.zones.lookup(request.destination_zip)
+        return f"landed_cost:{snapshot.signature}:{zone}:{request.service_level}"
 
     def _validate_inputs(self, request: ShippingCalculationRequest):
         """Validate all inputs before processing"""
@@ -216,46 +482,6 @@ class CalculationService:
             if item.weight <= 0:
                 raise ValueError(f"Invalid weight for item {item.name}")
 
-    def _get_available_boxes(self, customer_id: str) -> List[Box]:
-        """Get available overpack boxes for customer"""
-        db_boxes = self.db.query(OverpackBox).filter(
-            OverpackBox.customerId == customer_id,
-            OverpackBox.active == True
-        ).all()
-
-        return [
-            Box(
-                id=str(box.id),
-                name=box.name,
-                length=box.length,
-                width=box.width,
-                height=box.height,
-                max_weight=box.maxWeight,
-                cost=box.cost or 0.0
-            )
-            for box in db_boxes
-        ]
-
-    def _get_available_products(self, customer_id: str) -> List[dict]:
-        """Get available products for recommendations"""
-        db_products = self.db.query(Product).filter(
-            Product.customerId == customer_id,
-            Product.active == True
-        ).all()
-
-        return [
-            {
-                'id': str(product.id),
-                'name': product.name,
-                'sku': product.sku,
-                'length': product.length,
-                'width': product.width,
-                'height': product.height,
-                'weight': product.weight
-            }
-            for product in db_products
-        ]
-
     def _convert_to_algorithm_items(self, request_items: List[ItemRequest]) -> List[Item]:
         """Convert request items to algorithm items"""
         return [
@@ -302,7 +528,22 @@ class CalculationService:
                 total_weight=packed_box.total_weight,
                 total_volume=packed_box.total_volume,
                 utilization=packed_box.utilization,
-                packing_efficiency=packed_box.packing_efficiency
+                packing_efficiency=packed_box.packing_efficiency,
+                placements=[
+                    PlacementResponse(
+                        item_id=placement.item_id,
+                        x=placement.x,
+                        y=placement.y,
+                        z=placement.z,
+                        length=placement.length,
+                        width=placement.width,
+                        height=placement.height,
+                        count_x=placement.count_x,
+                        count_y=placement.count_y,
+                        count_z=placement.count_z
+                    )
+                    for placement in packed_box.placements
+                ]
             ))
 
         return result
@@ -0,0 +1,237 @@
+"""
+Per-customer catalog cache
+
+Keeps each customer's active overpack boxes and products in memory as a
+versioned snapshot, so calculations do no catalog queries in steady state.
+Box changes drop the snapshot, product changes are patched into its product
+index, and other worker processes revalidate against an updatedAt watermark.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.overpack_box import OverpackBox
+from app.models.product import Product
+from app.schemas.packing import Box
+from app.services.quote_cache import box_signature
+from app.services.product_index import ProductIndex
+from app.services.box_kernel import BoxKernel
+
+def product_record(product) -> dict:
+    """Catalog record for a product row or model"""
+    return {
+        'id': str(product.id),
+        'name': product.name,
+        'sku': product.sku,
+        'length': product.length,
+        'width': product.width,
+        'height': product.height,
+        'weight': product.weight
+    }
+
+class CatalogSnapshot:
+    """
+    One customer's active catalog at one version
+
+    `box_kernel` holds the boxes as column arrays sorted by volume
+    (smallest first), with `boxes` in the same order; both are read-only.
+    `product_index` is only changed through the cache.
+    """
+    __slots__ = ("customer_id", "version", "watermark", "checked_at", "box_kernel", "boxes", "product_index", "box_set_signature")
+
+    def __init__(self, customer_id: str, version: int, watermark: tuple, boxes: List[Box], products: List[dict]):
+        self.customer_id = customer_id
+        self.version = version
+        self.watermark = watermark
+        self.checked_at = time.monotonic()
+        self.box_kernel = BoxKernel(boxes)
+        self.boxes = self.box_kernel.boxes
+        self.product_index = ProductIndex(products)
+        self.box_set_signature = box_signature(self.boxes)
+
+    @property
+    def product_set_signature(self) -> str:
+        """Content hash of the products, which are patched in place"""
+        return self.product_index.signature
+
+class CatalogCache:
+    """
+    Process-wide cache of catalog snapshots
+
+    A snapshot is served as is for `check_interval_seconds` after it was
+    loaded or last validated; after that one watermark query (latest
+    updatedAt and row count of the customer's boxes and products) decides
+    whether it is still current. 0 disables the check, leaving only the
+    explicit invalidation done by this process.
+    """
+
+    def __init__(self, check_interval_seconds: float = 0):
+        self.check_interval_seconds = check_interval_seconds
+        self._snapshots: Dict[str, CatalogSnapshot] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def get(self, db: Session, customer_id: str) -> CatalogSnapshot:
+        """
+        Current catalog snapshot for a customer, loading it if missing or outdated
+        """
+        snapshot = self._snapshots.get(customer_id)
+        if snapshot is not None and not self._is_due(snapshot):
+            self.hits += 1
+            return snapshot
+
+        watermark = self._watermark(db, customer_id)
+        if snapshot is not None:
+            self.revalidations += 1
+            if snapshot.watermark == watermark:
+                snapshot.checked_at = time.monotonic()
+                self.hits += 1
+                return snapshot
+
+        self.misses += 1
+        version = self._versions.get(customer_id, 0)
+        snapshot = CatalogSnapshot(
+            customer_id,
+            version,
+            watermark,
+            self._load_boxes(db, customer_id),
+            self._load_products(db, customer_id)
+        )
+        with self._lock:
+            # Do not publish a load that raced with an invalidation
+            if self._versions.get(customer_id, 0) == version:
+                self._snapshots[customer_id] = snapshot
+        return snapshot
+
+    def peek(self, customer_id: str) -> Optional[CatalogSnapshot]:
+        """
+        A customer's snapshot if it can be served without a database check, else None
+        """
+        snapshot = self._snapshots.get(customer_id)
+        if snapshot is None or self._is_due(snapshot):
+            return None
+        self.hits += 1
+        return snapshot
+
+    def invalidate(self, customer_id: str):
+        """
+        Drop a customer's snapshot after a box or product change
+        """
+        with self._lock:
+            self._versions[customer_id] = self._versions.get(customer_id, 0) + 1
+            self._snapshots.pop(customer_id, None)
+
+    def apply_product_write(self, db: Session, product: Product, previous_customer_id: Optional[str] = None, created: bool = False):
+        """
+        Patch cached product indexes after a committed product write
+
+        The snapshot's watermark is advanced by exactly this write; if the
+        database watermark differs, someone else changed the catalog too and
+        the snapshot is dropped instead.
+        """
+        customer_ids = {product.customerId}
+        if previous_customer_id is not None:
+            customer_ids.add(previous_customer_id)
+        record = product_record(product)
+        updated_at = product.updatedAt
+
+        for customer_id in customer_ids:
+            snapshot = self._snapshots.get(customer_id)
+            if snapshot is None:
+                self.invalidate(customer_id)
+                continue
+
+            moved_in = customer_id == product.customerId and (created or previous_customer_id not in (None, customer_id))
+            moved_out = customer_id == previous_customer_id and customer_id != product.customerId
+            box_latest, box_count, product_latest, product_count = snapshot.watermark
+            if moved_out:
+                expected_latest = product_latest
+            else:
+                expected_latest = updated_at if product_latest is None or updated_at > product_latest else product_latest
+            expected = (box_latest, box_count, expected_latest, product_count + moved_in - moved_out)
+            if self._watermark(db, customer_id) != expected:
+                self.invalidate(customer_id)
+                continue
+
+            with self._lock:
+                if self._snapshots.get(customer_id) is not snapshot:
+                    continue
+                if product.active and customer_id == product.customerId:
+                    snapshot.product_index.add(record)
+                else:
+                    snapshot.product_index.discard(record['id'])
+                # Loads that started before this write must not replace the patched snapshot
+                self._versions[customer_id] = self._versions.get(customer_id, 0) + 1
+                snapshot.version = self._versions[customer_id]
+                snapshot.watermark = expected
+
+    def clear(self):
+        with self._lock:
+            for customer_id in self._snapshots:
+                self._versions[customer_id] = self._versions.get(customer_id, 0) + 1
+            self._snapshots.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "customers": len(self._snapshots),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+    def _is_due(self, snapshot: CatalogSnapshot) -> bool:
+        return bool(self.check_interval_seconds) and time.monotonic() - snapshot.checked_at > self.check_interval_seconds
+
+    def _watermark(self, db: Session, customer_id: str) -> Tuple:
+        """Latest updatedAt and row count of a customer's boxes and products, in one query"""
+        def latest(model):
+            return db.query(func.max(model.updatedAt)).filter(model.customerId == customer_id).scalar_subquery()
+
+        def count(model):
+            return db.query(func.count(model.id)).filter(model.customerId == customer_id).scalar_subquery()
+
+        return tuple(db.query(latest(OverpackBox), count(OverpackBox), latest(Product), count(Product)).one())
+
+    def _load_boxes(self, db: Session, customer_id: str) -> List[Box]:
+        rows = db.query(
+            OverpackBox.id, OverpackBox.name, OverpackBox.length, OverpackBox.width,
+            OverpackBox.height, OverpackBox.maxWeight, OverpackBox.cost
+        ).filter(
+            OverpackBox.customerId == customer_id,
+            OverpackBox.active == True
+        ).all()
+        return [
+            Box(
+                id=str(row.id),
+                name=row.name,
+                length=row.length,
+                width=row.width,
+                height=row.height,
+                max_weight=row.maxWeight,
+                cost=row.cost or 0.0
+            )
+            for row in rows
+        ]
+
+    def _load_products(self, db: Session, customer_id: str) -> List[dict]:
+        rows = db.query(
+            Product.id, Product.name, Product.sku, Product.length,
+            Product.width, Product.height, Product.weight
+        ).filter(
+            Product.customerId == customer_id,
+            Product.active == True
+        ).all()
+        return [product_record(row) for row in rows]
+
+# Shared cache instance
+catalog_cache = CatalogCache(check_interval_seconds=settings.CATALOG_CACHE_CHECK_INTERVAL_SECONDS)
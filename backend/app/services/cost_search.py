@@ -0,0 +1,162 @@
+"""
+Landed cost search
+
+Local search that lowers the landed cost of a complete packing. The base
+rate depends only on the order's weight, so a packing's cost is a fixed
+part plus a charge per box, and a move is judged by the charges of the
+boxes it removes and adds alone. Moves:
+
+- repack one box's contents into a cheaper set of boxes (the exact solver
+  for small contents, one cheaper box otherwise), which covers both
+  downsizing a box and splitting it into smaller ones
+- merge two boxes' contents into one box cheaper than both
+
+Improving moves are applied, most expensive boxes first, until none is
+left or the node budget or deadline runs out.
+"""
+
+import time
+from itertools import combinations
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from app.schemas.packing import Item, Box, PackedBox
+from app.services.placement_engine import BoxPacker
+from app.services.box_kernel import BoxKernel
+from app.services.exact_solver import ExactSolver, Key, add_keys
+
+Runs = List[Tuple[Item, int]]
+
+class _BudgetExceeded(Exception):
+    pass
+
+class CostSearch:
+    """
+    Improve a packing under a per-box key (lower is better)
+
+    Each placement attempt and each exact solver node counts against
+    `node_budget`. `exact_max_units` caps the box contents handed to the
+    exact solver; 0 only tries single cheaper boxes.
+    """
+
+    def __init__(
+        self,
+        kernel: BoxKernel,
+        box_key: Callable[[Box], Key],
+        node_budget: int = 20000,
+        deadline: Optional[float] = None,
+        exact_max_units: int = 0
+    ):
+        self.kernel = kernel
+        self.box_key = box_key
+        self.keys = [box_key(box) for box in kernel.boxes]
+        # Cheapest first, for trying replacement boxes in key order
+        self.by_key = sorted(range(len(kernel)), key=lambda index: self.keys[index])
+        self.node_budget = node_budget
+        self.deadline = deadline
+        self.exact_max_units = exact_max_units
+        self.exact = ExactSolver(kernel, box_key, node_budget=node_budget, deadline=deadline)
+        self.nodes = 0
+        self.moves: Dict[str, int] = {"repack": 0, "merge": 0}
+
+    def improve(self, packed_boxes: List[PackedBox]) -> Optional[List[PackedBox]]:
+        """
+        Cheaper boxes for the same contents, or None if no move improved the packing
+        """
+        boxes = list(packed_boxes)
+        # Keeps replaced boxes alive so the id()s in the tried sets are never reused
+        seen = list(boxes)
+        settled: Set[int] = set()
+        unmergeable: Set[Tuple[int, int]] = set()
+        changed = False
+        try:
+            while True:
+                move = self._next_move(boxes, settled, unmergeable)
+                if move is None:
+                    break
+                removed, added = move
+                boxes = [packed_box for index, packed_box in enumerate(boxes) if index not in removed] + added
+                seen.extend(added)
+                changed = True
+        except _BudgetExceeded:
+            pass
+        return boxes if changed else None
+
+    def _next_move(self, boxes: List[PackedBox], settled: Set[int], unmergeable: Set[Tuple[int, int]]):
+        """First improving move as (indexes removed, boxes added), or None"""
+        keys = [self.box_key(packed_box.box) for packed_box in boxes]
+        order = sorted(range(len(boxes)), key=lambda index: keys[index], reverse=True)
+
+        for index in order:
+            if id(boxes[index]) in settled:
+                continue
+            added = self._repack(boxes[index].items, keys[index])
+            if added is not None:
+                self.moves["repack"] += 1
+                return {index}, added
+            settled.add(id(boxes[index]))
+
+        for first, second in combinations(order, 2):
+            pair = tuple(sorted((id(boxes[first]), id(boxes[second]))))
+            if pair in unmergeable:
+                continue
+            merged = self._single_box(
+                self._merge_runs(boxes[first].items, boxes[second].items),
+                add_keys(keys[first], keys[second])
+            )
+            if merged is not None:
+                self.moves["merge"] += 1
+                return {first, second}, [merged]
+            unmergeable.add(pair)
+        return None
+
+    def _repack(self, runs: Runs, bound: Key) -> Optional[List[PackedBox]]:
+        """Boxes for the runs with a total key below `bound`, or None"""
+        if sum(count for _, count in runs) <= self.exact_max_units:
+            self.exact.node_budget = self.node_budget - self.nodes
+            outcome = self.exact.solve_runs(runs, upper_bound=bound)
+            self.nodes += outcome.nodes
+            if outcome.result is not None:
+                return outcome.result.packed_boxes
+            if not outcome.proven:
+                self._check_budget()
+            return None
+        packed_box = self._single_box(runs, bound)
+        return [packed_box] if packed_box is not None else None
+
+    def _single_box(self, runs: Runs, bound: Key) -> Optional[PackedBox]:
+        """The cheapest box, with key below `bound`, that the placement engine packs the runs into"""
+        runs = sorted(runs, key=lambda run: run[0].volume, reverse=True)
+        volume = sum(item.volume * count for item, count in runs)
+        weight = sum(item.weight * count for item, count in runs)
+        fits_every_unit = self.kernel.fit_matrix([item for item, _ in runs]).all(axis=0)
+        feasible = set(self.kernel.candidates(volume, weight, fits_every_unit).tolist())
+        for index in self.by_key:
+            if self.keys[index] >= bound:
+                break
+            if index not in feasible:
+                continue
+            self._tick()
+            packer = BoxPacker(self.kernel.boxes[index])
+            if packer.place_all(runs):
+                return packer.to_packed_box()
+        return None
+
+    @staticmethod
+    def _merge_runs(first: Runs, second: Runs) -> Runs:
+        counts: Dict[int, List] = {}
+        for item, count in first + second:
+            if id(item) in counts:
+                counts[id(item)][1] += count
+            else:
+                counts[id(item)] = [item, count]
+        return [(item, count) for item, count in counts.values()]
+
+    def _tick(self):
+        self.nodes += 1
+        self._check_budget()
+
+    def _check_budget(self):
+        if self.nodes >= self.node_budget:
+            raise _BudgetExceeded()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise _BudgetExceeded()
@@ -0,0 +1,199 @@
+"""
+Calculation debug collector
+
+Gathers the `debug_info` shown in the frontend debug window. Calculations
+always talk to a collector; with debug mode off it is NULL_DEBUG, whose
+methods do nothing, so production requests build no debug strings or
+lists. Detail that is costly to produce is passed as a callable or
+derived here from objects the caller already has, so it is only computed
+when debug mode is on.
+"""
+
+from typing import Callable, Dict, List, Optional, Union
+
+from app.schemas.packing import Box, PackedBox, PackingResult
+from app.services.box_kernel import BoxKernel
+
+Details = Union[str, Callable[[], str]]
+
+def _box_record(box: Box) -> dict:
+    return {
+        "id": box.id,
+        "name": box.name,
+        "dimensions": f"{box.length}x{box.width}x{box.height}",
+        "max_weight": box.max_weight,
+        "cost": box.cost
+    }
+
+class DebugCollector:
+    """
+    Records debug details for one calculation
+    """
+    enabled = True
+
+    def __init__(self):
+        self.steps: List[dict] = []
+        self.algorithm: dict = {
+            "strategy_attempts": [],
+            "box_evaluations": [],
+            "item_placements": [],
+            "final_selection": {}
+        }
+        self.box_selection: dict = {}
+        self.cost_calculation: dict = {}
+        self.timing: Dict[str, float] = {}
+
+    def step(self, name: str, details: Details, data: Optional[Callable[[], dict]] = None, status: str = "success"):
+        """A processing step; `details` and `data` may be callables"""
+        step = {
+            "step": len(self.steps) + 1,
+            "name": name,
+            "status": status,
+            "details": details() if callable(details) else details
+        }
+        if data is not None:
+            step.update(data())
+        self.steps.append(step)
+
+    def boxes(self, name: str, boxes: List[Box], details: Details):
+        """A step listing the boxes available to the calculation"""
+        self.step(name, details, lambda: {"boxes": [_box_record(box) for box in boxes]})
+
+    def strategy(self, name: str, result: Optional[PackingResult], elapsed: Optional[float] = None, **extra):
+        """One packing strategy's outcome (`result` None if it did not finish)"""
+        attempt = {
+            "strategy": name,
+            "completed": result is not None,
+            "success": result is not None and not result.overflow_items,
+            "boxes_used": len(result.packed_boxes) if result else 0,
+            "overflow_items": len(result.overflow_items) if result else 0,
+            "elapsed_ms": round(elapsed * 1000, 3) if elapsed is not None else None
+        }
+        if result is not None:
+            attempt["boxes"] = [packed_box.box.name for packed_box in result.packed_boxes]
+        attempt.update(extra)
+        self.algorithm["strategy_attempts"].append(attempt)
+
+    def box_candidates(self, kernel: BoxKernel, packed_boxes: List[PackedBox], box_key: Optional[Callable[[Box], tuple]] = None):
+        """
+        For each packed box, every box that could hold its contents by volume,
+        weight and unit fit (with its objective key when there is one)
+        """
+        for index, packed_box in enumerate(packed_boxes):
+            units = [item for item, _ in packed_box.items]
+            mask = kernel.fit_matrix(units).all(axis=0)
+            candidates = kernel.candidates(packed_box.total_volume, packed_box.total_weight, mask)
+            self.algorithm["box_evaluations"].append({
+                "box_index": index,
+                "chosen": packed_box.box.name,
+                "contents_volume": packed_box.total_volume,
+                "contents_weight": packed_box.total_weight,
+                "candidates": [
+                    dict(_box_record(kernel.boxes[candidate]), key=list(box_key(kernel.boxes[candidate])) if box_key else None)
+                    for candidate in candidates.tolist()
+                ]
+            })
+
+    def placements(self, packed_boxes: List[PackedBox]):
+        """Placement blocks of the chosen packing, per box"""
+        for index, packed_box in enumerate(packed_boxes):
+            self.algorithm["item_placements"].append({
+                "box_index": index,
+                "box": packed_box.box.name,
+                "utilization": packed_box.utilization,
+                "blocks": [
+                    {
+                        "item_id": placement.item_id,
+                        "position": [placement.x, placement.y, placement.z],
+                        "unit_dimensions": [placement.length, placement.width, placement.height],
+                        "counts": [placement.count_x, placement.count_y, placement.count_z]
+                    }
+                    for placement in packed_box.placements
+                ]
+            })
+
+    def final(self, **values):
+        self.algorithm["final_selection"].update(values)
+
+    def selection(self, packed_boxes: List[PackedBox]):
+        """The boxes the calculation ships in, with how full each is"""
+        self.box_selection = {
+            "total_boxes": len(packed_boxes),
+            "boxes": [
+                {
+                    "name": packed_box.box.name,
+                    "units": sum(quantity for _, quantity in packed_box.items),
+                    "utilization": packed_box.utilization,
+                    "weight_utilization": packed_box.packing_efficiency
+                }
+                for packed_box in packed_boxes
+            ]
+        }
+
+    def cost(self, **values):
+        self.cost_calculation.update(values)
+
+    def timings(self, timings: Dict[str, float]):
+        self.timing = timings
+
+    def algorithm_debug(self) -> dict:
+        return self.algorithm
+
+    def as_dict(self) -> Optional[dict]:
+        """The response's `debug_info` (None with debug mode off)"""
+        return {
+            "steps": self.steps,
+            "algorithm_debug": self.algorithm,
+            "box_selection": self.box_selection,
+            "cost_calculation": self.cost_calculation,
+            "timing": self.timing
+        }
+
+class NullDebugCollector(DebugCollector):
+    """
+    Collector for debug mode off: records nothing
+    """
+    enabled = False
+
+    def __init__(self):
+        pass
+
+    def step(self, name, details, data=None, status="success"):
+        pass
+
+    def boxes(self, name, boxes, details):
+        pass
+
+    def strategy(self, name, result, elapsed=None, **extra):
+        pass
+
+    def box_candidates(self, kernel, packed_boxes, box_key=None):
+        pass
+
+    def placements(self, packed_boxes):
+        pass
+
+    def final(self, **values):
+        pass
+
+    def selection(self, packed_boxes):
+        pass
+
+    def cost(self, **values):
+        pass
+
+    def timings(self, timings):
+        pass
+
+    def algorithm_debug(self) -> Optional[dict]:
+        return None
+
+    def as_dict(self) -> Optional[dict]:
+        return None
+
+# Shared, stateless collector for debug mode off
+NULL_DEBUG = NullDebugCollector()
+
+def debug_collector(enabled: bool) -> DebugCollector:
+    """A fresh collector when debug mode is on, else NULL_DEBUG"""
+    return DebugCollector() if enabled else NULL_DEBUG
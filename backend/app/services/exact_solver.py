@@ -0,0 +1,282 @@
+"""
+Exact packing for small orders
+
+Branch-and-bound over how many units of each item go into each box. Units
+of one item are interchangeable, so a subproblem is just the vector of
+unit counts still to pack, and its optimum is memoized. Every box opened
+holds the largest unit still to pack and takes a maximal fill, which keeps
+equivalent packings from being searched twice. Volume and weight lower
+bounds prune fills that cannot beat the best packing found so far, and
+boxes that fit inside a box whose key is no higher are never opened.
+
+Optimal is relative to the placement engine: a fill it cannot place is
+treated as infeasible.
+"""
+
+import math
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from app.schemas.packing import Item, Box, PackedBox, PackingResult
+from app.services.placement_engine import BoxPacker, EPS
+from app.services.box_kernel import BoxKernel
+
+# Per-box objective key, summed over a packing (lower is better); only the
+# first component is bounded, the second breaks ties
+Key = Tuple[float, float]
+Counts = Tuple[int, ...]
+Plan = Tuple[Tuple[int, Counts], ...]
+
+class ExactOutcome(NamedTuple):
+    result: Optional[PackingResult]  # None when nothing beat the upper bound
+    proven: bool                     # search finished, so the best packing seen is optimal
+    lower_bound: float               # bound on the first key component at the root
+    nodes: int
+
+class _BudgetExceeded(Exception):
+    pass
+
+def add_keys(a: Key, b: Key) -> Key:
+    return (a[0] + b[0], a[1] + b[1])
+
+def _covers(a: Counts, b: Counts) -> bool:
+    """Whether fill `a` holds at least the units of fill `b`"""
+    return all(x >= y for x, y in zip(a, b))
+
+class ExactSolver:
+    """
+    Minimum-key packing of an order under a node budget and deadline
+
+    Each subproblem and each candidate fill of a box counts as a node. When
+    the budget or deadline runs out the search stops and reports what it
+    proved so far.
+    """
+
+    # Deadline is checked every this many nodes
+    CLOCK_INTERVAL = 64
+
+    def __init__(
+        self,
+        kernel: BoxKernel,
+        box_key: Callable[[Box], Key],
+        node_budget: int = 20000,
+        deadline: Optional[float] = None
+    ):
+        self.kernel = kernel
+        self.keys = [box_key(box) for box in kernel.boxes]
+        self.node_budget = node_budget
+        self.deadline = deadline
+        self.nodes = 0
+        self.box_indexes = self._undominated_boxes()
+        # Lower bound rates: least first key component per box, per cubic inch and per pound of capacity
+        primary = [key[0] for key in self.keys]
+        self._min_per_box = min(primary, default=0.0)
+        self._min_per_volume = min((p / float(v) for p, v in zip(primary, kernel.volumes) if v > 0), default=0.0)
+        self._min_per_weight = min((p / float(w) for p, w in zip(primary, kernel.max_weights) if w > 0), default=0.0)
+        self._max_volume = float(kernel.volumes.max()) if len(kernel) else 0.0
+        self._max_weight = float(kernel.max_weights.max()) if len(kernel) else 0.0
+
+    def solve(self, items: List[Item], upper_bound: Optional[Key] = None) -> ExactOutcome:
+        """
+        Search for a packing of every unit with a total key below `upper_bound`
+        """
+        return self.solve_runs([(item, item.quantity) for item in items], upper_bound)
+
+    def solve_runs(self, runs: List[Tuple[Item, int]], upper_bound: Optional[Key] = None) -> ExactOutcome:
+        """
+        Like `solve`, for runs of identical units given as (item, count)
+        """
+        # Largest units first, so "the first type left" is the largest unit left
+        runs = sorted(((item, count) for item, count in runs if count > 0), key=lambda run: run[0].volume, reverse=True)
+        self.items = [item for item, _ in runs]
+        self.unit_volumes = [item.volume for item in self.items]
+        self.unit_weights = [item.weight for item in self.items]
+        self.fits = self.kernel.fit_matrix(self.items)
+        self._memo: Dict[Counts, Tuple[Optional[Key], Plan]] = {}
+        self._placeable: Dict[Tuple[int, Counts], bool] = {}
+        self._unplaceable: Dict[int, List[Counts]] = {box_index: [] for box_index in self.box_indexes}
+        self.nodes = 0
+
+        counts = tuple(count for _, count in runs)
+        lower_bound = self._lower_bound(counts)[0]
+        if not len(self.kernel) or not self.fits.any(axis=1).all():
+            return ExactOutcome(None, False, lower_bound, 0)
+
+        try:
+            value, plan = self._search(counts, upper_bound)
+        except _BudgetExceeded:
+            return ExactOutcome(None, False, lower_bound, self.nodes)
+        if value is None:
+            return ExactOutcome(None, True, lower_bound, self.nodes)
+        return ExactOutcome(self._build(plan), True, lower_bound, self.nodes)
+
+    def _search(self, counts: Counts, upper_bound: Optional[Key] = None) -> Tuple[Optional[Key], Plan]:
+        """
+        Least-key plan for the remaining counts, or (None, ()) if none beats `upper_bound`
+
+        Only bound-free results are memoized, so every memo entry is an optimum.
+        """
+        if not any(counts):
+            return (0.0, 0.0), ()
+        if upper_bound is None and counts in self._memo:
+            return self._memo[counts]
+        self._tick()
+
+        candidates = []
+        for box_index, fill in self._fills(counts):
+            rest = tuple(have - take for have, take in zip(counts, fill))
+            candidates.append((add_keys(self.keys[box_index], self._lower_bound(rest)), box_index, fill, rest))
+        # Most promising first, so good packings tighten the bound early
+        candidates.sort(key=lambda candidate: candidate[0])
+
+        best_value, best_plan = upper_bound, ()
+        for bound, box_index, fill, rest in candidates:
+            if best_value is not None and bound >= best_value:
+                break
+            sub_value, sub_plan = self._search(rest)
+            if sub_value is None:
+                continue
+            value = add_keys(self.keys[box_index], sub_value)
+            if best_value is None or value < best_value:
+                best_value, best_plan = value, ((box_index, fill),) + sub_plan
+
+        if not best_plan:
+            best_value = None
+        if upper_bound is None:
+            self._memo[counts] = (best_value, best_plan)
+        return best_value, best_plan
+
+    def _fills(self, counts: Counts) -> List[Tuple[int, Counts]]:
+        """
+        Distinct maximal fills holding the largest unit left, each with its least-key box
+        """
+        first = next(index for index, count in enumerate(counts) if count)
+        best: Dict[Counts, int] = {}
+        for box_index in self.box_indexes:
+            if not self.fits[first, box_index]:
+                continue
+            for fill in self._maximal_fills(box_index, counts, first):
+                known = best.get(fill)
+                if known is None or self.keys[box_index] < self.keys[known]:
+                    best[fill] = box_index
+        return [(box_index, fill) for fill, box_index in best.items()]
+
+    def _maximal_fills(self, box_index: int, counts: Counts, first: int) -> List[Counts]:
+        """
+        Placeable fills of one box that no further unit of the remaining counts can join
+
+        Fills are enumerated from the highest counts down, so a fill covered
+        by one found earlier is not maximal, and a fill covering a known
+        unplaceable one is not placeable; neither needs the placement engine.
+        """
+        volume = float(self.kernel.volumes[box_index])
+        max_weight = float(self.kernel.max_weights[box_index])
+        types = [index for index, count in enumerate(counts) if count and self.fits[index, box_index]]
+        unplaceable = self._unplaceable[box_index]
+        fill = [0] * len(counts)
+        found: List[Counts] = []
+
+        def extend(position: int, volume_left: float, weight_left: float):
+            current = tuple(fill)
+            if any(_covers(current, known) for known in unplaceable):
+                return
+            if position == len(types):
+                self._tick()
+                if not any(_covers(known, current) for known in found) and self._is_placeable(box_index, current):
+                    found.append(current)
+                return
+            index = types[position]
+            most = self._capacity(index, counts[index], volume_left, weight_left)
+            least = 1 if index == first else 0
+            for take in range(most, least - 1, -1):
+                fill[index] = take
+                extend(
+                    position + 1,
+                    volume_left - take * self.unit_volumes[index],
+                    weight_left - take * self.unit_weights[index]
+                )
+            fill[index] = 0
+
+        extend(0, volume, max_weight)
+        return found
+
+    def _capacity(self, index: int, count: int, volume_left: float, weight_left: float) -> int:
+        """How many of `count` units the volume and weight left allow"""
+        if self.unit_volumes[index] > 0:
+            count = min(count, int((volume_left + EPS) / self.unit_volumes[index]))
+        if self.unit_weights[index] > 0:
+            count = min(count, int((weight_left + EPS) / self.unit_weights[index]))
+        return max(count, 0)
+
+    def _is_placeable(self, box_index: int, fill: Counts) -> bool:
+        """Whether the placement engine packs the fill into the box (memoized)"""
+        known = self._placeable.get((box_index, fill))
+        if known is None:
+            known = BoxPacker(self.kernel.boxes[box_index]).place_all(self._runs(fill))
+            self._placeable[(box_index, fill)] = known
+            if not known:
+                # Only minimal unplaceable fills are kept
+                unplaceable = self._unplaceable[box_index]
+                unplaceable[:] = [other for other in unplaceable if not _covers(other, fill)]
+                unplaceable.append(fill)
+        return known
+
+    def _undominated_boxes(self) -> List[int]:
+        """Boxes not contained (by dimensions and weight) in another box with a key no higher"""
+        kernel = self.kernel
+        kept = []
+        for index in range(len(kernel)):
+            dominated = False
+            for other in range(len(kernel)):
+                if other == index or self.keys[other] > self.keys[index]:
+                    continue
+                contains = (kernel.dims[other] >= kernel.dims[index]).all() and kernel.max_weights[other] >= kernel.max_weights[index]
+                # Of two identical boxes keep the first
+                same = (kernel.dims[other] == kernel.dims[index]).all() and kernel.max_weights[other] == kernel.max_weights[index]
+                if contains and (not same or self.keys[other] < self.keys[index] or other < index):
+                    dominated = True
+                    break
+            if not dominated:
+                kept.append(index)
+        return kept
+
+    def _lower_bound(self, counts: Counts) -> Key:
+        """Bound on the key of packing the counts: by box count, volume and weight"""
+        if not any(counts):
+            return (0.0, 0.0)
+        volume = sum(count * unit for count, unit in zip(counts, self.unit_volumes))
+        weight = sum(count * unit for count, unit in zip(counts, self.unit_weights))
+        boxes = max(
+            1,
+            math.ceil(volume / self._max_volume - EPS) if self._max_volume else 1,
+            math.ceil(weight / self._max_weight - EPS) if self._max_weight else 1
+        )
+        return (max(boxes * self._min_per_box, volume * self._min_per_volume, weight * self._min_per_weight), 0.0)
+
+    def _runs(self, fill: Counts) -> List[Tuple[Item, int]]:
+        return [(item, count) for item, count in zip(self.items, fill) if count]
+
+    def _build(self, plan: Plan) -> PackingResult:
+        packed_boxes: List[PackedBox] = []
+        for box_index, fill in plan:
+            packer = BoxPacker(self.kernel.boxes[box_index])
+            packer.place_all(self._runs(fill))
+            packed_boxes.append(packer.to_packed_box())
+        return PackingResult(
+            packed_boxes=packed_boxes,
+            total_boxes=len(packed_boxes),
+            total_weight=sum(box.total_weight for box in packed_boxes),
+            total_cost=0.0,
+            overall_efficiency=sum(box.utilization * 0.7 + box.packing_efficiency * 0.3 for box in packed_boxes) / len(packed_boxes),
+            overflow_items=[],
+            recommendations=[],
+            solver="exact",
+            optimality_gap=0.0
+        )
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes > self.node_budget:
+            raise _BudgetExceeded()
+        if self.deadline is not None and self.nodes % self.CLOCK_INTERVAL == 0 and time.perf_counter() >= self.deadline:
+            raise _BudgetExceeded()
@@ -5,6 +5,8 @@ Overpack Box service
 from sqlalchemy.orm import Session
 from app.models.overpack_box import OverpackBox
 from app.schemas.overpack_box import OverpackBoxCreate, OverpackBoxUpdate
+from app.services.packing_cache import packing_cache
+from app.services.catalog_cache import catalog_cache
 from typing import List, Optional
 
 class OverpackBoxService:
@@ -45,6 +47,8 @@ class OverpackBoxService:
         self.db.add(db_box)
         self.db.commit()
         self.db.refresh(db_box)
+        packing_cache.invalidate_boxes(db_box.customerId)
+        catalog_cache.invalidate(db_box.customerId)
         return db_box
     
     def update_box(self, box_id: int, box_data: OverpackBoxUpdate) -> Optional[OverpackBox]:
@@ -54,6 +58,7 @@ class OverpackBoxService:
         box = self.get_box_by_id(box_id)
         if not box:
             return None
+        previous_customer_id = box.customerId
         
         # Update fields if provided
         update_data = box_data.dict(exclude_unset=True)
@@ -62,6 +67,10 @@ class OverpackBoxService:
         
         self.db.commit()
         self.db.refresh(box)
+        packing_cache.invalidate_boxes(previous_customer_id)
+        packing_cache.invalidate_boxes(box.customerId)
+        catalog_cache.invalidate(previous_customer_id)
+        catalog_cache.invalidate(box.customerId)
         return box
     
     def delete_box(self, box_id: int) -> bool:
@@ -74,6 +83,8 @@ class OverpackBoxService:
         
         box.active = False
         self.db.commit()
+        packing_cache.invalidate_boxes(box.customerId)
+        catalog_cache.invalidate(box.customerId)
         return True
     
     def get_boxes_count(self, customer_id: Optional[str] = None, active_only: bool = True) -> int:
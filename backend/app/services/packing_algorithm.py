@@ -2,103 +2,421 @@
 3D Bin Packing Problem Algorithm Implementation
 """
 
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+import time
+from concurrent.futures import Executor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Tuple, Optional, Union
+import numpy as np
 from app.schemas.packing import Item, Box, PackedBox, PackingResult, PackingRecommendation
+from app.services.placement_engine import BoxPacker
+from app.services.box_kernel import BoxKernel
+from app.services.product_index import ProductIndex
+from app.services.exact_solver import ExactSolver, Key, add_keys
+from app.services.cost_search import CostSearch
+from app.services.debug_collector import DebugCollector, debug_collector
+
+def overflow_units(result: PackingResult) -> int:
+    """Number of units left unpacked"""
+    return sum(quantity for _, quantity in result.overflow_items)
+
+def box_cost(result: PackingResult) -> float:
+    """Total overpack box cost of a packing"""
+    return sum(packed_box.box.cost for packed_box in result.packed_boxes)
+
+# Objectives map a packing result to a sort key (lower is better). Every
+# objective ranks complete packings ahead of packings with overflow.
+OBJECTIVES: Dict[str, Callable[[PackingResult], tuple]] = {
+    "box_count": lambda r: (overflow_units(r), r.total_boxes, box_cost(r), -r.overall_efficiency),
+    "box_cost": lambda r: (overflow_units(r), box_cost(r), r.total_boxes, -r.overall_efficiency),
+    "utilization": lambda r: (overflow_units(r), -r.overall_efficiency, r.total_boxes),
+}
+
+# Per-box keys for objectives that are sums over boxes, which the exact
+# solver minimizes; utilization is an average, so it has none
+BOX_KEYS: Dict[str, Callable[[Box], Key]] = {
+    "box_count": lambda box: (1.0, box.cost),
+    "box_cost": lambda box: (box.cost, 1.0),
+}
+
+class LandedCostObjective:
+    """
+    Objective ranking packings by a landed cost function
+
+    A class rather than a closure so it can be pickled to worker processes
+    whenever `price` can.
+    """
+
+    def __init__(self, price: Callable[[PackingResult], float]):
+        self.price = price
+
+    def __call__(self, r: PackingResult) -> tuple:
+        return (overflow_units(r), self.price(r), r.total_boxes)
+
+    def box_key(self, box: Box) -> Key:
+        """Per-box key; valid when the price is fixed per order plus a charge per box"""
+        return (self.price.box_charge(box), 1.0)
+
+def box_key_for(objective: Union[str, Callable[[PackingResult], tuple]]) -> Optional[Callable[[Box], Key]]:
+    """Per-box key of an objective, or None if the exact solver cannot optimize it"""
+    if isinstance(objective, str):
+        return BOX_KEYS.get(objective)
+    if isinstance(objective, LandedCostObjective) and hasattr(objective.price, "box_charge"):
+        return objective.box_key
+    return None
+
+class DeadlinePassed(Exception):
+    """A strategy was stopped at its deadline"""
+
+def run_packing_strategy(
+    available_boxes: Union[List[Box], BoxKernel],
+    items: List[Item],
+    strategy: str,
+    deadline: Optional[float] = None,
+    fallback: bool = True
+) -> Tuple[Optional[PackingResult], float]:
+    """
+    Run one packing strategy and time it (process pool entry point)
+
+    `deadline` is a `time.monotonic()` value, which is system-wide, so a
+    strategy left running by a caller that gave up stops by itself and
+    frees its worker; the result is then None.
+    """
+    started = time.perf_counter()
+    result = PackingAlgorithm(available_boxes).run_strategy(strategy, items, deadline=deadline, fallback=fallback)
+    return result, time.perf_counter() - started
+
+def pack_order(
+    available_boxes: Union[List[Box], BoxKernel],
+    items: List[Item],
+    objective: Union[str, Callable[[PackingResult], tuple]],
+    time_budget: Optional[float] = None,
+    exact_max_units: int = 0,
+    exact_node_budget: int = 20000,
+    cost_search: bool = False,
+    debug_mode: bool = False
+) -> PackingResult:
+    """
+    Pack a whole order with the strategy portfolio (process pool entry point)
+    """
+    return PackingAlgorithm(available_boxes).pack_items(
+        items,
+        debug_mode=debug_mode,
+        objective=objective,
+        time_budget=time_budget,
+        exact_max_units=exact_max_units,
+        exact_node_budget=exact_node_budget,
+        cost_search=cost_search
+    )
 
 class PackingAlgorithm:
-    def __init__(self, available_boxes: List[Box]):
-        # Sort boxes by volume (smallest first) for cost optimization
-        self.available_boxes = sorted(available_boxes,
-                                    key=lambda b: b.length * b.width * b.height)
+    # Strategy name -> method, in the order they are tried and preferred on ties
+    STRATEGIES = {
+        "cost_optimized": "_cost_optimized_packing",
+        "first_fit_decreasing": "_fallback_to_larger_boxes",
+        "best_fit_decreasing": "_efficiency_optimized_packing",
+        "bottom_left_fill": "_bottom_left_fill_packing",
+    }
+    # Strategy name -> the strategy it falls back to; inside a portfolio that
+    # also runs the fallback it only returns its own (or no) packing
+    FALLBACKS = {
+        "cost_optimized": "first_fit_decreasing",
+    }
+
+    def __init__(self, available_boxes: Union[List[Box], BoxKernel]):
+        # Box catalog as column arrays sorted by volume (smallest first) for cost optimization
+        self.kernel = available_boxes if isinstance(available_boxes, BoxKernel) else BoxKernel(available_boxes)
+        self.available_boxes = self.kernel.boxes
+
+    def pack_items(
+        self,
+        items: List[Item],
+        available_products: Union[ProductIndex, List[dict]] = None,
+        debug_mode: bool = False,
+        objective: Union[str, Callable[[PackingResult], tuple]] = "box_count",
+        time_budget: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        strategies: Optional[List[str]] = None,
+        exact_max_units: int = 0,
+        exact_node_budget: int = 20000,
+        cost_search: bool = False,
+        debug: Optional[DebugCollector] = None
+    ) -> PackingResult:
+        """
+        Main packing method that runs a portfolio of strategies and keeps the
+        best result under the objective
+
+        The first strategy always runs on the calling thread so there is an
+        answer to return. With an executor the others run concurrently;
+        without one they run in turn. Strategies still running when
+        `time_budget` (seconds) is spent are abandoned, and stop themselves
+        so they do not hold pool workers.
+
+        Orders of at most `exact_max_units` units (0 disables this) then go
+        to the exact solver, seeded with the best heuristic packing. If it
+        runs out of nodes or time the heuristic packing stands, with its
+        optimality gap against the solver's lower bound. With `cost_search`
+        a packing not proven optimal is then improved box by box under the
+        objective's per-box key (see `CostSearch`).
+
+        Debug details go to `debug`, or to a collector of their own with
+        `debug_mode`; either way they are also set as `result.debug_info`.
+        The time spent per strategy is set as `result.strategy_seconds`.
+        """
+        if debug is None:
+            debug = debug_collector(debug_mode)
+        names = strategies or list(self.STRATEGIES)
+        rank = OBJECTIVES[objective] if isinstance(objective, str) else objective
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        # The same deadline for strategies, which may run in other processes
+        stop_at = time.monotonic() + time_budget if time_budget is not None else None
+        fallbacks = {name: self.FALLBACKS.get(name) not in names for name in names}
+
+        futures = {}
+        if executor is not None and len(names) > 1:
+            try:
+                for name in names[1:]:
+                    futures[executor.submit(run_packing_strategy, self.kernel, items, name, stop_at, fallbacks[name])] = name
+            except BrokenProcessPool:
+                pass  # Whatever was not submitted runs inline below
+
+        results = {}
+        timings = {}
+        self._run_timed(names[0], items, results, timings, None, fallbacks[names[0]])
+
+        abandoned = set()
+        if futures:
+            timeout = max(0.0, deadline - time.perf_counter()) if deadline is not None else None
+            done, not_done = wait(futures, timeout=timeout)
+            for future in done:
+                try:
+                    result, timings[futures[future]] = future.result()
+                except BrokenProcessPool:
+                    continue
+                if result is not None:
+                    results[futures[future]] = result
+            for future in not_done:
+                future.cancel()
+                abandoned.add(futures[future])
+
+        # Strategies that did not run in the pool run inline while the budget lasts
+        for name in names[1:]:
+            if name in timings or name in abandoned:
+                continue
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._run_timed(name, items, results, timings, stop_at, fallbacks[name])
+        if not results:
+            # The first strategy left the order to a fallback that did not finish in time
+            self._run_timed(self.FALLBACKS[names[0]], items, results, timings)
+
+        if debug.enabled:
+            for name in names:
+                debug.strategy(name, results.get(name), timings.get(name))
+
+        # Earlier strategies win ties
+        best_name = min(results, key=lambda name: (rank(results[name]), names.index(name)))
+        result = results[best_name]
+        result.solver = best_name
+
+        box_key = box_key_for(objective)
+        total_units = sum(item.quantity for item in items)
+        lower_bound = None
+        if box_key and not result.overflow_items and 0 < total_units <= exact_max_units:
+            started = time.perf_counter()
+            result, lower_bound = self._solve_exact(items, result, box_key, exact_node_budget, deadline, rank, debug)
+            timings["exact"] = time.perf_counter() - started
+        if box_key and cost_search and not result.overflow_items and result.optimality_gap != 0.0:
+            started = time.perf_counter()
+            result = self._search_cost(result, box_key, exact_max_units, exact_node_budget, deadline, rank, debug)
+            timings["cost_search"] = time.perf_counter() - started
+            if lower_bound is not None:
+                result.optimality_gap = self._gap(result, box_key, lower_bound)
+        result.strategy_seconds = timings
+        result.recommendations = self._generate_recommendations(result.packed_boxes, available_products)
+        if debug.enabled:
+            debug.final(strategy=result.solver, optimality_gap=result.optimality_gap, objective=objective if isinstance(objective, str) else type(objective).__name__)
+            debug.box_candidates(self.kernel, result.packed_boxes, box_key)
+            debug.placements(result.packed_boxes)
+            result.debug_info = debug.algorithm_debug()
+
+        return result
 
-    def pack_items(self, items: List[Item], available_products: List[dict] = None, debug_mode: bool = False) -> PackingResult:
+    def _solve_exact(
+        self,
+        items: List[Item],
+        incumbent: PackingResult,
+        box_key: Callable[[Box], Key],
+        node_budget: int,
+        deadline: Optional[float],
+        rank: Callable[[PackingResult], tuple],
+        debug: DebugCollector
+    ) -> Tuple[PackingResult, float]:
         """
-        Main packing method that tries multiple strategies
+        Improve a complete heuristic packing with the exact solver, or bound
+        its gap; also returns the solver's lower bound
         """
-        debug_info = {
-            "strategy_attempts": [],
-            "box_evaluations": [],
-            "item_placements": [],
-            "final_selection": {}
-        }
-        
-        # Try cost-optimized packing first (smallest suitable box)
-        result = self._cost_optimized_packing(items.copy(), available_products, debug_mode, debug_info)
-        debug_info["strategy_attempts"].append({
-            "strategy": "cost_optimized",
-            "success": len(result.overflow_items) == 0,
-            "boxes_used": len(result.packed_boxes),
-            "overflow_items": len(result.overflow_items)
-        })
-
-        # If cost-optimized fails, fall back to efficiency-optimized
-        if result.overflow_items:
-            efficiency_result = self._efficiency_optimized_packing(items.copy(), available_products, debug_mode, debug_info)
-            debug_info["strategy_attempts"].append({
-                "strategy": "efficiency_optimized",
-                "success": len(efficiency_result.overflow_items) == 0,
-                "boxes_used": len(efficiency_result.packed_boxes),
-                "overflow_items": len(efficiency_result.overflow_items)
-            })
-            
-            if not efficiency_result.overflow_items or len(efficiency_result.overflow_items) < len(result.overflow_items):
-                result = efficiency_result
-                debug_info["final_selection"]["strategy"] = "efficiency_optimized"
-            else:
-                debug_info["final_selection"]["strategy"] = "cost_optimized"
-        else:
-            debug_info["final_selection"]["strategy"] = "cost_optimized"
-        
-        # Add debug info to result
-        if debug_mode:
-            result.debug_info = debug_info
+        upper_bound = self._total_key(incumbent, box_key)
+
+        started = time.perf_counter()
+        solver = ExactSolver(self.kernel, box_key, node_budget=node_budget, deadline=deadline)
+        outcome = solver.solve(items, upper_bound=upper_bound)
+        if debug.enabled:
+            debug.strategy(
+                "exact",
+                outcome.result,
+                time.perf_counter() - started,
+                completed=outcome.proven,
+                nodes=outcome.nodes,
+                lower_bound=outcome.lower_bound,
+                candidate_boxes=[self.kernel.boxes[index].name for index in solver.box_indexes]
+            )
 
+        if outcome.result is not None and rank(outcome.result) < rank(incumbent):
+            return outcome.result, outcome.lower_bound
+        incumbent.optimality_gap = 0.0 if outcome.proven else self._gap(incumbent, box_key, outcome.lower_bound)
+        return incumbent, outcome.lower_bound
+
+    def _search_cost(
+        self,
+        incumbent: PackingResult,
+        box_key: Callable[[Box], Key],
+        exact_max_units: int,
+        node_budget: int,
+        deadline: Optional[float],
+        rank: Callable[[PackingResult], tuple],
+        debug: DebugCollector
+    ) -> PackingResult:
+        """
+        Move a complete packing's contents into cheaper boxes under the per-box key
+        """
+        started = time.perf_counter()
+        search = CostSearch(self.kernel, box_key, node_budget=node_budget, deadline=deadline, exact_max_units=exact_max_units)
+        packed_boxes = search.improve(incumbent.packed_boxes)
+        result = self._result_for(packed_boxes) if packed_boxes is not None else None
+        improved = result is not None and rank(result) < rank(incumbent)
+        if debug.enabled:
+            debug.strategy(
+                "cost_search",
+                result,
+                time.perf_counter() - started,
+                success=improved,
+                nodes=search.nodes,
+                moves=dict(search.moves)
+            )
+        if not improved:
+            return incumbent
+        result.solver = "cost_search"
         return result
 
-    def _cost_optimized_packing(self, items: List[Item], available_products: List[dict] = None, debug_mode: bool = False, debug_info: dict = None) -> PackingResult:
+    @staticmethod
+    def _result_for(packed_boxes: List[PackedBox]) -> PackingResult:
+        """Complete packing result for a set of packed boxes"""
+        return PackingResult(
+            packed_boxes=packed_boxes,
+            total_boxes=len(packed_boxes),
+            total_weight=sum(box.total_weight for box in packed_boxes),
+            total_cost=0.0,
+            overall_efficiency=sum(box.utilization * 0.7 + box.packing_efficiency * 0.3 for box in packed_boxes) / len(packed_boxes) if packed_boxes else 0,
+            overflow_items=[],
+            recommendations=[]
+        )
+
+    @staticmethod
+    def _total_key(result: PackingResult, box_key: Callable[[Box], Key]) -> Key:
+        total = (0.0, 0.0)
+        for packed_box in result.packed_boxes:
+            total = add_keys(total, box_key(packed_box.box))
+        return total
+
+    def _gap(self, result: PackingResult, box_key: Callable[[Box], Key], lower_bound: float) -> float:
+        """Relative gap between a packing's key and a lower bound on the optimum"""
+        upper_bound = self._total_key(result, box_key)[0]
+        return max(0.0, (upper_bound - lower_bound) / upper_bound) if upper_bound > 0 else 0.0
+
+    def recommend(self, packed_boxes: List[PackedBox], available_products: Union[ProductIndex, List[dict]] = None) -> List[PackingRecommendation]:
         """
-        Try to fit all items in the smallest possible box
+        Recommendations for an existing packing (e.g. one served from cache)
+        """
+        return self._generate_recommendations(packed_boxes, available_products)
+
+    def _run_timed(self, strategy: str, items: List[Item], results: dict, timings: dict, deadline: Optional[float] = None, fallback: bool = True):
+        started = time.perf_counter()
+        result = self.run_strategy(strategy, items, deadline=deadline, fallback=fallback)
+        timings[strategy] = time.perf_counter() - started
+        if result is not None:
+            results[strategy] = result
+
+    def run_strategy(self, strategy: str, items: List[Item], deadline: Optional[float] = None, fallback: bool = True) -> Optional[PackingResult]:
+        """
+        Run a single named strategy (without recommendations)
+
+        Returns None when the strategy reaches `deadline` (a `time.monotonic()`
+        value) first, or, without `fallback`, leaves the order to its fallback.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown packing strategy: {strategy}")
+        method = getattr(self, self.STRATEGIES[strategy])
+        try:
+            self._check_deadline(deadline)
+            if strategy in self.FALLBACKS:
+                return method(list(items), deadline, fallback)
+            return method(list(items), deadline)
+        except DeadlinePassed:
+            return None
+
+    @staticmethod
+    def _check_deadline(deadline: Optional[float]):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlinePassed()
+
+    def _cost_optimized_packing(self, items: List[Item], deadline: Optional[float] = None, fallback: bool = True) -> Optional[PackingResult]:
+        """
+        Try to fit all items in the smallest possible box, else (with
+        `fallback`) pack them first fit decreasing
         """
         # Calculate total volume and weight
-        total_volume = sum(item.length * item.width * item.height * item.quantity for item in items)
+        total_volume = sum(item.volume * item.quantity for item in items)
         total_weight = sum(item.weight * item.quantity for item in items)
 
-        # Find smallest box that can fit everything
-        suitable_box = self._find_smallest_suitable_box(total_volume, total_weight)
+        # Find smallest box that can physically hold every unit
+        packer = self._pack_single_box(items, total_volume, total_weight, deadline)
 
-        if suitable_box:
+        if packer:
             # All items fit in one box - optimal solution
-            packed_box = PackedBox(
-                box=suitable_box,
-                items=[(item, item.quantity) for item in items],
-                total_weight=total_weight,
-                total_volume=total_volume,
-                utilization=(total_volume / (suitable_box.length * suitable_box.width * suitable_box.height)) * 100,
-                packing_efficiency=(total_weight / suitable_box.max_weight) * 100
-            )
-
-            recommendations = self._generate_recommendations([packed_box], available_products)
+            packed_box = packer.to_packed_box()
 
             return PackingResult(
                 packed_boxes=[packed_box],
                 total_boxes=1,
-                total_weight=total_weight,
+                total_weight=packed_box.total_weight,
                 total_cost=0.0,  # Will be calculated by rate lookup
                 overall_efficiency=packed_box.utilization * 0.7 + packed_box.packing_efficiency * 0.3,
                 overflow_items=[],
-                recommendations=recommendations
+                recommendations=[]
             )
-        else:
+        elif fallback:
             # Fall back to multi-box packing
-            return self._fallback_to_larger_boxes(items, available_products)
+            return self._fallback_to_larger_boxes(items, deadline)
+        return None
 
-    def _fallback_to_larger_boxes(self, items: List[Item], available_products: List[dict] = None) -> PackingResult:
+    def _pack_single_box(self, items: List[Item], volume: float, weight: float, deadline: Optional[float] = None) -> Optional[BoxPacker]:
+        """
+        Geometrically pack every unit into the smallest box that holds them all
+        """
+        runs = self._unit_runs(items)
+        fits_every_unit = self.kernel.fit_matrix(items).all(axis=0)
+        for index in self.kernel.candidates(volume, weight, fits_every_unit):
+            self._check_deadline(deadline)
+            packer = BoxPacker(self.available_boxes[index])
+            if packer.place_all(runs):
+                return packer
+        return None
+
+    def _fallback_to_larger_boxes(self, items: List[Item], deadline: Optional[float] = None) -> PackingResult:
         """
         Pack items into multiple boxes when single box doesn't work
         """
         packed_boxes = []
-        remaining_items = items.copy()
 
         if not self.available_boxes:
             # No boxes available - return empty result with overflow
@@ -112,57 +430,46 @@ class PackingAlgorithm:
                 recommendations=[]
             )
 
-        while remaining_items:
-            # Try to pack remaining items in the largest available box
-            largest_box = max(self.available_boxes, key=lambda b: b.length * b.width * b.height)
-
-            # Use FFD strategy for this box
-            box_items = []
-            box_weight = 0
-            box_volume = 0
-
-            for item in remaining_items[:]:
-                if (box_weight + item.weight * item.quantity <= largest_box.max_weight and
-                    box_volume + item.length * item.width * item.height * item.quantity <=
-                    largest_box.length * largest_box.width * largest_box.height):
-
-                    box_items.append((item, item.quantity))
-                    box_weight += item.weight * item.quantity
-                    box_volume += item.length * item.width * item.height * item.quantity
-                    remaining_items.remove(item)
-
-            if box_items:
-                packed_box = PackedBox(
-                    box=largest_box,
-                    items=box_items,
-                    total_weight=box_weight,
-                    total_volume=box_volume,
-                    utilization=(box_volume / (largest_box.length * largest_box.width * largest_box.height)) * 100,
-                    packing_efficiency=(box_weight / largest_box.max_weight) * 100
-                )
-                packed_boxes.append(packed_box)
+        # Try to pack remaining items in the largest available box
+        largest = self.kernel.largest
+        largest_box = self.available_boxes[largest]
+
+        # Units that cannot fit even an empty largest box go straight to overflow
+        fits_largest = self.kernel.fit_matrix(items)[:, largest]
+        overflow = [(item, item.quantity) for item, fits in zip(items, fits_largest) if not fits]
+        remaining_runs = self._unit_runs([item for item, fits in zip(items, fits_largest) if fits])
+
+        while remaining_runs:
+            self._check_deadline(deadline)
+            # Use FFD strategy for this box, splitting runs across boxes as needed
+            packer = BoxPacker(largest_box)
+            remaining_runs = [
+                (item, count - packer.place_run(item, count))
+                for item, count in remaining_runs
+            ]
+            remaining_runs = [(item, count) for item, count in remaining_runs if count > 0]
+
+            if not packer.is_empty:
+                packed_boxes.append(packer.to_packed_box())
             else:
                 # Can't fit any more items
                 break
 
         # Calculate totals
         total_weight = sum(box.total_weight for box in packed_boxes)
-        total_volume = sum(box.total_volume for box in packed_boxes)
         overall_efficiency = sum(box.utilization * 0.7 + box.packing_efficiency * 0.3 for box in packed_boxes) / len(packed_boxes) if packed_boxes else 0
 
-        recommendations = self._generate_recommendations(packed_boxes, available_products)
-
         return PackingResult(
             packed_boxes=packed_boxes,
             total_boxes=len(packed_boxes),
             total_weight=total_weight,
             total_cost=0.0,
             overall_efficiency=overall_efficiency,
-            overflow_items=remaining_items,
-            recommendations=recommendations
+            overflow_items=overflow + remaining_runs,
+            recommendations=[]
         )
 
-    def _efficiency_optimized_packing(self, items: List[Item], available_products: List[dict] = None, debug_mode: bool = False, debug_info: dict = None) -> PackingResult:
+    def _efficiency_optimized_packing(self, items: List[Item], deadline: Optional[float] = None) -> PackingResult:
         """
         Use Best Fit Decreasing strategy for maximum efficiency
         """
@@ -178,46 +485,117 @@ class PackingAlgorithm:
                 recommendations=[]
             )
 
-        # Sort items by volume (largest first)
-        sorted_items = sorted(items, key=lambda x: x.length * x.width * x.height, reverse=True)
-        packed_boxes = []
-
-        for item in sorted_items:
-            placed = False
-            # Try to fit in existing boxes first
-            for packed_box in packed_boxes:
-                if self._can_fit_in_box(item, packed_box):
-                    packed_box.items.append((item, item.quantity))
-                    packed_box.total_weight += item.weight * item.quantity
-                    packed_box.total_volume += item.length * item.width * item.height * item.quantity
-                    packed_box.utilization = (packed_box.total_volume / (packed_box.box.length * packed_box.box.width * packed_box.box.height)) * 100
-                    packed_box.packing_efficiency = (packed_box.total_weight / packed_box.box.max_weight) * 100
-                    placed = True
-                    break
-
-            if not placed:
-                # Create new box
-                suitable_box = self._find_smallest_suitable_box(
-                    item.length * item.width * item.height * item.quantity,
-                    item.weight * item.quantity
-                )
-                if suitable_box:
-                    packed_box = PackedBox(
-                        box=suitable_box,
-                        items=[(item, item.quantity)],
-                        total_weight=item.weight * item.quantity,
-                        total_volume=item.length * item.width * item.height * item.quantity,
-                        utilization=(item.length * item.width * item.height * item.quantity / (suitable_box.length * suitable_box.width * suitable_box.height)) * 100,
-                        packing_efficiency=(item.weight * item.quantity / suitable_box.max_weight) * 100
+        # Sort runs of identical units by volume (largest first)
+        runs = self._unit_runs(items)
+        fit_rows = self.kernel.fit_matrix([item for item, _ in runs])
+        packers: List[BoxPacker] = []
+        overflow = []
+        remaining_volume = sum(item.volume * item.quantity for item in items)
+        remaining_weight = sum(item.weight * item.quantity for item in items)
+
+        for (item, count), fit_row in zip(runs, fit_rows):
+            unit_volume = item.volume
+            remaining = count
+            while remaining:
+                self._check_deadline(deadline)
+                # Fill the fullest existing boxes that still have room first
+                placed = 0
+                for packer in sorted(packers, key=lambda p: p.remaining_volume):
+                    if packer.remaining_volume + 1e-6 >= unit_volume:
+                        placed += packer.place_run(item, remaining - placed)
+                        if placed == remaining:
+                            break
+
+                if not placed:
+                    # Open the smallest box that could take everything left, else the largest one the unit fits
+                    suitable_box = (
+                        self._find_smallest_suitable_box(remaining_volume, remaining_weight, fit_row) or
+                        self._find_largest_box_for_unit(fit_row)
                     )
-                    packed_boxes.append(packed_box)
+                    if not suitable_box:
+                        break
+                    packer = BoxPacker(suitable_box)
+                    placed = packer.place_run(item, remaining)
+                    packers.append(packer)
+
+                remaining -= placed
+                remaining_volume -= unit_volume * placed
+                remaining_weight -= item.weight * placed
+
+            if remaining:
+                overflow.append((item, remaining))
 
         # Calculate totals and return result
+        packed_boxes = [packer.to_packed_box() for packer in packers]
         total_weight = sum(box.total_weight for box in packed_boxes)
-        total_volume = sum(box.total_volume for box in packed_boxes)
         overall_efficiency = sum(box.utilization * 0.7 + box.packing_efficiency * 0.3 for box in packed_boxes) / len(packed_boxes) if packed_boxes else 0
 
-        recommendations = self._generate_recommendations(packed_boxes, available_products)
+        return PackingResult(
+            packed_boxes=packed_boxes,
+            total_boxes=len(packed_boxes),
+            total_weight=total_weight,
+            total_cost=0.0,
+            overall_efficiency=overall_efficiency,
+            overflow_items=overflow,
+            recommendations=[]
+        )
+
+    def _bottom_left_fill_packing(self, items: List[Item], deadline: Optional[float] = None) -> PackingResult:
+        """
+        Bottom-Left-Fill: widest footprint first, each unit at the lowest,
+        back-most, left-most free position, filling one box before opening the next
+        """
+        if not self.available_boxes:
+            # No boxes available - return empty result with overflow
+            return PackingResult(
+                packed_boxes=[],
+                total_boxes=0,
+                total_weight=sum(item.weight * item.quantity for item in items),
+                total_cost=0.0,
+                overall_efficiency=0.0,
+                overflow_items=[(item, item.quantity) for item in items],
+                recommendations=[]
+            )
+
+        largest = self.kernel.largest
+        largest_box = self.available_boxes[largest]
+        fit_matrix = self.kernel.fit_matrix(items)
+        fit_rows = {id(item): fit_row for item, fit_row in zip(items, fit_matrix)}
+        overflow = [(item, item.quantity) for item in items if not fit_rows[id(item)][largest]]
+
+        def footprint(item: Item) -> Tuple[float, float]:
+            low, middle, high = item.sorted_dims
+            return (middle * high, low)
+
+        remaining_runs = [
+            (item, item.quantity)
+            for item in sorted(items, key=footprint, reverse=True)
+            if fit_rows[id(item)][largest]
+        ]
+        packed_boxes = []
+
+        while remaining_runs:
+            self._check_deadline(deadline)
+            # Smallest box that could take everything left, else the largest
+            remaining_volume = sum(item.volume * count for item, count in remaining_runs)
+            remaining_weight = sum(item.weight * count for item, count in remaining_runs)
+            fits_every_unit = np.all([fit_rows[id(item)] for item, _ in remaining_runs], axis=0)
+            index = self.kernel.smallest(remaining_volume, remaining_weight, fits_every_unit)
+            box = self.available_boxes[index] if index is not None else largest_box
+
+            packer = BoxPacker(box)
+            remaining_runs = [
+                (item, count - packer.place_run(item, count))
+                for item, count in remaining_runs
+            ]
+            remaining_runs = [(item, count) for item, count in remaining_runs if count > 0]
+
+            if packer.is_empty:
+                break
+            packed_boxes.append(packer.to_packed_box())
+
+        total_weight = sum(box.total_weight for box in packed_boxes)
+        overall_efficiency = sum(box.utilization * 0.7 + box.packing_efficiency * 0.3 for box in packed_boxes) / len(packed_boxes) if packed_boxes else 0
 
         return PackingResult(
             packed_boxes=packed_boxes,
@@ -225,37 +603,41 @@ class PackingAlgorithm:
             total_weight=total_weight,
             total_cost=0.0,
             overall_efficiency=overall_efficiency,
-            overflow_items=[],
-            recommendations=recommendations
+            overflow_items=overflow + remaining_runs,
+            recommendations=[]
         )
 
-    def _find_smallest_suitable_box(self, volume: float, weight: float) -> Optional[Box]:
+    def _find_smallest_suitable_box(self, volume: float, weight: float, fit_mask: Optional[np.ndarray] = None) -> Optional[Box]:
         """
         Find the smallest box that can fit the given volume and weight
+        (and, when given, is allowed by a row of the kernel's fit matrix)
         """
-        for box in self.available_boxes:
-            box_volume = box.length * box.width * box.height
-            if box_volume >= volume and box.max_weight >= weight:
-                return box
-        return None
+        index = self.kernel.smallest(volume, weight, fit_mask)
+        return self.available_boxes[index] if index is not None else None
 
-    def _can_fit_in_box(self, item: Item, packed_box: PackedBox) -> bool:
+    def _find_largest_box_for_unit(self, fit_mask: np.ndarray) -> Optional[Box]:
         """
-        Check if an item can fit in an existing packed box
+        Find the largest box a single unit fits in, given its fit matrix row
         """
-        item_volume = item.length * item.width * item.height * item.quantity
-        item_weight = item.weight * item.quantity
-        
-        remaining_volume = (packed_box.box.length * packed_box.box.width * packed_box.box.height) - packed_box.total_volume
-        remaining_weight = packed_box.box.max_weight - packed_box.total_weight
-        
-        return item_volume <= remaining_volume and item_weight <= remaining_weight
+        index = self.kernel.largest_fitting(fit_mask)
+        return self.available_boxes[index] if index is not None else None
 
-    def _generate_recommendations(self, packed_boxes: List[PackedBox], available_products: List[dict] = None) -> List[PackingRecommendation]:
+    def _unit_runs(self, items: List[Item]) -> List[Tuple[Item, int]]:
+        """
+        Runs of identical units as (item, quantity), largest unit volume first
+        """
+        return [
+            (item, item.quantity)
+            for item in sorted(items, key=lambda x: x.volume, reverse=True)
+        ]
+
+    def _generate_recommendations(self, packed_boxes: List[PackedBox], available_products: Union[ProductIndex, List[dict]] = None) -> List[PackingRecommendation]:
         """
         Generate intelligent recommendations for improving packing efficiency
         """
         recommendations = []
+        if available_products:
+            available_products = ProductIndex.of(available_products)
 
         for packed_box in packed_boxes:
             if packed_box.utilization < 50:  # Low volume utilization
@@ -278,25 +660,22 @@ class PackingAlgorithm:
 
         return recommendations
 
-    def _get_suggested_products_for_box(self, packed_box: PackedBox, available_products: List[dict]) -> List[dict]:
+    def _get_suggested_products_for_box(self, packed_box: PackedBox, product_index: ProductIndex) -> List[dict]:
         """
-        Suggest products that could fit in the remaining space
+        Suggest products that could fit in the remaining space, best fill first
         """
-        remaining_volume = (packed_box.box.length * packed_box.box.width * packed_box.box.height) - packed_box.total_volume
+        remaining_volume = packed_box.box.volume - packed_box.total_volume
         remaining_weight = packed_box.box.max_weight - packed_box.total_weight
-
-        suggestions = []
-        for product in available_products:
-            product_volume = product['length'] * product['width'] * product['height']
-            if (product_volume <= remaining_volume and
-                product['weight'] <= remaining_weight):
-                suggestions.append({
-                    'id': product['id'],
-                    'name': product['name'],
-                    'sku': product['sku'],
-                    'dimensions': f"{product['length']}\" × {product['width']}\" × {product['height']}\"",
-                    'weight': f"{product['weight']} lbs",
-                    'volume': f"{product_volume:.1f} cubic inches"
-                })
-
-        return suggestions[:5]  # Return top 5 suggestions
+        box_dims = (packed_box.box.length, packed_box.box.width, packed_box.box.height)
+
+        return [
+            {
+                'id': product['id'],
+                'name': product['name'],
+                'sku': product['sku'],
+                'dimensions': f"{product['length']}\" × {product['width']}\" × {product['height']}\"",
+                'weight': f"{product['weight']} lbs",
+                'volume': f"{product_volume:.1f} cubic inches"
+            }
+            for product_volume, product in product_index.suggest(remaining_volume, remaining_weight, box_dims, limit=5)
+        ]
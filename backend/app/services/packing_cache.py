@@ -0,0 +1,144 @@
+"""
+Packing result cache
+
+Memoizes packing results by a canonical signature of the order (the
+multiset of unit dimensions, weights and quantities) and the content
+signature of the customer's box set, so repeated SKU mixes skip the packing
+algorithm and only redo zone and rate lookups. A box edited anywhere (in
+the database or by another worker) changes the signature the catalog cache
+reports, so packings made with the old box set are not served.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.schemas.packing import Item, PackedBox, PackingResult
+
+def item_signature(item: Item) -> Tuple[float, float, float, float, int]:
+    """Rotation-independent signature of one order line"""
+    low, middle, high = item.sorted_dims
+    return (low, middle, high, item.weight, item.quantity)
+
+def canonical_items(items: List[Item]) -> List[Item]:
+    """Order lines in canonical (signature) order"""
+    return sorted(items, key=item_signature)
+
+def order_signature(items: List[Item]) -> str:
+    """Canonical hash of the sorted (dims, weight, qty) multiset of an order"""
+    canonical = repr([item_signature(item) for item in canonical_items(items)])
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class PackingCache:
+    """
+    Thread-safe LRU cache of packing results with a TTL
+
+    Entries are keyed by customer, box-set signature, objective and order
+    signature. A landed cost objective names the tariff signature, zone and
+    service level it prices with, so a tariff reload also changes the key.
+    Entries for a previous box set or tariff are unreachable and age out of
+    the LRU, or are dropped at once after a local box edit.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, Tuple[float, List[Item], PackingResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate_boxes(self, customer_id: str):
+        """Drop a customer's packings after a local box edit"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == customer_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, customer_id: str, box_set_signature: str, objective: str, items: List[Item]) -> Optional[PackingResult]:
+        """
+        Cached packing for an order, remapped onto the order's own items, or None
+        """
+        key = self._key(customer_id, box_set_signature, objective, items)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        _, cached_items, result = entry
+        return self._remap(result, cached_items, canonical_items(items))
+
+    def put(self, customer_id: str, box_set_signature: str, objective: str, items: List[Item], result: PackingResult):
+        """
+        Cache a packing for an order
+        """
+        canonical = canonical_items(items)
+        if len({item.id for item in canonical}) != len(canonical):
+            # Results are remapped by item id, so ambiguous orders are not cached
+            return
+        key = self._key(customer_id, box_set_signature, objective, items)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, canonical, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and size"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+    def _key(self, customer_id: str, box_set_signature: str, objective: str, items: List[Item]) -> tuple:
+        return (customer_id, box_set_signature, objective, order_signature(items))
+
+    def _remap(self, result: PackingResult, cached_items: List[Item], items: List[Item]) -> PackingResult:
+        """Copy a cached result onto another order with the same signature"""
+        by_id = {cached.id: item for cached, item in zip(cached_items, items)}
+        packed_boxes = [
+            PackedBox(
+                box=packed_box.box,
+                items=[(by_id[item.id], quantity) for item, quantity in packed_box.items],
+                total_weight=packed_box.total_weight,
+                total_volume=packed_box.total_volume,
+                utilization=packed_box.utilization,
+                packing_efficiency=packed_box.packing_efficiency,
+                placements=packed_box.placements.with_item_ids(
+                    {cached_id: item.id for cached_id, item in by_id.items()}
+                )
+            )
+            for packed_box in result.packed_boxes
+        ]
+        return PackingResult(
+            packed_boxes=packed_boxes,
+            total_boxes=result.total_boxes,
+            total_weight=result.total_weight,
+            total_cost=result.total_cost,
+            overall_efficiency=result.overall_efficiency,
+            overflow_items=[(by_id[item.id], quantity) for item, quantity in result.overflow_items],
+            recommendations=[],
+            solver=result.solver,
+            optimality_gap=result.optimality_gap
+        )
+
+# Shared cache instance
+packing_cache = PackingCache(
+    max_entries=settings.PACKING_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PACKING_CACHE_TTL_SECONDS
+)
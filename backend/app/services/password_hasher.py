@@ -0,0 +1,152 @@
+"""
+Password hashing pool
+
+Runs bcrypt hashing and verification in a dedicated process pool, apart
+from the packing pool and the request threads, so a burst of logins cannot
+take the CPU from calculations. At most PASSWORD_HASH_MAX_PENDING jobs are
+queued or running; beyond that callers get PasswordHasherBusy.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password
+
+T = TypeVar("T")
+
+class PasswordHasherBusy(Exception):
+    """Too many hashing jobs are queued or running"""
+
+class PasswordHasher:
+    """
+    Bounded process pool for password hashing
+
+    With no workers, jobs run on the calling thread (still counted against
+    the pending limit).
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.seconds_total = 0.0
+
+    def hash(self, password: str) -> str:
+        """Hash a password, waiting for the pool"""
+        return self._call(get_password_hash, password)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password, with a new hash when the stored one uses another cost"""
+        return self._call(verify_and_update_password, password, hashed_password)
+
+    async def hash_async(self, password: str) -> str:
+        """Like `hash`, without blocking the event loop"""
+        return await self._call_async(get_password_hash, password)
+
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Like `verify_and_update`, without blocking the event loop"""
+        return await self._call_async(verify_and_update_password, password, hashed_password)
+
+    def stats(self) -> dict:
+        """Queue depth and throughput counters"""
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "mean_ms": self.seconds_total / self.completed * 1000 if self.completed else 0.0
+        }
+
+    def shutdown(self):
+        """
+        Stop the pool on application shutdown
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _call(self, fn: Callable[..., T], *args) -> T:
+        started = self._acquire()
+        try:
+            executor = self._pool()
+            if executor is None:
+                return fn(*args)
+            try:
+                return executor.submit(fn, *args).result()
+            except BrokenProcessPool:
+                self._reset(executor)
+                return fn(*args)
+        finally:
+            self._release(started)
+
+    async def _call_async(self, fn: Callable[..., T], *args) -> T:
+        started = self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._pool()
+            if executor is not None:
+                try:
+                    return await asyncio.wrap_future(executor.submit(fn, *args))
+                except BrokenProcessPool:
+                    self._reset(executor)
+            return await loop.run_in_executor(None, fn, *args)
+        finally:
+            self._release(started)
+
+    def _acquire(self) -> float:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Too many password hashing requests in progress")
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return time.perf_counter()
+
+    def _release(self, started: float):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.seconds_total += time.perf_counter() - started
+        self._slots.release()
+
+    def _pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # Spawn rather than fork: the web worker is multithreaded
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor):
+        """Discard a broken pool so the next call starts a fresh one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# Shared hasher instance
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
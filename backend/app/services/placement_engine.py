@@ -0,0 +1,303 @@
+"""
+Extreme-point 3D placement engine
+
+Places individual item units inside a box, trying all six axis-aligned
+rotations at each extreme point and checking dimensional fit and
+non-overlap against a uniform spatial grid of the units already placed.
+"""
+
+from functools import lru_cache
+from bisect import bisect_left, insort
+from itertools import permutations
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas.packing import Item, Box, PackedBox, Placement
+
+# Tolerance for floating point dimension comparisons (inches)
+EPS = 1e-6
+
+Dims = Tuple[float, float, float]
+
+@lru_cache(maxsize=4096)
+def orientations(length: float, width: float, height: float) -> Tuple[Dims, ...]:
+    """
+    Distinct axis-aligned rotations of a unit as (length, width, height),
+    lowest height first so units are laid flat before standing them up
+    """
+    unique = []
+    for dims in permutations((length, width, height)):
+        if dims not in unique:
+            unique.append(dims)
+    unique.sort(key=lambda d: (d[2], -d[0] * d[1]))
+    return tuple(unique)
+
+def fits_dimensionally(dims: Dims, box_dims: Dims) -> bool:
+    """Whether a cuboid fits inside a box in at least one rotation"""
+    return all(a <= b + EPS for a, b in zip(sorted(dims), sorted(box_dims)))
+
+def item_fits_box(item: Item, box: Box) -> bool:
+    """Whether a single unit fits an empty box by dimensions and weight"""
+    return (item.weight <= box.max_weight + EPS and
+            all(a <= b + EPS for a, b in zip(item.sorted_dims, box.sorted_dims)))
+
+class SpatialGrid:
+    """
+    Uniform grid over the box interior
+
+    Each cell lists the placed cuboids that intersect it, so overlap and
+    support queries only look at the units near a candidate position.
+    """
+
+    def __init__(self, length: float, width: float, height: float, divisions: int = 8):
+        self.divisions = divisions
+        self.cell_size = (
+            max(length / divisions, EPS),
+            max(width / divisions, EPS),
+            max(height / divisions, EPS)
+        )
+        self.cells: Dict[Tuple[int, int, int], List[int]] = {}
+
+    def _cell_range(self, low: float, high: float, size: float) -> range:
+        last = self.divisions - 1
+        start = int(low / size)
+        if start > last:
+            start = last
+        end = int((high - EPS) / size)
+        if end > last:
+            end = last
+        if end < start:
+            end = start
+        return range(start, end + 1)
+
+    def insert(self, index: int, cuboid: Tuple[float, ...]):
+        x0, y0, z0, x1, y1, z1 = cuboid
+        sx, sy, sz = self.cell_size
+        for cx in self._cell_range(x0, x1, sx):
+            for cy in self._cell_range(y0, y1, sy):
+                for cz in self._cell_range(z0, z1, sz):
+                    self.cells.setdefault((cx, cy, cz), []).append(index)
+
+    def query(self, x0: float, y0: float, z0: float, x1: float, y1: float, z1: float) -> List[int]:
+        """Indices of cuboids sharing a cell with the region (may repeat)"""
+        cells = self.cells
+        sx, sy, sz = self.cell_size
+        found = []
+        for cx in self._cell_range(x0, x1, sx):
+            for cy in self._cell_range(y0, y1, sy):
+                for cz in self._cell_range(z0, z1, sz):
+                    bucket = cells.get((cx, cy, cz))
+                    if bucket:
+                        found.extend(bucket)
+        return found
+
+class BoxPacker:
+    """
+    Extreme-point packer for a single box
+
+    Candidate positions are kept sorted bottom-back-left (z, y, x). Each
+    placement (a single unit or a block of identical units) adds the points
+    at its far corners along x, y and z, with the x and y points dropped onto
+    whatever supports them. Positions that failed for a unit shape are
+    remembered, so identical units never retry them.
+    """
+
+    def __init__(self, box: Box, divisions: int = 8):
+        self.box = box
+        self.box_dims = (box.length, box.width, box.height)
+        self.box_volume = box.volume
+        # Accumulates item counts, totals and (columnar) placements as units go in
+        self.packed = PackedBox(box)
+        self.placements = self.packed.placements
+        self.cuboids: List[Tuple[float, ...]] = []
+        self.grid = SpatialGrid(box.length, box.width, box.height, divisions)
+        # Extreme points as (z, y, x) so list order is bottom-back-left first
+        self.points: List[Tuple[float, float, float]] = [(0.0, 0.0, 0.0)]
+        self._point_set = {(0.0, 0.0, 0.0)}
+        self._failed: Dict[Dims, set] = {}
+        self._exhausted: Dict[Dims, int] = {}
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.placements
+
+    @property
+    def total_weight(self) -> float:
+        return self.packed.total_weight
+
+    @property
+    def total_volume(self) -> float:
+        return self.packed.total_volume
+
+    @property
+    def remaining_volume(self) -> float:
+        return self.box_volume - self.packed.total_volume
+
+    def place(self, item: Item) -> Optional[Placement]:
+        """Place one unit of an item, returning its placement or None if it does not fit"""
+        if self._capacity_for(item, 1) < 1:
+            return None
+        position = self._find_position(item)
+        if position is None:
+            return None
+        point, dims = position
+        self._commit(item, point, dims, (1, 1, 1))
+        return self.placements[-1]
+
+    def place_run(self, item: Item, count: int) -> int:
+        """
+        Place up to `count` identical units of an item, returning how many fit
+
+        Units go in as rectangular blocks grown from each free position along
+        x, then y, then z, so a long run costs one placement per block rather
+        than one per unit.
+        """
+        placed = 0
+        while placed < count:
+            capacity = self._capacity_for(item, count - placed)
+            if capacity < 1:
+                break
+            position = self._find_position(item)
+            if position is None:
+                break
+            point, dims = position
+            grid = self._grow_block(point, dims, capacity)
+            self._commit(item, point, dims, grid)
+            placed += grid[0] * grid[1] * grid[2]
+        return placed
+
+    def place_all(self, runs: List[Tuple[Item, int]]) -> bool:
+        """Place every unit of every run, stopping at the first run that does not fit"""
+        for item, count in runs:
+            if self.place_run(item, count) < count:
+                return False
+        return True
+
+    def _capacity_for(self, item: Item, count: int) -> int:
+        """How many of `count` units the remaining weight and volume allow"""
+        packed = self.packed
+        if item.weight > 0:
+            count = min(count, int((self.box.max_weight - packed.total_weight + EPS) / item.weight))
+        if item.volume > 0:
+            count = min(count, int((self.box_volume - packed.total_volume + EPS) / item.volume))
+        return count
+
+    def _find_position(self, item: Item) -> Optional[Tuple[Tuple[float, float, float], Dims]]:
+        """First extreme point and rotation where one unit fits, or None"""
+        shape = (item.length, item.width, item.height)
+        # Nothing has changed since this shape last failed everywhere
+        if self._exhausted.get(shape) == len(self.placements):
+            return None
+
+        length, width, height = self.box_dims
+        failed = self._failed.setdefault(shape, set())
+        rotations = orientations(*shape)
+        covered = []
+        chosen = None
+        for point in self.points:
+            if point in failed:
+                continue
+            z, y, x = point
+            # Points swallowed by a later placement are useless for every shape
+            if self._overlaps(x, y, z, x + EPS * 2, y + EPS * 2, z + EPS * 2):
+                covered.append(point)
+                continue
+            for l, w, h in rotations:
+                if x + l > length + EPS or y + w > width + EPS or z + h > height + EPS:
+                    continue
+                if self._overlaps(x, y, z, x + l, y + w, z + h):
+                    continue
+                chosen = (point, (l, w, h))
+                break
+            if chosen:
+                break
+            failed.add(point)
+
+        for point in covered:
+            self._remove_point(point)
+
+        if chosen is None:
+            self._exhausted[shape] = len(self.placements)
+        return chosen
+
+    def _grow_block(self, point: Tuple[float, float, float], dims: Dims, limit: int) -> Tuple[int, int, int]:
+        """Largest free block of units at a position, trimmed to at most `limit` units"""
+        z, y, x = point
+        l, w, h = dims
+        length, width, height = self.box_dims
+
+        def largest(bound: int, region) -> int:
+            # Overlap only grows with the block, so binary search the free extent
+            low, high = 1, max(1, bound)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if self._overlaps(*region(middle)):
+                    high = middle - 1
+                else:
+                    low = middle
+            return low
+
+        nx = largest(min(limit, int((length - x + EPS) / l)),
+                     lambda n: (x, y, z, x + n * l, y + w, z + h))
+        ny = 1
+        if nx < limit:
+            ny = largest(min(limit // nx, int((width - y + EPS) / w)),
+                         lambda n: (x, y, z, x + nx * l, y + n * w, z + h))
+        nz = 1
+        if nx * ny < limit:
+            nz = largest(min(limit // (nx * ny), int((height - z + EPS) / h)),
+                         lambda n: (x, y, z, x + nx * l, y + ny * w, z + n * h))
+        return nx, ny, nz
+
+    def to_packed_box(self) -> PackedBox:
+        """The placed units as a PackedBox"""
+        return self.packed
+
+    def _overlaps(self, x0: float, y0: float, z0: float, x1: float, y1: float, z1: float) -> bool:
+        cuboids = self.cuboids
+        for index in self.grid.query(x0, y0, z0, x1, y1, z1):
+            bx0, by0, bz0, bx1, by1, bz1 = cuboids[index]
+            if (x0 < bx1 - EPS and bx0 < x1 - EPS and
+                y0 < by1 - EPS and by0 < y1 - EPS and
+                z0 < bz1 - EPS and bz0 < z1 - EPS):
+                return True
+        return False
+
+    def _commit(self, item: Item, point: Tuple[float, float, float], dims: Dims, grid: Tuple[int, int, int]):
+        z, y, x = point
+        l, w, h = dims
+        nx, ny, nz = grid
+        cuboid = (x, y, z, x + nx * l, y + ny * w, z + nz * h)
+        self.cuboids.append(cuboid)
+        self.grid.insert(len(self.cuboids) - 1, cuboid)
+
+        self.placements.append_block(item.id, x, y, z, l, w, h, nx, ny, nz)
+        self.packed.add(item, nx * ny * nz)
+
+        x1, y1, z1 = cuboid[3:]
+        self._remove_point(point)
+        self._add_point(x1, y, self._support_height(x1, y, z))
+        self._add_point(x, y1, self._support_height(x, y1, z))
+        self._add_point(x, y, z1)
+
+    def _support_height(self, x: float, y: float, z: float) -> float:
+        """Top of the highest placed unit below (x, y, z), or the box floor"""
+        top = 0.0
+        cuboids = self.cuboids
+        for index in self.grid.query(x, y, 0.0, x + EPS * 2, y + EPS * 2, z + EPS * 2):
+            bx0, by0, bz0, bx1, by1, bz1 = cuboids[index]
+            if bx0 - EPS <= x < bx1 - EPS and by0 - EPS <= y < by1 - EPS and top < bz1 <= z + EPS:
+                top = bz1
+        return top
+
+    def _remove_point(self, point: Tuple[float, float, float]):
+        del self.points[bisect_left(self.points, point)]
+        self._point_set.discard(point)
+
+    def _add_point(self, x: float, y: float, z: float):
+        length, width, height = self.box_dims
+        if x >= length - EPS or y >= width - EPS or z >= height - EPS:
+            return
+        point = (z, y, x)
+        if point not in self._point_set:
+            self._point_set.add(point)
+            insort(self.points, point)
@@ -0,0 +1,116 @@
+"""
+Authenticated principal cache
+
+Keeps a small immutable snapshot of each authenticated user, keyed by the
+token subject (the user's email), so authenticated requests skip the user
+lookup. Entries expire after a TTL; role and customer changes made through
+AuthService drop them at once in this process.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Read-only view of an authenticated user
+
+    Has the attributes handlers read from the User model (and that
+    UserResponse serializes), but is not bound to a session.
+    """
+    id: str
+    email: str
+    name: str
+    role: str
+    customerId: str
+    createdAt: Optional[datetime]
+    updatedAt: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            role=user.role,
+            customerId=user.customerId,
+            createdAt=user.createdAt,
+            updatedAt=user.updatedAt
+        )
+
+class PrincipalCache:
+    """
+    Thread-safe LRU cache of principals by token subject, with a TTL
+
+    Only found users are cached, so a new user is seen at once. A change
+    made by another worker process is seen once the entry expires.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, subject: str) -> Optional[Principal]:
+        """Cached principal for a token subject, or None"""
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, subject: str, principal: Principal):
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *subjects: str):
+        """Forget the principals for these token subjects"""
+        with self._lock:
+            for subject in subjects:
+                if self._entries.pop(subject, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and size"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations
+        }
+
+# Shared cache instance
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
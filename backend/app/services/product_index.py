@@ -0,0 +1,164 @@
+"""
+Product index for fill-in recommendations
+
+Keeps a customer's products sorted by volume with their sorted dimensions
+precomputed, so "which products fit the space left in this box, best fill
+first" is a binary search plus a walk down from the largest volume that
+fits. Fixed-size blocks of the walk carry the smallest weight and sorted
+dimensions of their products, so a block in which nothing can fit the box
+is skipped whole.
+"""
+
+import hashlib
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Sequence, Tuple, Union
+
+from app.services.placement_engine import EPS
+
+Dims = Tuple[float, float, float]
+
+# (sorted dims, weight, product)
+Entry = Tuple[Dims, float, dict]
+# Smallest (weight, low, middle, high) over one block of entries
+Summary = Tuple[float, float, float, float]
+
+# Entries per block summary
+BLOCK_SIZE = 32
+
+class ProductIndex:
+    """
+    Products ordered by (volume, id)
+
+    Reads take one consistent reference to the sorted arrays; writes build
+    new arrays and swap them in (copy-on-write), so suggestions never lock.
+    """
+
+    def __init__(self, products: Iterable[dict] = ()):
+        rows = sorted(
+            ((self._volume(product), str(product['id']), self._entry(product)) for product in products),
+            key=lambda row: (row[0], row[1])
+        )
+        entries = [row[2] for row in rows]
+        self._state: Tuple[List[float], List[str], List[Entry], List[Summary]] = (
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            entries,
+            self._summaries(entries)
+        )
+        self._lock = threading.Lock()
+        self._signature: Tuple[tuple, str] = ((), "")  # (state, its signature)
+
+    @classmethod
+    def of(cls, products: Union["ProductIndex", Sequence[dict], None]) -> "ProductIndex":
+        """An index for a product list, or the index itself"""
+        if isinstance(products, ProductIndex):
+            return products
+        return cls(products or ())
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+    @property
+    def products(self) -> List[dict]:
+        """Indexed products, smallest volume first"""
+        return [entry[2] for entry in self._state[2]]
+
+    @property
+    def signature(self) -> str:
+        """Content hash of the indexed products, recomputed only after a write"""
+        state = self._state
+        hashed, signature = self._signature
+        if hashed is not state:
+            canonical = repr([sorted(entry[2].items()) for entry in state[2]])
+            signature = hashlib.sha256(canonical.encode()).hexdigest()
+            self._signature = (state, signature)
+        return signature
+
+    def add(self, product: dict):
+        """Insert or replace a product"""
+        with self._lock:
+            volumes, ids, entries, _ = self._without(str(product['id']))
+            volume = self._volume(product)
+            position = self._position(volumes, ids, volume, str(product['id']))
+            entries = entries[:position] + [self._entry(product)] + entries[position:]
+            self._state = (
+                volumes[:position] + [volume] + volumes[position:],
+                ids[:position] + [str(product['id'])] + ids[position:],
+                entries,
+                self._summaries(entries)
+            )
+
+    def discard(self, product_id: str):
+        """Remove a product if it is indexed"""
+        with self._lock:
+            self._state = self._without(product_id)
+
+    def suggest(self, remaining_volume: float, remaining_weight: float, box_dims: Dims, limit: int = 5) -> List[Tuple[float, dict]]:
+        """
+        Up to `limit` products that fit the remaining volume and weight and
+        the box's dimensions, as (volume, product) with the best fill first
+        """
+        volumes, _, entries, summaries = self._state
+        box_low, box_middle, box_high = sorted(box_dims)
+        max_weight = remaining_weight + EPS
+        max_low, max_middle, max_high = box_low + EPS, box_middle + EPS, box_high + EPS
+        found = []
+        position = bisect_right(volumes, remaining_volume + EPS)
+        while position > 0 and len(found) < limit:
+            block = (position - 1) // BLOCK_SIZE
+            start = block * BLOCK_SIZE
+            min_weight, min_low, min_middle, min_high = summaries[block]
+            if min_weight <= max_weight and min_low <= max_low and min_middle <= max_middle and min_high <= max_high:
+                for index in range(position - 1, start - 1, -1):
+                    (low, middle, high), weight, product = entries[index]
+                    if weight <= max_weight and low <= max_low and middle <= max_middle and high <= max_high:
+                        found.append((volumes[index], product))
+                        if len(found) == limit:
+                            break
+            position = start
+        return found
+
+    def _without(self, product_id: str) -> Tuple[List[float], List[str], List[Entry], List[Summary]]:
+        volumes, ids, entries, summaries = self._state
+        try:
+            position = ids.index(product_id)
+        except ValueError:
+            return volumes, ids, entries, summaries
+        entries = entries[:position] + entries[position + 1:]
+        return (
+            volumes[:position] + volumes[position + 1:],
+            ids[:position] + ids[position + 1:],
+            entries,
+            self._summaries(entries)
+        )
+
+    @staticmethod
+    def _summaries(entries: List[Entry]) -> List[Summary]:
+        """Smallest weight and sorted dimensions per block of entries"""
+        summaries = []
+        for start in range(0, len(entries), BLOCK_SIZE):
+            block = entries[start:start + BLOCK_SIZE]
+            summaries.append((
+                min(entry[1] for entry in block),
+                min(entry[0][0] for entry in block),
+                min(entry[0][1] for entry in block),
+                min(entry[0][2] for entry in block)
+            ))
+        return summaries
+
+    @staticmethod
+    def _position(volumes: List[float], ids: List[str], volume: float, product_id: str) -> int:
+        # Ties on volume are kept in id order
+        start = bisect_left(volumes, volume)
+        end = bisect_right(volumes, volume, lo=start)
+        return bisect_left(ids, product_id, lo=start, hi=end)
+
+    @staticmethod
+    def _volume(product: dict) -> float:
+        return product['length'] * product['width'] * product['height']
+
+    @staticmethod
+    def _entry(product: dict) -> Entry:
+        low, middle, high = sorted((product['length'], product['width'], product['height']))
+        return ((low, middle, high), product['weight'], product)
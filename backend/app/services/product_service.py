@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.catalog_cache import catalog_cache
 from typing import List, Optional
 
 class ProductService:
@@ -62,6 +63,7 @@ class ProductService:
         self.db.add(db_product)
         self.db.commit()
         self.db.refresh(db_product)
+        catalog_cache.apply_product_write(self.db, db_product, created=True)
         return db_product
     
     def update_product(self, product_id: int, product_data: ProductUpdate) -> Optional[Product]:
@@ -71,6 +73,7 @@ class ProductService:
         product = self.get_product_by_id(product_id)
         if not product:
             return None
+        previous_customer_id = product.customerId
         
         # Update fields if provided
         update_data = product_data.dict(exclude_unset=True)
@@ -79,6 +82,7 @@ class ProductService:
         
         self.db.commit()
         self.db.refresh(product)
+        catalog_cache.apply_product_write(self.db, product, previous_customer_id=previous_customer_id)
         return product
     
     def delete_product(self, product_id: int) -> bool:
@@ -91,6 +95,7 @@ class ProductService:
         
         product.active = False
         self.db.commit()
+        catalog_cache.apply_product_write(self.db, product)
         return True
     
     def get_products_count(self, customer_id: Optional[str] = None, active_only: bool = True) -> int:
@@ -0,0 +1,261 @@
+"""
+Rate quote cache
+
+Read-through/write-through cache of complete shipping quotes. Lookups hit
+an in-process tier first and fall back to the rate_quote_cache table; new
+quotes are written to the table in batches by a background worker, which
+also sweeps expired rows.
+"""
+
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.rate_quote_cache import RateQuoteCache
+from app.schemas.packing import Box, ShippingCalculationRequest, ShippingCalculationResponse
+
+logger = logging.getLogger(__name__)
+
+# Response fields that are regenerated for every quote served from cache
+PER_REQUEST_FIELDS = {"calculation_id", "created_at", "debug_info"}
+
+def box_signature(boxes: List[Box]) -> str:
+    """Content hash of a customer's active box set"""
+    canonical = sorted((box.id, box.name, box.length, box.width, box.height, box.max_weight, box.cost) for box in boxes)
+    return hashlib.sha256(repr(canonical).encode()).hexdigest()
+
+def quote_request_hash(request: ShippingCalculationRequest, box_set_signature: str, product_set_signature: str, tariff_signature: str) -> str:
+    """Hash of everything that determines a quote, products (for recommendations) and tariff contents included"""
+    payload = {
+        "customer_id": request.customer_id,
+        "origin_zip": request.origin_zip,
+        "destination_zip": request.destination_zip,
+        "service_level": request.service_level,
+        "items": [item.model_dump() for item in request.items],
+        "boxes": box_set_signature,
+        "products": product_set_signature,
+        "tariffs": tariff_signature,
+        "objective": settings.PACKING_OBJECTIVE
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+class QuoteCache:
+    """
+    Two-tier quote cache: a bounded in-process LRU backed by rate_quote_cache
+    """
+
+    def __init__(self, local_max_entries: int, local_ttl_seconds: float, ttl_seconds: float, write_queue_size: int):
+        self.local_max_entries = local_max_entries
+        self.local_ttl_seconds = local_ttl_seconds
+        self.ttl_seconds = ttl_seconds
+        self._local: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending: "queue.Queue[RateQuoteCache]" = queue.Queue(maxsize=write_queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.local_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.dropped_writes = 0
+        self.swept = 0
+
+    def get(self, db: Session, request_hash: str) -> Optional[dict]:
+        """
+        Cached response payload for a request hash, or None
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(request_hash)
+            if entry is not None and entry[0] >= now:
+                self._local.move_to_end(request_hash)
+                self.local_hits += 1
+                return entry[1]
+
+        row = db.query(RateQuoteCache.carrierResponse, RateQuoteCache.expiresAt).filter(
+            RateQuoteCache.requestHash == request_hash,
+            RateQuoteCache.expiresAt > datetime.now(timezone.utc)
+        ).order_by(RateQuoteCache.expiresAt.desc()).first()
+
+        if row is None or not row.carrierResponse:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.db_hits += 1
+            self._remember(request_hash, row.carrierResponse, now)
+        return row.carrierResponse
+
+    def put(self, request: ShippingCalculationRequest, request_hash: str, box_set_signature: str, response: ShippingCalculationResponse):
+        """
+        Cache a fresh quote locally and queue it for the database tier
+        """
+        payload = response.model_dump(exclude=PER_REQUEST_FIELDS)
+        with self._lock:
+            self._remember(request_hash, payload, time.monotonic())
+
+        row = RateQuoteCache(
+            id=str(uuid.uuid4()),
+            customerId=request.customer_id,
+            originZip=request.origin_zip or "",
+            destinationZip=request.destination_zip,
+            serviceLevel=request.service_level,
+            billingWeight=response.total_weight,
+            boxSignature=box_set_signature,
+            zone=str(response.zone),
+            rate=response.cost_breakdown.total_cost,
+            source="TARIFF",
+            requestHash=request_hash,
+            carrierResponse=payload,
+            expiresAt=datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        )
+        try:
+            self._pending.put_nowait(row)
+        except queue.Full:
+            # Never block a request on the write-behind queue
+            with self._lock:
+                self.dropped_writes += 1
+
+    def clear(self, db: Optional[Session] = None):
+        """
+        Drop local entries and queued writes, and with a session every cached
+        row (after tariff edits)
+        """
+        with self._lock:
+            self._local.clear()
+        while True:
+            try:
+                self._pending.get_nowait()
+            except queue.Empty:
+                break
+        if db is not None:
+            db.query(RateQuoteCache).filter(RateQuoteCache.source == "TARIFF").delete(synchronize_session=False)
+            db.commit()
+
+    def start(self):
+        """
+        Start the background writer/sweeper thread
+        """
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="quote-cache-writer", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        """
+        Stop the background thread after flushing pending writes
+        """
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout=settings.QUOTE_CACHE_FLUSH_INTERVAL_SECONDS * 2 + 5)
+            self._worker = None
+
+    def stats(self) -> dict:
+        lookups = self.local_hits + self.db_hits + self.misses
+        return {
+            "local_entries": len(self._local),
+            "local_hits": self.local_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.local_hits + self.db_hits) / lookups if lookups else 0.0,
+            "pending_writes": self._pending.qsize(),
+            "writes": self.writes,
+            "dropped_writes": self.dropped_writes,
+            "swept": self.swept
+        }
+
+    def _remember(self, request_hash: str, payload: dict, now: float):
+        # Caller holds the lock
+        self._local[request_hash] = (now + self.local_ttl_seconds, payload)
+        self._local.move_to_end(request_hash)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    def _run(self):
+        next_sweep = time.monotonic()
+        while True:
+            stopping = self._stop.wait(settings.QUOTE_CACHE_FLUSH_INTERVAL_SECONDS)
+            self._flush()
+            if time.monotonic() >= next_sweep:
+                self._sweep()
+                next_sweep = time.monotonic() + settings.QUOTE_CACHE_SWEEP_INTERVAL_SECONDS
+            if stopping:
+                break
+
+    def _flush(self):
+        batch = []
+        while len(batch) < settings.QUOTE_CACHE_WRITE_BATCH_SIZE * 10:
+            try:
+                batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return
+
+        db = SessionLocal()
+        try:
+            for start in range(0, len(batch), settings.QUOTE_CACHE_WRITE_BATCH_SIZE):
+                self._write(db, batch[start:start + settings.QUOTE_CACHE_WRITE_BATCH_SIZE])
+        finally:
+            db.close()
+
+    def _write(self, db: Session, rows: List[RateQuoteCache]):
+        """
+        Commit one chunk of rows; if it fails, retry the rows one at a time
+        so only the failing ones (e.g. a customer deleted since) are dropped
+        """
+        try:
+            db.add_all(rows)
+            db.commit()
+            written = len(rows)
+        except Exception as e:
+            db.rollback()
+            logger.warning("Quote cache batch write failed, retrying rows singly: %s", e)
+            written = 0
+            for row in rows:
+                try:
+                    db.add(row)
+                    db.commit()
+                    written += 1
+                except Exception as e:
+                    db.rollback()
+                    logger.warning("Quote cache write failed: %s", e)
+        with self._lock:
+            self.writes += written
+            self.dropped_writes += len(rows) - written
+
+    def _sweep(self):
+        db = SessionLocal()
+        try:
+            deleted = db.query(RateQuoteCache).filter(
+                RateQuoteCache.expiresAt <= datetime.now(timezone.utc)
+            ).delete(synchronize_session=False)
+            db.commit()
+            with self._lock:
+                self.swept += deleted
+        except Exception as e:
+            db.rollback()
+            logger.warning("Quote cache sweep failed: %s", e)
+        finally:
+            db.close()
+
+# Shared cache instance
+quote_cache = QuoteCache(
+    local_max_entries=settings.QUOTE_CACHE_LOCAL_MAX_ENTRIES,
+    local_ttl_seconds=settings.QUOTE_CACHE_LOCAL_TTL_SECONDS,
+    ttl_seconds=settings.QUOTE_CACHE_TTL_SECONDS,
+    write_queue_size=settings.QUOTE_CACHE_WRITE_QUEUE_SIZE
+)
@@ -0,0 +1,257 @@
+"""
+Streaming bulk quoting pipeline
+
+Orders read from an NDJSON or CSV upload flow through parse, pack and rate
+stages, each on its own thread and joined by bounded queues, and the
+response body serializes results as they come out. A full queue blocks the
+stage feeding it, so memory stays flat however large the input is.
+"""
+
+import csv
+import io
+import json
+import queue
+import threading
+from itertools import groupby
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.schemas.packing import ShippingCalculationRequest, ShippingCalculationResponse
+from app.services.calculation_service import CalculationService, PendingOrder
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+# One CSV row per order line; consecutive rows with the same order_id form an order
+CSV_ORDER_FIELDS = ("customer_id", "destination_zip", "service_level", "origin_zip")
+CSV_ITEM_FIELDS = ("item_id", "item_name", "length", "width", "height", "weight", "quantity")
+CSV_RESULT_FIELDS = (
+    "order_id", "success", "zone", "total_boxes", "total_weight",
+    "base_rate", "material_rate", "accessories", "total_cost", "error"
+)
+
+# Marks the end of a stage's output
+_DONE = object()
+
+Row = Tuple[str, Union[ShippingCalculationRequest, str]]
+
+def stream_format(requested: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Input format from an explicit choice or the request content type"""
+    if requested:
+        return requested if requested in FORMATS else None
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in ("text/csv", "application/csv"):
+        return "csv"
+    if media_type in ("application/x-ndjson", "application/jsonl", "application/json-lines", ""):
+        return "ndjson"
+    return None
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'order'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[Row]:
+    """
+    One order per line; `order_id` (optional) defaults to the line number
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        order_id = str(number)
+        try:
+            data = json.loads(line)
+            if isinstance(data, dict) and data.get("order_id") is not None:
+                order_id = str(data["order_id"])
+            yield order_id, ShippingCalculationRequest.model_validate(data)
+        except json.JSONDecodeError as e:
+            yield order_id, f"Invalid JSON: {e.msg}"
+        except ValidationError as e:
+            yield order_id, f"Invalid order: {_validation_message(e)}"
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Row]:
+    """
+    Order lines grouped into orders by consecutive `order_id`
+    """
+    reader = csv.DictReader(lines)
+    missing = {"order_id", *CSV_ORDER_FIELDS, *CSV_ITEM_FIELDS} - {"origin_zip"} - set(reader.fieldnames or ())
+    if missing:
+        yield "header", f"Missing CSV columns: {', '.join(sorted(missing))}"
+        return
+
+    for order_id, rows in groupby(reader, key=lambda row: row["order_id"]):
+        rows = list(rows)
+        first = rows[0]
+        data = {field: first.get(field) or None for field in CSV_ORDER_FIELDS}
+        data["items"] = [
+            {
+                "id": row["item_id"],
+                "name": row["item_name"],
+                "length": row["length"],
+                "width": row["width"],
+                "height": row["height"],
+                "weight": row["weight"],
+                "quantity": row["quantity"]
+            }
+            for row in rows
+        ]
+        try:
+            yield order_id, ShippingCalculationRequest.model_validate(data)
+        except ValidationError as e:
+            yield order_id, f"Invalid order: {_validation_message(e)}"
+
+class QuotePipeline:
+    """
+    Streams quotes for an upload of orders
+
+    parse -> pack -> rate run on background threads; `stream()` is the
+    serialize stage and yields encoded result rows in input order. Packing
+    is submitted to the shared process pool by the pack stage and awaited
+    by the rate stage, so the queue between them bounds the orders in
+    flight on the pool. Each DB-using stage has its own session.
+    """
+
+    def __init__(self, source: BinaryIO, input_format: str, queue_size: Optional[int] = None):
+        self.source = source
+        self.format = input_format
+        size = queue_size or settings.CALCULATION_STREAM_QUEUE_SIZE
+        self._orders: "queue.Queue" = queue.Queue(maxsize=size)
+        self._pending: "queue.Queue" = queue.Queue(maxsize=size)
+        self._results: "queue.Queue" = queue.Queue(maxsize=size)
+        self._stop = threading.Event()
+        self._threads = []
+
+    @property
+    def media_type(self) -> str:
+        return FORMATS[self.format]
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        Run the pipeline, yielding one encoded result per order
+        """
+        self._start()
+        try:
+            if self.format == "csv":
+                yield self._csv_line(CSV_RESULT_FIELDS)
+            while True:
+                entry = self._results.get()
+                if entry is _DONE:
+                    break
+                yield self._serialize(*entry)
+        finally:
+            # Also reached when the client disconnects mid-stream
+            self._stop.set()
+            for thread in self._threads:
+                thread.join(timeout=5)
+            self.source.close()
+
+    def _start(self):
+        for name, target in (("parse", self._parse), ("pack", self._pack), ("rate", self._rate)):
+            thread = threading.Thread(target=target, name=f"quote-stream-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _put(self, target: "queue.Queue", entry) -> bool:
+        """Blocking put that gives up once the pipeline is stopped"""
+        while not self._stop.is_set():
+            try:
+                target.put(entry, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: "queue.Queue"):
+        """Blocking get that returns _DONE once the pipeline is stopped"""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _parse(self):
+        text = io.TextIOWrapper(self.source, encoding="utf-8-sig", newline="")
+        try:
+            rows = parse_csv(text) if self.format == "csv" else parse_ndjson(text)
+            for row in rows:
+                if not self._put(self._orders, row):
+                    return
+        except Exception as e:
+            self._put(self._orders, ("input", f"Could not read input: {e}"))
+        finally:
+            text.detach()
+            self._put(self._orders, _DONE)
+
+    def _pack(self):
+        db = SessionLocal()
+        try:
+            service = CalculationService(db)
+            while True:
+                entry = self._get(self._orders)
+                if entry is _DONE:
+                    break
+                order_id, order = entry
+                if isinstance(order, ShippingCalculationRequest):
+                    try:
+                        order = service.submit_order(order)
+                    except Exception as e:
+                        order = self._error_message(e)
+                    # Read-only from here on; release the connection between orders
+                    db.rollback()
+                if not self._put(self._pending, (order_id, order)):
+                    break
+        finally:
+            db.close()
+            self._put(self._pending, _DONE)
+
+    def _rate(self):
+        db = SessionLocal()
+        try:
+            service = CalculationService(db)
+            while True:
+                entry = self._get(self._pending)
+                if entry is _DONE:
+                    break
+                order_id, order = entry
+                if isinstance(order, PendingOrder):
+                    try:
+                        order = service.complete_order(order)
+                    except Exception as e:
+                        order = self._error_message(e)
+                    db.rollback()
+                if not self._put(self._results, (order_id, order)):
+                    break
+        finally:
+            db.close()
+            self._put(self._results, _DONE)
+
+    def _error_message(self, error: Exception) -> str:
+        return str(error) if isinstance(error, ValueError) else f"Calculation failed: {error}"
+
+    def _serialize(self, order_id: str, outcome: Union[ShippingCalculationResponse, str]) -> bytes:
+        success = isinstance(outcome, ShippingCalculationResponse)
+        if self.format == "csv":
+            if not success:
+                return self._csv_line((order_id, "false", "", "", "", "", "", "", "", outcome))
+            cost = outcome.cost_breakdown
+            return self._csv_line((
+                order_id, "true", outcome.zone, outcome.total_boxes, outcome.total_weight,
+                cost.base_rate, cost.material_rate, cost.accessories, cost.total_cost, ""
+            ))
+        if success:
+            line = f'{{"order_id":{json.dumps(order_id)},"success":true,"result":{outcome.model_dump_json(exclude={"debug_info"})}}}'
+        else:
+            line = json.dumps({"order_id": order_id, "success": False, "error": outcome})
+        return (line + "\n").encode()
+
+    def _csv_line(self, values) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(values)
+        return buffer.getvalue().encode()
@@ -0,0 +1,145 @@
+"""
+System settings cache
+
+Keeps the system settings row (branding and the debug flag) in memory, so
+calculations do not query it. Updates made by this process drop the
+cached copy at once; other worker processes notice within
+SETTINGS_CACHE_CHECK_INTERVAL_SECONDS through an updatedAt watermark,
+like the catalog cache.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.system_settings import SystemSettings
+
+@dataclass(frozen=True, slots=True)
+class SettingsSnapshot:
+    """
+    Read-only copy of the system settings row
+    """
+    id: str
+    companyName: str
+    companyLogoUrl: Optional[str]
+    primaryColor: Optional[str]
+    secondaryColor: Optional[str]
+    debugMode: bool
+    createdAt: Optional[datetime]
+    updatedAt: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row: SystemSettings) -> "SettingsSnapshot":
+        return cls(
+            id=row.id,
+            companyName=row.companyName,
+            companyLogoUrl=row.companyLogoUrl,
+            primaryColor=row.primaryColor,
+            secondaryColor=row.secondaryColor,
+            debugMode=bool(row.debugMode),
+            createdAt=row.createdAt,
+            updatedAt=row.updatedAt
+        )
+
+class _Entry:
+    __slots__ = ("snapshot", "watermark", "checked_at")
+
+    def __init__(self, snapshot: Optional[SettingsSnapshot], watermark: tuple):
+        self.snapshot = snapshot  # None while no settings row exists
+        self.watermark = watermark
+        self.checked_at = time.monotonic()
+
+class SettingsCache:
+    """
+    Process-wide cache of the system settings
+
+    The settings are served as is for `check_interval_seconds` after they
+    were loaded or last validated; after that one watermark query (latest
+    updatedAt and row count) decides whether they are still current. 0
+    disables the check, leaving only the invalidation done by this process.
+    """
+
+    def __init__(self, check_interval_seconds: float = 0):
+        self.check_interval_seconds = check_interval_seconds
+        self._entry: Optional[_Entry] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def get(self, db: Session) -> Optional[SettingsSnapshot]:
+        """
+        Current settings, or None if no settings row exists
+        """
+        entry = self._entry
+        if entry is not None and not self._is_due(entry):
+            self.hits += 1
+            return entry.snapshot
+
+        watermark = self._watermark(db)
+        if entry is not None:
+            self.revalidations += 1
+            if entry.watermark == watermark:
+                entry.checked_at = time.monotonic()
+                self.hits += 1
+                return entry.snapshot
+
+        self.misses += 1
+        version = self._version
+        row = db.query(SystemSettings).first()
+        entry = _Entry(SettingsSnapshot.from_row(row) if row is not None else None, watermark)
+        with self._lock:
+            # Do not publish a load that raced with an invalidation
+            if self._version == version:
+                self._entry = entry
+        return entry.snapshot
+
+    def peek(self) -> Tuple[bool, Optional[SettingsSnapshot]]:
+        """
+        (True, settings) if they can be served without a database check, else (False, None)
+        """
+        entry = self._entry
+        if entry is None or self._is_due(entry):
+            return False, None
+        self.hits += 1
+        return True, entry.snapshot
+
+    def debug_mode(self, db: Session) -> bool:
+        """Whether debug mode is on (off while no settings row exists)"""
+        snapshot = self.get(db)
+        return snapshot.debugMode if snapshot is not None else False
+
+    def invalidate(self):
+        """
+        Drop the cached settings after they were created or updated
+        """
+        with self._lock:
+            self._version += 1
+            self._entry = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached": self._entry is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+    def _is_due(self, entry: _Entry) -> bool:
+        return bool(self.check_interval_seconds) and time.monotonic() - entry.checked_at > self.check_interval_seconds
+
+    def _watermark(self, db: Session) -> tuple:
+        """Latest updatedAt and row count of the settings table"""
+        return tuple(db.query(func.max(SystemSettings.updatedAt), func.count(SystemSettings.id)).one())
+
+# Shared cache instance
+settings_cache = SettingsCache(check_interval_seconds=settings.SETTINGS_CACHE_CHECK_INTERVAL_SECONDS)
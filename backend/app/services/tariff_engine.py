@@ -0,0 +1,356 @@
+"""
+In-memory Tyson tariff engine
+
+Loads the Tyson service charge tables once into sorted column arrays and
+answers rate lookups with a binary search instead of a query per lookup.
+The ZIP-to-zone matrix is held as a dense byte array indexed by ZIP code.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.schemas.packing import Box, PackedBox, PackingResult
+from app.models.tyson_tariff import (
+    TysonZipToZoneMatrix,
+    TysonStandardOvernightServiceCharges,
+    TysonSecondDayServiceCharges,
+    TysonMaterials,
+    TysonAccessoriesCharges
+)
+
+# Zone value stored for ZIP codes missing from the matrix
+UNKNOWN_ZONE = 0
+
+ZIP_KEYSPACE = 100000
+
+class ZoneIndex:
+    """
+    Dense ZIP-to-zone table
+
+    One byte per 5-digit ZIP code (100 KB for the whole keyspace), with
+    `UNKNOWN_ZONE` for ZIP codes that are not in the matrix.
+    """
+    __slots__ = ("zones", "size")
+
+    def __init__(self, zones: bytearray, size: int):
+        self.zones = zones
+        self.size = size
+
+    @classmethod
+    def from_db(cls, db: Session) -> "ZoneIndex":
+        """Load the ZIP-to-zone matrix, keeping the first row for duplicated ZIP codes"""
+        zones = bytearray(ZIP_KEYSPACE)
+        size = 0
+        rows = db.query(TysonZipToZoneMatrix.destination_zip, TysonZipToZoneMatrix.zone).order_by(
+            TysonZipToZoneMatrix.id
+        ).all()
+        for destination_zip, zone in rows:
+            key = zip_key(destination_zip)
+            if key is None or not 0 < zone < 256 or zones[key] != UNKNOWN_ZONE:
+                continue
+            zones[key] = zone
+            size += 1
+        return cls(zones, size)
+
+    def lookup(self, zip_code: str) -> Optional[int]:
+        """Zone for a ZIP code, or None if it is not in the matrix"""
+        key = zip_key(zip_code)
+        if key is None:
+            return None
+        zone = self.zones[key]
+        return zone if zone != UNKNOWN_ZONE else None
+
+    def lookup_many(self, zip_codes: List[str]) -> List[Optional[int]]:
+        """Zones for many ZIP codes in one pass"""
+        zones = self.zones
+        result = []
+        for zip_code in zip_codes:
+            key = zip_key(zip_code)
+            zone = zones[key] if key is not None else UNKNOWN_ZONE
+            result.append(zone if zone != UNKNOWN_ZONE else None)
+        return result
+
+# A 5-digit ZIP code, optionally in ZIP+4 form
+ZIP_PATTERN = re.compile(r"([0-9]{5})(?:-[0-9]{4})?")
+
+def zip_key(zip_code: Optional[str]) -> Optional[int]:
+    """Integer index for a 5-digit or ZIP+4 code (the +4 suffix is ignored), None for anything else"""
+    if not zip_code:
+        return None
+    match = ZIP_PATTERN.fullmatch(zip_code)
+    return int(match.group(1)) if match else None
+
+class RateTable:
+    """
+    Rate table for one service level
+
+    `weights` holds the weight band upper bounds in ascending order and
+    `rates[zone][band]` the charge for that zone and band. Zones without a
+    column in the tariff table have no row. The same charges are kept as a
+    (zone row x band) array for pricing many zones at once.
+    """
+    __slots__ = ("weights", "rates", "grid", "zone_rows")
+
+    def __init__(self, weights: List[float], rates: Dict[int, List[float]]):
+        self.weights = weights
+        self.rates = rates
+        zones = sorted(rates)
+        self.grid = np.array([rates[zone] for zone in zones], dtype=float).reshape(len(zones), len(weights))
+        # Row of each zone in the grid, -1 for zones without a column
+        self.zone_rows = np.full(256, -1, dtype=np.intp)
+        for row, zone in enumerate(zones):
+            if 0 <= zone < 256:
+                self.zone_rows[zone] = row
+
+    @classmethod
+    def from_model(cls, db: Session, model) -> "RateTable":
+        """Load a `lbs` + `zone_N` charge table into column arrays"""
+        zone_columns = [
+            column for column in model.__table__.columns
+            if column.name.startswith("zone_")
+        ]
+        rows = db.query(model.lbs, *zone_columns).order_by(model.lbs, model.id).all()
+
+        weights = [row[0] for row in rows]
+        rates = {}
+        for index, column in enumerate(zone_columns, start=1):
+            zone = int(column.name[len("zone_"):])
+            rates[zone] = [row[index] or 0.0 for row in rows]
+        return cls(weights, rates)
+
+    def band_index(self, weight: float) -> Optional[int]:
+        """Index of the first weight band covering `weight`, or None if above the table"""
+        band = bisect_left(self.weights, weight)
+        return band if band < len(self.weights) else None
+
+    def lookup(self, zone: int, weight: float) -> float:
+        """Rate for a zone and weight, 0.0 when the table has no matching band or zone"""
+        row = self.rates.get(zone)
+        if row is None:
+            return 0.0
+        band = bisect_left(self.weights, weight)
+        if band == len(self.weights):
+            return 0.0
+        return row[band]
+
+    def lookup_zones(self, zones: np.ndarray, weight: float) -> np.ndarray:
+        """Rates for many zones at one weight, 0.0 where the table has no matching band or zone"""
+        zones = np.asarray(zones, dtype=np.intp)
+        band = self.band_index(weight)
+        if band is None or not len(self.grid):
+            return np.zeros(len(zones))
+        rows = self.zone_rows[zones]
+        return np.where(rows >= 0, self.grid[np.maximum(rows, 0), band], 0.0)
+
+def material_charge(average_rate: float, packed_boxes: List[PackedBox]) -> float:
+    """Material charge: the average material rate per 1000 cubic inches of box volume"""
+    if average_rate == 0:
+        return 0.0
+    return sum(
+        average_rate * (packed_box.box.length * packed_box.box.width * packed_box.box.height / 1000)
+        for packed_box in packed_boxes
+    )
+
+def accessories_charge(accessories_total: float, packed_boxes: List[PackedBox]) -> float:
+    """Accessory charge: every accessory charge once per box"""
+    return accessories_total * len(packed_boxes)
+
+class LandedCostModel:
+    """
+    Prices candidate packings for one destination zone and service level
+
+    Holds only the rate row for its zone, so it is cheap to pickle and send
+    to packing worker processes along with an order.
+    """
+    __slots__ = ("zone", "weights", "rates", "material_average_rate", "accessories_total")
+
+    def __init__(self, zone: int, weights: List[float], rates: Optional[List[float]], material_average_rate: float, accessories_total: float):
+        self.zone = zone
+        self.weights = weights
+        self.rates = rates
+        self.material_average_rate = material_average_rate
+        self.accessories_total = accessories_total
+
+    @classmethod
+    def from_snapshot(cls, snapshot: "TariffSnapshot", zone: int, service_level: str) -> "LandedCostModel":
+        table = snapshot.rate_table(service_level)
+        return cls(zone, table.weights, table.rates.get(zone), snapshot.material_average_rate, snapshot.accessories_total)
+
+    def base_rate(self, weight: float) -> float:
+        """Shipping rate for a total weight, 0.0 outside the table"""
+        if self.rates is None:
+            return 0.0
+        band = bisect_left(self.weights, weight)
+        if band == len(self.weights):
+            return 0.0
+        return self.rates[band]
+
+    def box_charge(self, box: Box) -> float:
+        """Material and accessory charge one box adds to a packing"""
+        return self.material_average_rate * (box.length * box.width * box.height / 1000) + self.accessories_total
+
+    def __call__(self, packing_result: PackingResult) -> float:
+        """Landed cost (base + material + accessories) of a packing"""
+        return (
+            self.base_rate(packing_result.total_weight) +
+            material_charge(self.material_average_rate, packing_result.packed_boxes) +
+            accessories_charge(self.accessories_total, packing_result.packed_boxes)
+        )
+
+def tariff_signature(zones: ZoneIndex, overnight: RateTable, second_day: RateTable, material_average_rate: float, accessories_total: float) -> str:
+    """Content hash of the tariff tables, the same in every process that loaded them"""
+    digest = hashlib.sha256(bytes(zones.zones))
+    for table in (overnight, second_day):
+        digest.update(repr((table.weights, sorted(table.rates.items()))).encode())
+    digest.update(repr((material_average_rate, accessories_total)).encode())
+    return digest.hexdigest()
+
+class TariffSnapshot:
+    """
+    Immutable view of all tariff tables at one version
+
+    `version` counts reloads in this process; `signature` identifies the
+    table contents across processes (quotes are cached under it).
+
+    Landed cost models are built once per (rate table, zone) and reused,
+    so pricing many candidate packings only does band lookups.
+    """
+    __slots__ = ("version", "signature", "loaded_at", "zones", "overnight", "second_day", "material_average_rate", "accessories_total", "_cost_models")
+
+    def __init__(
+        self,
+        version: int,
+        loaded_at: float,
+        zones: ZoneIndex,
+        overnight: RateTable,
+        second_day: RateTable,
+        material_average_rate: float,
+        accessories_total: float
+    ):
+        self.version = version
+        self.signature = tariff_signature(zones, overnight, second_day, material_average_rate, accessories_total)
+        self.loaded_at = loaded_at
+        self.zones = zones
+        self.overnight = overnight
+        self.second_day = second_day
+        self.material_average_rate = material_average_rate
+        self.accessories_total = accessories_total
+        self._cost_models: Dict[tuple, LandedCostModel] = {}
+
+    def rate_table(self, service_level: str) -> RateTable:
+        """Rate table for a service level (standard is priced off second day)"""
+        if service_level == "overnight":
+            return self.overnight
+        return self.second_day
+
+    def cost_model(self, zone: int, service_level: str) -> LandedCostModel:
+        """Landed cost model for one zone and service level"""
+        key = (self.rate_table(service_level) is self.overnight, zone)
+        model = self._cost_models.get(key)
+        if model is None:
+            # Models are immutable, so a racing duplicate build is harmless
+            model = self._cost_models.setdefault(key, LandedCostModel.from_snapshot(self, zone, service_level))
+        return model
+
+    def status(self) -> dict:
+        """Summary of the loaded tables"""
+        return {
+            "version": self.version,
+            "signature": self.signature,
+            "loaded_at": self.loaded_at,
+            "zip_codes": self.zones.size,
+            "overnight_bands": len(self.overnight.weights),
+            "second_day_bands": len(self.second_day.weights),
+            "zones": sorted(set(self.overnight.rates) | set(self.second_day.rates)),
+            "material_average_rate": self.material_average_rate,
+            "accessories_total": self.accessories_total
+        }
+
+class TariffEngine:
+    """
+    Process-wide tariff cache
+
+    Lookups read the current snapshot without locking. `reload` swaps in a
+    freshly loaded snapshot with a new version, and snapshots older than
+    `max_age_seconds` are reloaded on next use so every worker process
+    eventually picks up tariff edits.
+    """
+
+    def __init__(self, max_age_seconds: float = 0):
+        self.max_age_seconds = max_age_seconds
+        self._snapshot: Optional[TariffSnapshot] = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def snapshot(self, db: Session) -> TariffSnapshot:
+        """Current snapshot, loading it from the database if missing or stale"""
+        snapshot = self._snapshot
+        if snapshot is None or self._is_stale(snapshot):
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None or self._is_stale(snapshot):
+                    snapshot = self._load(db)
+        return snapshot
+
+    def current(self) -> Optional[TariffSnapshot]:
+        """Current snapshot if it is loaded and fresh, without touching the database"""
+        snapshot = self._snapshot
+        if snapshot is None or self._is_stale(snapshot):
+            return None
+        return snapshot
+
+    def reload(self, db: Session) -> TariffSnapshot:
+        """Reload all tariff tables and bump the version"""
+        with self._lock:
+            return self._load(db)
+
+    def invalidate(self):
+        """Drop the current snapshot so the next lookup reloads it"""
+        with self._lock:
+            self._snapshot = None
+
+    def _is_stale(self, snapshot: TariffSnapshot) -> bool:
+        return bool(self.max_age_seconds) and time.time() - snapshot.loaded_at > self.max_age_seconds
+
+    def _load(self, db: Session) -> TariffSnapshot:
+        zones = ZoneIndex.from_db(db)
+        overnight = RateTable.from_model(db, TysonStandardOvernightServiceCharges)
+        second_day = RateTable.from_model(db, TysonSecondDayServiceCharges)
+
+        # Average refrigerated overnight material rate, ignoring empty rates
+        material_rates = [
+            rate for (rate,) in db.query(TysonMaterials.refrigerated_overnight_rate).all() if rate
+        ]
+        material_average_rate = sum(material_rates) / len(material_rates) if material_rates else 0.0
+
+        accessories_total = sum(
+            rate for (rate,) in db.query(TysonAccessoriesCharges.rate).all() if rate
+        )
+
+        self._version += 1
+        snapshot = TariffSnapshot(
+            version=self._version,
+            loaded_at=time.time(),
+            zones=zones,
+            overnight=overnight,
+            second_day=second_day,
+            material_average_rate=material_average_rate,
+            accessories_total=accessories_total
+        )
+        self._snapshot = snapshot
+        return snapshot
+
+# Shared engine instance
+tariff_engine = TariffEngine(max_age_seconds=settings.TARIFF_CACHE_MAX_AGE_SECONDS)
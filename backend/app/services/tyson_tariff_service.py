@@ -2,16 +2,12 @@
 Tyson Tariff Service for shipping rate calculations
 """
 
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.models.tyson_tariff import (
-    TysonZipToZoneMatrix,
-    TysonStandardOvernightServiceCharges,
-    TysonSecondDayServiceCharges,
-    TysonMaterials,
-    TysonAccessoriesCharges
-)
+from typing import List, Optional, Tuple
 from app.schemas.packing import PackedBox
+from app.services.tariff_engine import tariff_engine, material_charge, accessories_charge, TariffSnapshot
 
 class TysonTariffService:
     def __init__(self, db: Session):
@@ -19,44 +15,18 @@ class TysonTariffService:
 
     def get_zone_from_zip(self, zip_code: str) -> int:
         """Get shipping zone from ZIP code"""
-        result = self.db.query(TysonZipToZoneMatrix).filter(
-            TysonZipToZoneMatrix.destination_zip == zip_code
-        ).first()
-        return result.zone if result else 1  # Default to zone 1
+        zone = tariff_engine.snapshot(self.db).zones.lookup(zip_code)
+        return zone if zone is not None else 1  # Default to zone 1
 
     def get_overnight_rate(self, zone: int, weight: float) -> float:
         """Get overnight shipping rate"""
-        # Find the weight band that covers our weight
-        result = self.db.query(TysonStandardOvernightServiceCharges).filter(
-            TysonStandardOvernightServiceCharges.lbs >= weight
-        ).order_by(TysonStandardOvernightServiceCharges.lbs).first()
-        
-        if not result:
-            return 0.0
-            
-        # Get the rate for the specific zone
-        zone_column = f"zone_{zone}"
-        if hasattr(result, zone_column):
-            return getattr(result, zone_column) or 0.0
-        else:
-            return 0.0
+        # Find the weight band that covers our weight and the rate for the zone
+        return tariff_engine.snapshot(self.db).overnight.lookup(zone, weight)
 
     def get_second_day_rate(self, zone: int, weight: float) -> float:
         """Get second day shipping rate"""
-        # Find the weight band that covers our weight
-        result = self.db.query(TysonSecondDayServiceCharges).filter(
-            TysonSecondDayServiceCharges.lbs >= weight
-        ).order_by(TysonSecondDayServiceCharges.lbs).first()
-        
-        if not result:
-            return 0.0
-            
-        # Get the rate for the specific zone
-        zone_column = f"zone_{zone}"
-        if hasattr(result, zone_column):
-            return getattr(result, zone_column) or 0.0
-        else:
-            return 0.0
+        # Find the weight band that covers our weight and the rate for the zone
+        return tariff_engine.snapshot(self.db).second_day.lookup(zone, weight)
 
     def get_standard_rate(self, zone: int, weight: float) -> float:
         """Get standard shipping rate (using second day as fallback)"""
@@ -80,50 +50,35 @@ class TysonTariffService:
 
         return rate
 
+    def get_shipping_rate_matrix(self, destination_zips: List[str], service_levels: List[str], total_weight: float) -> Tuple[List[int], np.ndarray]:
+        """
+        Zones for many ZIP codes and the shipping rate of every (ZIP, service level) pair
+        """
+        snapshot = tariff_engine.snapshot(self.db)
+        # Same zone default as get_zone_from_zip
+        zones = [zone if zone is not None else 1 for zone in snapshot.zones.lookup_many(destination_zips)]
+        zone_array = np.array(zones, dtype=np.intp)
+        # One column per service level, one row per ZIP code (standard is priced off second day)
+        rates = np.column_stack([
+            snapshot.rate_table(service_level).lookup_zones(zone_array, total_weight)
+            for service_level in service_levels
+        ])
+        return zones, rates
+
     def calculate_material_rate(self, packed_boxes: List[PackedBox]) -> float:
         """
         Calculate material rate based on packed boxes
         """
-        # Get all materials from database
-        materials = self.db.query(TysonMaterials).all()
-
-        if not materials:
-            return 0.0
-
-        # Calculate average material cost (using refrigerated overnight rate as default)
-        total_cost = sum(material.refrigerated_overnight_rate or 0.0 for material in materials if material.refrigerated_overnight_rate)
-        if total_cost == 0:
-            return 0.0
-            
-        average_cost = total_cost / len([m for m in materials if m.refrigerated_overnight_rate])
-
-        # Apply to each box
-        total_material_rate = 0.0
-        for packed_box in packed_boxes:
-            # Material cost is proportional to box volume
-            box_volume = packed_box.box.length * packed_box.box.width * packed_box.box.height
-            material_cost = average_cost * (box_volume / 1000)  # Normalize by 1000 cubic inches
-            total_material_rate += material_cost
-
-        return total_material_rate
+        # Average material cost (refrigerated overnight rate) from the tariff snapshot,
+        # proportional to box volume
+        return material_charge(tariff_engine.snapshot(self.db).material_average_rate, packed_boxes)
 
     def calculate_accessories_rate(self, packed_boxes: List[PackedBox]) -> float:
         """
         Calculate accessory rate based on packed boxes
         """
-        # Get all accessories from database
-        accessories = self.db.query(TysonAccessoriesCharges).all()
-
-        if not accessories:
-            return 0.0
-
-        # Calculate total accessory cost
-        total_accessory_cost = sum(accessory.rate or 0.0 for accessory in accessories if accessory.rate)
-
-        # Apply to each box
-        total_accessories_rate = total_accessory_cost * len(packed_boxes)
-
-        return total_accessories_rate
+        # Total accessory cost from the tariff snapshot, applied to each box
+        return accessories_charge(tariff_engine.snapshot(self.db).accessories_total, packed_boxes)
 
     def get_weight_band(self, weight: float) -> int:
         """
@@ -147,3 +102,44 @@ class TysonTariffService:
             return 50
         else:
             return 100
+
+class AsyncTysonTariffService:
+    """
+    Tyson tariff lookups for async handlers
+
+    Rates come from the in-memory tariff snapshot; the database is only
+    used, through the async session, when the snapshot has to be loaded.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def snapshot(self) -> TariffSnapshot:
+        """Current tariff snapshot, loading it if missing or stale"""
+        return tariff_engine.current() or await self.db.run_sync(tariff_engine.snapshot)
+
+    async def get_zone_from_zip(self, zip_code: str) -> int:
+        """Get shipping zone from ZIP code"""
+        zone = (await self.snapshot()).zones.lookup(zip_code)
+        return zone if zone is not None else 1  # Default to zone 1
+
+    async def get_shipping_rate(self, destination_zip: str, service_level: str, total_weight: float) -> float:
+        """
+        Get shipping rate from Tyson tariff tables
+        """
+        snapshot = await self.snapshot()
+        zone = await self.get_zone_from_zip(destination_zip)
+        # Standard is priced off second day, as in TysonTariffService
+        return snapshot.rate_table(service_level).lookup(zone, total_weight)
+
+    async def calculate_material_rate(self, packed_boxes: List[PackedBox]) -> float:
+        """
+        Calculate material rate based on packed boxes
+        """
+        return material_charge((await self.snapshot()).material_average_rate, packed_boxes)
+
+    async def calculate_accessories_rate(self, packed_boxes: List[PackedBox]) -> float:
+        """
+        Calculate accessory rate based on packed boxes
+        """
+        return accessories_charge((await self.snapshot()).accessories_total, packed_boxes)
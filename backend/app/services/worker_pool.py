@@ -0,0 +1,53 @@
+"""
+Shared process pool for CPU-bound packing work
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+
+_executor: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the shared packing process pool, or None when PACKING_WORKERS is 0
+    """
+    global _executor
+    if settings.PACKING_WORKERS <= 0:
+        return None
+    if _executor is not None and getattr(_executor, "_broken", False):
+        # A worker died; start over rather than failing every submit
+        reset_process_pool()
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                # Spawn rather than fork: the web worker is multithreaded
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.PACKING_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _executor
+
+def reset_process_pool():
+    """
+    Discard a broken pool so the next call starts a fresh one
+    """
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_process_pool():
+    """
+    Stop the pool on application shutdown
+    """
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,74 @@
+"""
+Synthetic catalogs and orders for the packing benchmarks
+
+Everything is derived from a seed, so a scenario packs the same boxes and
+items on every run and machine.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+from app.schemas.packing import Box, Item
+
+# Item dimension (inches) and weight (pounds) ranges per profile
+PROFILES: Dict[str, dict] = {
+    "few_large": {"skus": (1, 3), "dims": (8.0, 22.0), "weight": (5.0, 35.0)},
+    "many_tiny": {"skus": (1, 3), "dims": (0.5, 3.0), "weight": (0.05, 0.5)},
+    "mixed_skus": {"skus": (8, 25), "dims": (0.5, 20.0), "weight": (0.1, 30.0)},
+}
+
+# Order sizes (units) run by default
+UNIT_COUNTS = (10, 100, 1000, 10000)
+
+# Overpack box sizes (inches), smallest to largest
+BOX_SIZES: List[Tuple[float, float, float]] = [
+    (6, 4, 4), (8, 6, 4), (10, 8, 6), (12, 10, 8), (14, 12, 10), (16, 12, 12),
+    (18, 14, 12), (20, 16, 14), (24, 18, 16), (28, 20, 18), (36, 24, 20), (48, 40, 36),
+]
+
+def generate_catalog(seed: int) -> List[Box]:
+    """
+    An overpack box catalog priced roughly by volume
+    """
+    rng = random.Random(f"catalog-{seed}")
+    boxes = []
+    for index, (length, width, height) in enumerate(BOX_SIZES):
+        volume = length * width * height
+        boxes.append(Box(
+            id=f"box-{index}",
+            name=f"Box {length}x{width}x{height}",
+            length=float(length),
+            width=float(width),
+            height=float(height),
+            max_weight=round(10 + volume / 200, 1),
+            cost=round(0.5 + volume / 2500 * rng.uniform(0.9, 1.1), 2)
+        ))
+    return boxes
+
+def generate_order(profile: str, units: int, seed: int) -> List[Item]:
+    """
+    An order of `units` units in the style of `profile`
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown order profile: {profile}")
+    spec = PROFILES[profile]
+    rng = random.Random(f"order-{profile}-{units}-{seed}")
+    sku_count = min(units, rng.randint(*spec["skus"]))
+
+    # Split the units over the SKUs, each getting at least one
+    cuts = sorted(rng.sample(range(1, units), sku_count - 1)) if sku_count > 1 else []
+    quantities = [upper - lower for lower, upper in zip([0] + cuts, cuts + [units])]
+
+    low, high = spec["dims"]
+    return [
+        Item(
+            id=f"{profile}-{index}",
+            name=f"{profile} SKU {index}",
+            length=round(rng.uniform(low, high), 1),
+            width=round(rng.uniform(low, high), 1),
+            height=round(rng.uniform(low, high), 1),
+            weight=round(rng.uniform(*spec["weight"]), 2),
+            quantity=quantity
+        )
+        for index, quantity in enumerate(quantities)
+    ]
@@ -0,0 +1,230 @@
+"""
+Packing benchmark
+
+Packs seeded synthetic orders (see generators.py) with the full
+`PackingAlgorithm.pack_items` portfolio and reports, per scenario, the box
+count, utilization and latency percentiles overall and per strategy. Run
+from backend/:
+
+    python -m benchmarks.packing                      # run and compare with the baseline
+    python -m benchmarks.packing --save-baseline      # record a new baseline
+    python -m benchmarks.packing --units 10,100 --output results.json
+
+Without a time budget (the default) every strategy runs to the end, so box
+counts are the same on every machine and latency is the only noisy figure.
+Exits with status 1 when a scenario regressed against the baseline.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.packing_algorithm import OBJECTIVES, PackingAlgorithm
+from benchmarks.generators import PROFILES, UNIT_COUNTS, generate_catalog, generate_order
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "packing.json"
+PERCENTILES = (50, 90, 99)
+
+# Latency changes below this many milliseconds are noise, whatever the ratio
+LATENCY_FLOOR_MS = 2.0
+# Mean box utilization (percent) may drop this much before it counts
+UTILIZATION_FLOOR = 0.5
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    values = np.percentile(np.array(samples) * 1000, PERCENTILES)
+    summary = {f"p{percentile}": round(float(value), 3) for percentile, value in zip(PERCENTILES, values)}
+    summary["mean"] = round(float(np.mean(samples)) * 1000, 3)
+    return summary
+
+def run_scenario(profile: str, units: int, options: argparse.Namespace) -> dict:
+    """
+    Pack one scenario `options.repeat` times (after `options.warmup` untimed runs)
+    """
+    boxes = generate_catalog(options.seed)
+    items = generate_order(profile, units, options.seed)
+    algorithm = PackingAlgorithm(boxes)
+
+    def pack():
+        return algorithm.pack_items(
+            items,
+            objective=options.objective,
+            time_budget=options.time_budget_ms / 1000 if options.time_budget_ms else None,
+            exact_max_units=options.exact_max_units,
+            exact_node_budget=options.node_budget,
+            cost_search=options.cost_search
+        )
+
+    for _ in range(options.warmup):
+        pack()
+
+    latencies: List[float] = []
+    strategies: Dict[str, List[float]] = {}
+    results = []
+    for _ in range(options.repeat):
+        started = time.perf_counter()
+        result = pack()
+        latencies.append(time.perf_counter() - started)
+        for strategy, seconds in result.strategy_seconds.items():
+            strategies.setdefault(strategy, []).append(seconds)
+        results.append(result)
+
+    # Worst run, so a packing that only sometimes regresses is still caught
+    return {
+        "profile": profile,
+        "units": units,
+        "skus": len(items),
+        "boxes": max(result.total_boxes for result in results),
+        "overflow_units": max(sum(quantity for _, quantity in result.overflow_items) for result in results),
+        "utilization": round(min(
+            sum(packed_box.utilization for packed_box in result.packed_boxes) / len(result.packed_boxes) if result.packed_boxes else 0.0
+            for result in results
+        ), 2),
+        "solvers": sorted({result.solver for result in results}),
+        "latency_ms": _percentiles(latencies),
+        "strategies_ms": {strategy: _percentiles(samples) for strategy, samples in strategies.items()}
+    }
+
+def run_suite(options: argparse.Namespace) -> dict:
+    """
+    Run every selected scenario; progress goes to stderr
+    """
+    scenarios = {}
+    for profile in options.profiles:
+        for units in options.units:
+            print(f"{profile}/{units} ...", end=" ", file=sys.stderr, flush=True)
+            scenario = run_scenario(profile, units, options)
+            scenarios[f"{profile}/{units}"] = scenario
+            print(f"{scenario['boxes']} boxes, p50 {scenario['latency_ms']['p50']:.1f} ms", file=sys.stderr)
+    return {
+        "config": {
+            "seed": options.seed,
+            "objective": options.objective,
+            "time_budget_ms": options.time_budget_ms,
+            "exact_max_units": options.exact_max_units,
+            "node_budget": options.node_budget,
+            "cost_search": options.cost_search
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "numpy": np.__version__
+        },
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "repeat": options.repeat,
+        "scenarios": scenarios
+    }
+
+def _slower(current: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> Optional[str]:
+    """Description of a p50 latency regression, or None"""
+    now, before = current["p50"], baseline["p50"]
+    if now - before > LATENCY_FLOOR_MS and now > before * (1 + tolerance):
+        return f"p50 {before:.1f} -> {now:.1f} ms"
+    return None
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Regressions of `results` against `baseline`, one line each
+
+    More boxes or overflow, lower utilization, or a p50 latency (overall or
+    of a strategy) more than `tolerance` above the baseline's.
+    """
+    regressions = []
+    for name, scenario in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        if scenario["boxes"] > before["boxes"]:
+            regressions.append(f"{name}: boxes {before['boxes']} -> {scenario['boxes']}")
+        if scenario["overflow_units"] > before["overflow_units"]:
+            regressions.append(f"{name}: overflow units {before['overflow_units']} -> {scenario['overflow_units']}")
+        if scenario["utilization"] < before["utilization"] - UTILIZATION_FLOOR:
+            regressions.append(f"{name}: utilization {before['utilization']:.1f}% -> {scenario['utilization']:.1f}%")
+        slower = _slower(scenario["latency_ms"], before["latency_ms"], tolerance)
+        if slower:
+            regressions.append(f"{name}: {slower}")
+        for strategy, timings in scenario["strategies_ms"].items():
+            if strategy in before["strategies_ms"]:
+                slower = _slower(timings, before["strategies_ms"][strategy], tolerance)
+                if slower:
+                    regressions.append(f"{name} {strategy}: {slower}")
+    return regressions
+
+def _print_table(results: dict):
+    print(f"{'scenario':<22}{'skus':>6}{'boxes':>8}{'util %':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}  slowest strategy")
+    for name, scenario in results["scenarios"].items():
+        latency = scenario["latency_ms"]
+        slowest = max(scenario["strategies_ms"].items(), key=lambda entry: entry[1]["p50"])
+        print(
+            f"{name:<22}{scenario['skus']:>6}{scenario['boxes']:>8}{scenario['utilization']:>8.1f}"
+            f"{latency['p50']:>10.1f}{latency['p90']:>10.1f}{latency['p99']:>10.1f}  {slowest[0]} ({slowest[1]['p50']:.1f} ms)"
+        )
+
+def _csv(cast):
+    return lambda value: [cast(part) for part in value.split(",") if part]
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark PackingAlgorithm on seeded synthetic orders")
+    parser.add_argument("--profiles", type=_csv(str), default=list(PROFILES), help=f"comma-separated, from {', '.join(PROFILES)}")
+    parser.add_argument("--units", type=_csv(int), default=list(UNIT_COUNTS), help="comma-separated order sizes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per scenario")
+    parser.add_argument("--objective", choices=list(OBJECTIVES), default="box_cost")
+    parser.add_argument("--time-budget-ms", type=int, default=0, help="PACKING_TIME_BUDGET_MS; 0 lets every strategy finish")
+    parser.add_argument("--exact-max-units", type=int, default=30, help="PACKING_EXACT_MAX_UNITS")
+    parser.add_argument("--node-budget", type=int, default=20000, help="PACKING_EXACT_NODE_BUDGET")
+    parser.add_argument("--no-cost-search", dest="cost_search", action="store_false", help="disable PACKING_COST_SEARCH")
+    parser.add_argument("--output", type=Path, help="write the results as JSON ('-' for stdout)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p50 latency increase")
+    options = parser.parse_args(argv)
+    for profile in options.profiles:
+        if profile not in PROFILES:
+            parser.error(f"unknown profile: {profile}")
+    return options
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = parse_args(argv)
+    results = run_suite(options)
+
+    if options.output is not None:
+        payload = json.dumps(results, indent=2)
+        if str(options.output) == "-":
+            print(payload)
+        else:
+            options.output.write_text(payload + "\n")
+    if str(options.output) != "-":
+        _print_table(results)
+
+    if options.save_baseline:
+        options.baseline.parent.mkdir(parents=True, exist_ok=True)
+        options.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline saved to {options.baseline}", file=sys.stderr)
+        return 0
+    if not options.baseline.exists():
+        print(f"No baseline at {options.baseline}; record one with --save-baseline", file=sys.stderr)
+        return 0
+
+    baseline = json.loads(options.baseline.read_text())
+    if baseline["config"] != results["config"]:
+        # Another seed or algorithm setting packs different orders or differently
+        print(f"Not compared: {options.baseline} was recorded with {baseline['config']}", file=sys.stderr)
+        return 0
+    regressions = compare(results, baseline, options.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if not regressions:
+        print(f"No regressions against {options.baseline}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
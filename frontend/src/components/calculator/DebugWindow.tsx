@@ -49,55 +49,129 @@ const DebugWindow: React.FC<DebugWindowProps> = ({ debugInfo, isOpen, onClose })
     </div>
   );
 
-  const renderAlgorithm = () => (
-    <div className="space-y-4">
-      <div className="border rounded-lg p-4">
-        <h4 className="font-semibold text-gray-900 mb-3">Strategy Attempts</h4>
-        {debugInfo.algorithm_debug.strategy_attempts.map((attempt, index) => (
-          <div key={index} className="mb-3 p-3 bg-gray-50 rounded">
-            <div className="flex items-center justify-between">
-              <span className="font-medium">{attempt.strategy}</span>
-              <span className={`px-2 py-1 rounded text-xs ${
-                attempt.success ? 'bg-green-100 text-green-800' : 'bg-red-100 text-red-800'
-              }`}>
-                {attempt.success ? 'Success' : 'Failed'}
-              </span>
-            </div>
-            <div className="text-sm text-gray-600 mt-1">
-              Boxes used: {attempt.boxes_used} | Overflow items: {attempt.overflow_items}
-            </div>
-          </div>
-        ))}
-      </div>
+  const formatMs = (value: number | null | undefined): string =>
+    value === null || value === undefined ? '—' : `${value.toFixed(1)} ms`;
 
-      <div className="border rounded-lg p-4">
-        <h4 className="font-semibold text-gray-900 mb-3">Final Selection</h4>
-        <div className="text-sm text-gray-600">
-          Selected strategy: <span className="font-medium">{debugInfo.algorithm_debug.final_selection.strategy}</span>
-        </div>
-      </div>
-
-      {debugInfo.algorithm_debug.box_evaluations.length > 0 && (
+  const renderAlgorithm = () => {
+    const { strategy_attempts, box_evaluations, item_placements, final_selection } = debugInfo.algorithm_debug;
+    return (
+      <div className="space-y-4">
         <div className="border rounded-lg p-4">
-          <h4 className="font-semibold text-gray-900 mb-3">Box Evaluations</h4>
-          <pre className="text-xs bg-gray-100 p-2 rounded overflow-x-auto">
-            {formatValue(debugInfo.algorithm_debug.box_evaluations)}
-          </pre>
+          <h4 className="font-semibold text-gray-900 mb-3">Strategy Attempts</h4>
+          {strategy_attempts.map((attempt, index) => (
+            <div key={index} className="mb-3 p-3 bg-gray-50 rounded">
+              <div className="flex items-center justify-between">
+                <span className="font-medium">{attempt.strategy}</span>
+                <div className="flex items-center gap-2">
+                  <span className="text-xs text-gray-500">{formatMs(attempt.elapsed_ms)}</span>
+                  <span className={`px-2 py-1 rounded text-xs ${
+                    attempt.success ? 'bg-green-100 text-green-800' : 'bg-red-100 text-red-800'
+                  }`}>
+                    {attempt.success ? 'Success' : attempt.completed ? 'Failed' : 'Not finished'}
+                  </span>
+                </div>
+              </div>
+              <div className="text-sm text-gray-600 mt-1">
+                Boxes used: {attempt.boxes_used} | Overflow items: {attempt.overflow_items}
+                {attempt.nodes !== undefined && <> | Search nodes: {attempt.nodes}</>}
+              </div>
+              {attempt.boxes && attempt.boxes.length > 0 && (
+                <div className="text-xs text-gray-500 mt-1">Boxes: {attempt.boxes.join(', ')}</div>
+              )}
+              {attempt.candidate_boxes && (
+                <div className="text-xs text-gray-500 mt-1">Candidate boxes: {attempt.candidate_boxes.join(', ')}</div>
+              )}
+              {attempt.moves && (
+                <div className="text-xs text-gray-500 mt-1">
+                  Moves: {Object.entries(attempt.moves).map(([move, count]) => `${move} ${count}`).join(', ')}
+                </div>
+              )}
+            </div>
+          ))}
         </div>
-      )}
 
-      {debugInfo.algorithm_debug.item_placements.length > 0 && (
         <div className="border rounded-lg p-4">
-          <h4 className="font-semibold text-gray-900 mb-3">Item Placements</h4>
-          <pre className="text-xs bg-gray-100 p-2 rounded overflow-x-auto">
-            {formatValue(debugInfo.algorithm_debug.item_placements)}
-          </pre>
+          <h4 className="font-semibold text-gray-900 mb-3">Final Selection</h4>
+          <div className="text-sm text-gray-600">
+            Selected strategy: <span className="font-medium">{final_selection.strategy}</span>
+            {final_selection.objective && <> | Objective: <span className="font-medium">{final_selection.objective}</span></>}
+            {final_selection.optimality_gap !== undefined && final_selection.optimality_gap !== null && (
+              <> | Optimality gap: <span className="font-medium">{(final_selection.optimality_gap * 100).toFixed(1)}%</span></>
+            )}
+          </div>
         </div>
-      )}
-    </div>
-  );
 
-  const renderCost = () => (
+        {debugInfo.box_selection.boxes && (
+          <div className="border rounded-lg p-4">
+            <h4 className="font-semibold text-gray-900 mb-3">Box Selection</h4>
+            {debugInfo.box_selection.boxes.map((box, index) => (
+              <div key={index} className="text-sm text-gray-600">
+                {box.name}: {box.units} units, {box.utilization.toFixed(1)}% of volume, {box.weight_utilization.toFixed(1)}% of max weight
+              </div>
+            ))}
+          </div>
+        )}
+
+        {box_evaluations.length > 0 && (
+          <div className="border rounded-lg p-4">
+            <h4 className="font-semibold text-gray-900 mb-3">Candidate Boxes</h4>
+            {box_evaluations.map((evaluation) => (
+              <div key={evaluation.box_index} className="mb-3">
+                <div className="text-sm text-gray-700 mb-1">
+                  Box {evaluation.box_index + 1}: <span className="font-medium">{evaluation.chosen}</span>
+                  {' '}({evaluation.contents_volume.toFixed(1)} in³, {evaluation.contents_weight.toFixed(2)} lbs of contents)
+                </div>
+                <table className="min-w-full text-xs">
+                  <thead>
+                    <tr className="text-left text-gray-500">
+                      <th className="pr-4">Box</th>
+                      <th className="pr-4">Dimensions</th>
+                      <th className="pr-4">Max weight</th>
+                      <th className="pr-4">Cost</th>
+                      <th>Objective key</th>
+                    </tr>
+                  </thead>
+                  <tbody>
+                    {evaluation.candidates.map((candidate) => (
+                      <tr key={candidate.id} className={candidate.name === evaluation.chosen ? 'font-semibold text-blue-700' : 'text-gray-700'}>
+                        <td className="pr-4">{candidate.name}</td>
+                        <td className="pr-4">{candidate.dimensions}</td>
+                        <td className="pr-4">{candidate.max_weight}</td>
+                        <td className="pr-4">{candidate.cost}</td>
+                        <td>{candidate.key ? candidate.key.map((part) => part.toFixed(2)).join(' / ') : '—'}</td>
+                      </tr>
+                    ))}
+                  </tbody>
+                </table>
+              </div>
+            ))}
+          </div>
+        )}
+
+        {item_placements.length > 0 && (
+          <div className="border rounded-lg p-4">
+            <h4 className="font-semibold text-gray-900 mb-3">Item Placements</h4>
+            {item_placements.map((placement) => (
+              <div key={placement.box_index} className="mb-3">
+                <div className="text-sm text-gray-700 mb-1">
+                  Box {placement.box_index + 1}: <span className="font-medium">{placement.box}</span> ({placement.utilization.toFixed(1)}% full)
+                </div>
+                <pre className="text-xs bg-gray-100 p-2 rounded overflow-x-auto">
+                  {placement.blocks.map((block) =>
+                    `${block.item_id}: ${block.counts.join('×')} units of ${block.unit_dimensions.join('×')} at (${block.position.join(', ')})`
+                  ).join('\n')}
+                </pre>
+              </div>
+            ))}
+          </div>
+        )}
+      </div>
+    );
+  };
+
+  const renderCost = () => debugInfo.cost_calculation.total_cost === undefined ? (
+    <p className="text-sm text-gray-600">Served from the quote cache; no cost calculation was run.</p>
+  ) : (
     <div className="space-y-4">
       <div className="border rounded-lg p-4">
         <h4 className="font-semibold text-gray-900 mb-3">Cost Calculation Details</h4>
@@ -127,16 +201,32 @@ const DebugWindow: React.FC<DebugWindowProps> = ({ debugInfo, isOpen, onClose })
     </div>
   );
 
-  const renderTiming = () => (
-    <div className="space-y-4">
-      <div className="border rounded-lg p-4">
-        <h4 className="font-semibold text-gray-900 mb-3">Performance Metrics</h4>
-        <pre className="text-xs bg-gray-100 p-2 rounded overflow-x-auto">
-          {formatValue(debugInfo.timing)}
-        </pre>
+  const renderTiming = () => {
+    const total = debugInfo.timing.total_ms;
+    const steps = Object.entries(debugInfo.timing).filter(([key]) => key !== 'total_ms');
+    return (
+      <div className="space-y-4">
+        <div className="border rounded-lg p-4">
+          <h4 className="font-semibold text-gray-900 mb-3">Performance Metrics</h4>
+          {steps.map(([key, value]) => (
+            <div key={key} className="mb-2">
+              <div className="flex justify-between text-sm text-gray-700">
+                <span>{key.replace(/_ms$/, '')}</span>
+                <span>{formatMs(value)}</span>
+              </div>
+              <div className="h-2 bg-gray-100 rounded">
+                <div className="h-2 bg-blue-500 rounded" style={{ width: total ? `${Math.min(100, (value / total) * 100)}%` : '0%' }} />
+              </div>
+            </div>
+          ))}
+          <div className="flex justify-between text-sm font-semibold text-gray-900 border-t pt-2 mt-2">
+            <span>total</span>
+            <span>{formatMs(total)}</span>
+          </div>
+        </div>
       </div>
-    </div>
-  );
+    );
+  };
 
   return (
     <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50">
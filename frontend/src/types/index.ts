@@ -187,6 +187,19 @@ export interface PackedItemResponse {
   weight: number;
 }
 
+export interface PlacementResponse {
+  item_id: string;
+  x: number;
+  y: number;
+  z: number;
+  length: number;
+  width: number;
+  height: number;
+  count_x: number;
+  count_y: number;
+  count_z: number;
+}
+
 export interface PackedBoxResponse {
   box: BoxResponse;
   items: PackedItemResponse[];
@@ -194,6 +207,7 @@ export interface PackedBoxResponse {
   total_volume: number;
   utilization: number;
   packing_efficiency: number;
+  placements?: PlacementResponse[];
 }
 
 export interface PackingRecommendationResponse {
@@ -289,6 +303,48 @@ export interface SystemSettingsUpdate {
 }
 
 // Debug types
+export interface DebugBox {
+  id: string;
+  name: string;
+  dimensions: string;
+  max_weight: number;
+  cost: number;
+}
+
+export interface DebugStrategyAttempt {
+  strategy: string;
+  completed: boolean;
+  success: boolean;
+  boxes_used: number;
+  overflow_items: number;
+  elapsed_ms: number | null;
+  boxes?: string[];
+  nodes?: number;
+  moves?: Record<string, number>;
+  lower_bound?: number;
+  candidate_boxes?: string[];
+}
+
+export interface DebugBoxEvaluation {
+  box_index: number;
+  chosen: string;
+  contents_volume: number;
+  contents_weight: number;
+  candidates: Array<DebugBox & { key: number[] | null }>;
+}
+
+export interface DebugItemPlacement {
+  box_index: number;
+  box: string;
+  utilization: number;
+  blocks: Array<{
+    item_id: string;
+    position: number[];
+    unit_dimensions: number[];
+    counts: number[];
+  }>;
+}
+
 export interface DebugInfo {
   steps: Array<{
     step: number;
@@ -298,19 +354,25 @@ export interface DebugInfo {
     [key: string]: any;
   }>;
   algorithm_debug: {
-    strategy_attempts: Array<{
-      strategy: string;
-      success: boolean;
-      boxes_used: number;
-      overflow_items: number;
-    }>;
-    box_evaluations: any[];
-    item_placements: any[];
+    strategy_attempts: DebugStrategyAttempt[];
+    box_evaluations: DebugBoxEvaluation[];
+    item_placements: DebugItemPlacement[];
     final_selection: {
       strategy: string;
+      solver?: string;
+      optimality_gap?: number | null;
+      objective?: string;
     };
   };
-  box_selection: any;
+  box_selection: {
+    total_boxes?: number;
+    boxes?: Array<{
+      name: string;
+      units: number;
+      utilization: number;
+      weight_utilization: number;
+    }>;
+  };
   cost_calculation: {
     zone: number;
     base_rate: number;
@@ -318,5 +380,5 @@ export interface DebugInfo {
     accessories_rate: number;
     total_cost: number;
   };
-  timing: any;
+  timing: Record<string, number>;
 }